@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Hello-ai 부하 테스트 / 지연시간 벤치마크
+
+서버를 SERVER_MODE별로 직접 띄우거나(--modes) 이미 떠 있는 서버(--url)에
+동시 접속 클라이언트로 요청을 보내고 req/s, p50/p99 지연시간, 요청당 CPU 시간을
+측정해 JSON으로 저장합니다. --compare로 이전 결과와의 차이를 출력합니다.
+
+예시:
+    python3 bench.py --modes single,threaded,asyncio,prefork --concurrency 16 --duration 10
+    python3 bench.py --url http://localhost:8080 --mix "/:5,/health:3,/info:2" --no-keepalive
+    python3 bench.py --modes threaded --output after.json --compare before.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+from metrics import LatencyHistogram
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def parse_mix(spec):
+    """'/:5,/health:3' 형식을 [(path, weight), ...]로 변환"""
+    mix = []
+    for item in spec.split(','):
+        path, _, weight = item.strip().rpartition(':')
+        if not path:
+            path, weight = weight, '1'
+        mix.append((path, float(weight)))
+    return mix
+
+
+def process_cpu_seconds(pid):
+    """프로세스와 직계 자식 프로세스의 누적 CPU 시간 (Linux /proc 기준, 없으면 None)"""
+    def cpu_of(stat_path):
+        with open(stat_path) as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        # fields[0]은 state, utime/stime은 원래 14, 15번째 필드
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS, int(fields[1])
+
+    try:
+        total, _ = cpu_of(f'/proc/{pid}/stat')
+    except OSError:
+        return None
+
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit() or int(entry) == pid:
+            continue
+        try:
+            cpu, ppid = cpu_of(f'/proc/{entry}/stat')
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            total += cpu
+    return total
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode, port, env_overrides):
+    """지정한 모드로 main.py를 띄우고 응답할 때까지 대기 (종료 시 드레인 지연 없음)"""
+    env = dict(os.environ, PORT=str(port), SERVER_MODE=mode, **{'DRAIN_DELAY': '0', **env_overrides})
+    proc = subprocess.Popen(
+        [sys.executable, 'main.py'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            conn.getresponse().read()
+            conn.close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"{mode} 모드 서버가 시작되지 않았습니다.")
+
+
+def run_load(host, port, mix, concurrency, duration, keepalive, warmup=1.0, on_measure_start=None):
+    """동시 접속 클라이언트로 부하를 주고 결과를 집계
+
+    on_measure_start: warmup이 끝나 측정을 시작하는 시점에 호출할 함수
+    """
+    paths = [path for path, _ in mix]
+    weights = [weight for _, weight in mix]
+    stop_at = time.perf_counter() + warmup + duration
+    measure_from = time.perf_counter() + warmup
+    results = []
+    lock = threading.Lock()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        histogram = LatencyHistogram()
+        statuses = {}
+        errors = 0
+        conn = None
+        headers = {} if keepalive else {'Connection': 'close'}
+        while True:
+            now = time.perf_counter()
+            if now >= stop_at:
+                break
+            path = rng.choices(paths, weights)[0]
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection(host, port, timeout=10)
+                start = time.perf_counter()
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                latency_ms = (time.perf_counter() - start) * 1000
+                if not keepalive or response.will_close:
+                    conn.close()
+                    conn = None
+                if start >= measure_from:
+                    histogram.record(latency_ms)
+                    statuses[response.status] = statuses.get(response.status, 0) + 1
+            except (OSError, http.client.HTTPException):
+                if conn is not None:
+                    conn.close()
+                conn = None
+                if now >= measure_from:
+                    errors += 1
+        if conn is not None:
+            conn.close()
+        with lock:
+            results.append((histogram, statuses, errors))
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    if on_measure_start is not None:
+        threads.append(threading.Timer(max(measure_from - time.perf_counter(), 0), on_measure_start))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    histogram = LatencyHistogram()
+    statuses = {}
+    errors = 0
+    for h, s, e in results:
+        histogram.merge(h)
+        for status, count in s.items():
+            statuses[status] = statuses.get(status, 0) + count
+        errors += e
+    return histogram, statuses, errors
+
+
+def bench_one(label, host, port, args, mix, server_pid=None):
+    cpu = {}
+
+    def sample_cpu():
+        cpu['before'] = process_cpu_seconds(server_pid)
+
+    started = time.perf_counter()
+    histogram, statuses, errors = run_load(
+        host, port, mix, args.concurrency, args.duration, not args.no_keepalive, args.warmup,
+        on_measure_start=sample_cpu if server_pid else None
+    )
+    elapsed = time.perf_counter() - started - args.warmup
+    cpu_before = cpu.get('before')
+    cpu_after = process_cpu_seconds(server_pid) if server_pid else None
+
+    requests = histogram.count
+    result = {
+        "label": label,
+        "requests": requests,
+        "errors": errors,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "duration_seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 1) if elapsed > 0 else 0,
+        "latency_ms": {
+            "avg": round(histogram.mean(), 3),
+            "p50": histogram.percentile(50),
+            "p90": histogram.percentile(90),
+            "p99": histogram.percentile(99),
+            "p999": histogram.percentile(99.9),
+        },
+        "cpu_ms_per_request": None,
+    }
+    if cpu_before is not None and cpu_after is not None and requests:
+        result["cpu_ms_per_request"] = round((cpu_after - cpu_before) * 1000 / requests, 4)
+    return result
+
+
+def print_result(result):
+    latency = result["latency_ms"]
+    cpu = result["cpu_ms_per_request"]
+    print(
+        f"{result['label']:<10} {result['requests_per_second']:>9.1f} req/s  "
+        f"p50 {latency['p50']:>7.3f}ms  p99 {latency['p99']:>7.3f}ms  "
+        f"cpu/req {cpu if cpu is not None else '-':>7}ms  "
+        f"errors {result['errors']}"
+    )
+
+
+def print_comparison(current, baseline):
+    """이전 결과 대비 변화율 출력"""
+    previous = {r["label"]: r for r in baseline["results"]}
+    print("\n이전 결과 대비:")
+    for result in current["results"]:
+        before = previous.get(result["label"])
+        if not before:
+            continue
+
+        def delta(now, then):
+            if not then or now is None:
+                return '   -  '
+            return f"{(now - then) / then * 100:+6.1f}%"
+
+        print(
+            f"{result['label']:<10} req/s {delta(result['requests_per_second'], before['requests_per_second'])}  "
+            f"p50 {delta(result['latency_ms']['p50'], before['latency_ms']['p50'])}  "
+            f"p99 {delta(result['latency_ms']['p99'], before['latency_ms']['p99'])}  "
+            f"cpu/req {delta(result['cpu_ms_per_request'], before.get('cpu_ms_per_request'))}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hello-ai 부하 테스트")
+    parser.add_argument('--modes', default='threaded', help="직접 띄울 SERVER_MODE 목록 (쉼표 구분)")
+    parser.add_argument('--url', help="이미 실행 중인 서버 주소 (지정하면 --modes 무시)")
+    parser.add_argument('--pid', type=int, help="--url 사용 시 CPU 측정할 서버 PID")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0, help="측정 시간(초)")
+    parser.add_argument('--warmup', type=float, default=1.0, help="측정 전 워밍업 시간(초)")
+    parser.add_argument('--mix', default='/:1,/health:1,/info:1', help="엔드포인트 가중치 '/:5,/health:3'")
+    parser.add_argument('--no-keepalive', action='store_true', help="요청마다 새 연결 사용")
+    parser.add_argument('--server-env', action='append', default=[], help="서버 환경 변수 KEY=VALUE (반복 가능)")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    report = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "build": os.environ.get('BUILD_ID'),
+        "config": {
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "keepalive": not args.no_keepalive,
+            "mix": args.mix,
+            "cpu_count": os.cpu_count(),
+        },
+        "results": [],
+    }
+
+    if args.url:
+        target = urlparse(args.url)
+        result = bench_one(target.netloc, target.hostname, target.port or 80, args, mix, args.pid)
+        print_result(result)
+        report["results"].append(result)
+    else:
+        env_overrides = dict(item.split('=', 1) for item in args.server_env)
+        for mode in args.modes.split(','):
+            port = free_port()
+            proc = start_server(mode, port, env_overrides)
+            try:
+                result = bench_one(mode, '127.0.0.1', port, args, mix, proc.pid)
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+            print_result(result)
+            report["results"].append(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
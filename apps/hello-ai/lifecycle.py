@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Hello-ai 프로세스 생명주기 상태
+
+- draining : 종료 준비 중 (readiness 실패 응답, keep-alive 연결 종료)
+- stopping : 더 이상 새 요청을 받지 않음 (keep-alive 연결 종료)
+- 처리 중인 요청 수 추적과 종료 직전 훅 실행
+"""
+
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """종료/재시작 시 드레인에 필요한 상태"""
+
+    def __init__(self, drain_delay=5.0, drain_timeout=20.0):
+        """
+        drain_delay   : SIGTERM 후 readiness를 실패시킨 채 계속 요청을 받는 시간(초)
+        drain_timeout : 리스닝 중단 후 처리 중인 요청을 기다리는 최대 시간(초)
+        """
+        self.drain_delay = drain_delay
+        self.drain_timeout = drain_timeout
+        self._exit_hooks = []
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        # fork 시점에 다른 스레드가 잡고 있던 잠금을 물려받지 않도록 새로 생성
+        self.draining = threading.Event()
+        self.stopping = threading.Event()
+        self._inflight = 0
+        self._idle = threading.Condition()
+
+    def start_draining(self):
+        self.draining.set()
+
+    def closing_connections(self):
+        """응답 후 keep-alive 연결을 닫아야 하는지 (다른 파드로 재연결 유도)"""
+        return self.draining.is_set() or self.stopping.is_set()
+
+    def request_started(self):
+        with self._idle:
+            self._inflight += 1
+
+    def request_finished(self):
+        with self._idle:
+            self._inflight -= 1
+            if self._inflight == 0:
+                self._idle.notify_all()
+
+    @property
+    def inflight(self):
+        return self._inflight
+
+    def wait_idle(self, timeout):
+        """처리 중인 요청이 모두 끝날 때까지 대기 (시간 내 끝나면 True)"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._inflight == 0, timeout)
+
+    def add_exit_hook(self, hook):
+        """종료/재실행 직전에 호출할 함수 등록 (로그 flush 등)"""
+        self._exit_hooks.append(hook)
+
+    def run_exit_hooks(self):
+        for hook in self._exit_hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"종료 훅 실패: {e}")
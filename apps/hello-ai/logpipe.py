@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Hello-ai 비동기 접근 로그 파이프라인
+
+요청 경로에서는 튜플 하나를 큐에 넣기만 하고,
+백그라운드 스레드가 JSON 라인으로 직렬화해 묶음 단위로 출력합니다.
+- 큐가 가득 차면 기다리지 않고 버림 (버린 건수는 다음 묶음에 기록)
+- 헬스 프로브 요청은 샘플링 (에러 응답은 항상 기록)
+"""
+
+import atexit
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+
+class AccessLogPipeline:
+    """큐 기반 배치 JSON 접근 로그"""
+
+    def __init__(self, stream=None, max_queue=10000, batch_size=256,
+                 flush_interval=0.2, sample_rate=1.0):
+        self.stream = stream or sys.stdout
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._start()
+        os.register_at_fork(after_in_child=self._start)
+        atexit.register(self.close)
+
+    def _start(self):
+        # fork 이후에는 스레드가 없으므로 큐와 스레드를 새로 만듦
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='access-log', daemon=True)
+        self._thread.start()
+
+    def log(self, request_id, method, path, status, latency_ms, sampled=False):
+        """접근 로그 1건 (요청 경로에서 호출, 절대 블로킹하지 않음)
+
+        sampled=True인 요청(헬스 프로브 등)은 sample_rate 비율만 기록
+        """
+        if sampled and status < 400 and random.random() >= self.sample_rate:
+            return
+        try:
+            self._queue.put_nowait((time.time(), request_id, method, path, status, latency_ms))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while not self._closed.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        lines = []
+        dropped = self.dropped
+        if dropped != self._reported_dropped:
+            lines.append(json.dumps({"event": "access_log_dropped", "count": dropped - self._reported_dropped}))
+            self._reported_dropped = dropped
+
+        for ts, request_id, method, path, status, latency_ms in batch:
+            lines.append(json.dumps({
+                "ts": round(ts, 3),
+                "request_id": request_id,
+                "method": method,
+                "path": path,
+                "status": status,
+                "latency_ms": round(latency_ms, 3),
+            }, ensure_ascii=False))
+        try:
+            self.stream.write('\n'.join(lines) + '\n')
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def close(self, timeout=2.0):
+        """남은 로그를 비우고 스레드 종료"""
+        self._closed.set()
+        self._thread.join(timeout)
@@ -9,17 +9,32 @@ AI Lounge 테스트용 간단한 웹 서비스
 - 개선된 헬스체크
 - 요청 ID 추적
 - 에러 핸들링 강화
+- 동시성 모드 선택 (SERVER_MODE=single|threaded|asyncio|prefork)
+- HTTP/1.1 keep-alive (KEEPALIVE_TIMEOUT, KEEPALIVE_MAX_REQUESTS)
+- Prometheus 텍스트 포맷 /metrics, 사람용 JSON은 /metrics/json
+- 정적 엔드포인트 응답 사전 직렬화 및 ETag/304 지원
+- 선언적 라우터 (쿼리 문자열 처리, 미들웨어, HEAD 지원)
+- 비동기 배치 JSON 접근 로그 (프로브 요청 샘플링)
+- SIGTERM 드레인(/ready 실패 → 처리 중 요청 완료 후 종료), SIGHUP 무중단 재실행
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler
 import json
 from datetime import datetime
 import uuid
 import logging
 import traceback
 import os
+import tempfile
 import time
 
+from lifecycle import Lifecycle
+from logpipe import AccessLogPipeline
+from metrics import Metrics
+from responses import ResponseTemplate
+from router import Router
+from servers import serve, SERVER_MODES
+
 # 구조화된 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -29,185 +44,336 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # 메트릭 수집
-metrics = {
-    'requests_total': 0,
-    'requests_success': 0,
-    'requests_error': 0,
-    'uptime_start': time.time(),
-    'latency_ms': []
-}
+metrics = Metrics()
+
+# 접근 로그는 요청 경로 밖의 백그라운드 스레드에서 JSON 라인으로 출력
+access_log = AccessLogPipeline(
+    max_queue=int(os.environ.get('LOG_QUEUE_SIZE', 10000)),
+    batch_size=int(os.environ.get('LOG_BATCH_SIZE', 256)),
+    flush_interval=float(os.environ.get('LOG_FLUSH_INTERVAL', 0.2)),
+    sample_rate=float(os.environ.get('LOG_PROBE_SAMPLE_RATE', 0.01))
+) if os.environ.get('ACCESS_LOG', '1') != '0' else None
+
+# 샘플링 대상 프로브 경로 (kubelet 프로브는 User-Agent로도 판별)
+PROBE_PATHS = frozenset(['/health', '/api/health', '/ready'])
+
+# 종료/재실행 드레인 상태
+lifecycle = Lifecycle(
+    drain_delay=float(os.environ.get('DRAIN_DELAY', 5)),
+    drain_timeout=float(os.environ.get('DRAIN_TIMEOUT', 20))
+)
+if access_log is not None:
+    lifecycle.add_exit_hook(access_log.close)
+lifecycle.add_exit_hook(metrics.publish)
+
+
+def dynamic_values():
+    """캐시된 응답에 요청마다 끼워 넣는 동적 필드"""
+    uptime = metrics.uptime()
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "uptime_seconds": uptime,
+        "uptime_formatted": f"{uptime:.2f}s"
+    }
+
+
+# 정적 엔드포인트 응답 (시작 시 한 번만 직렬화)
+HEALTH_RESPONSE = ResponseTemplate(
+    {
+        "status": "ok",
+        "service": "hello-ai",
+        "version": "1.0.0",
+        "timestamp": None,
+        "uptime_seconds": None,
+        "uptime_formatted": None
+    },
+    dynamic_fields=("timestamp", "uptime_seconds", "uptime_formatted"),
+    context=dynamic_values
+)
+
+ROOT_RESPONSE = ResponseTemplate(
+    {
+        "message": "Hello World from AI Lounge!",
+        "service": "hello-ai",
+        "version": "1.0.0",
+        "timestamp": None,
+        "endpoints": [
+            {"path": "/", "method": "GET", "description": "Hello World 메시지"},
+            {"path": "/health", "method": "GET", "description": "헬스 체크"},
+            {"path": "/ready", "method": "GET", "description": "준비 상태 (드레인 중 503)"},
+            {"path": "/metrics", "method": "GET", "description": "서비스 메트릭 (Prometheus)"},
+            {"path": "/metrics/json", "method": "GET", "description": "서비스 메트릭 (JSON)"},
+            {"path": "/info", "method": "GET", "description": "서비스 정보"}
+        ]
+    },
+    dynamic_fields=("timestamp",),
+    context=dynamic_values
+)
+
+INFO_RESPONSE = ResponseTemplate({
+    "service": "hello-ai",
+    "version": "1.0.0",
+    "description": "AI Lounge 테스트용 웹 서비스",
+    "features": [
+        "구조화된 로깅",
+        "메트릭 수집",
+        "헬스 체크",
+        "요청 ID 추적"
+    ],
+    "environment": {
+        "python_version": "3.12",
+        "timezone": "UTC"
+    }
+})
+
+
+def inflight_middleware(request, call_next):
+    """처리 중인 요청 수 추적 (드레인 시 완료 대기용)"""
+    lifecycle.request_started()
+    try:
+        call_next()
+    finally:
+        lifecycle.request_finished()
+
+
+def request_id_middleware(request, call_next):
+    """요청 ID 부여 (상위 프록시가 준 X-Request-ID가 있으면 재사용)"""
+    incoming = request.headers.get('X-Request-ID')
+    request.request_id = incoming if incoming and len(incoming) <= 64 else str(uuid.uuid4())[:8]
+    call_next()
+
+
+def timing_middleware(request, call_next):
+    """지연시간 측정 및 메트릭 기록"""
+    start_time = time.perf_counter()
+    request.status_code = 500
+    try:
+        call_next()
+    finally:
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        metrics.record(request.route.path, request.status_code, latency_ms)
+        if access_log is not None:
+            probe = (request.route.path in PROBE_PATHS
+                     or request.headers.get('User-Agent', '').startswith('kube-probe/'))
+            access_log.log(request.request_id, request.command, request.path,
+                           request.status_code, latency_ms, sampled=probe)
+
+
+def error_middleware(request, call_next):
+    """처리되지 않은 예외를 500 응답으로 변환"""
+    try:
+        call_next()
+    except Exception as e:
+        # 에러 핸들링
+        logger.error(f"Error handling request: {str(e)}")
+        logger.error(traceback.format_exc())
+
+        response = {
+            "error": "Internal Server Error",
+            "message": str(e),
+            "request_id": request.request_id
+        }
+        request.send_json_response(500, response)
+
+
+router = Router(middleware=[inflight_middleware, request_id_middleware, timing_middleware, error_middleware])
+
+
+@router.route('/')
+def index(request):
+    """기본 엔드포인트"""
+    request.send_cached_response(ROOT_RESPONSE)
+
+
+@router.route('/health')
+@router.route('/api/health')
+def health(request):
+    """헬스 체크 엔드포인트"""
+    request.send_cached_response(HEALTH_RESPONSE)
+
+
+@router.route('/ready')
+def ready(request):
+    """readiness 엔드포인트 (드레인 중이면 503)"""
+    if lifecycle.draining.is_set():
+        request.send_json_response(503, {"status": "draining", "service": "hello-ai"})
+    else:
+        request.send_cached_response(HEALTH_RESPONSE)
+
+
+@router.route('/info')
+def info(request):
+    """서비스 정보 엔드포인트"""
+    request.send_cached_response(INFO_RESPONSE)
+
+
+@router.route('/metrics')
+def prometheus_metrics(request):
+    """Prometheus 스크레이프용 메트릭"""
+    body = metrics.prometheus().encode('utf-8')
+    request.send_body(200, body, 'text/plain; version=0.0.4; charset=utf-8')
+
+
+@router.route('/metrics/json')
+def json_metrics(request):
+    """사람이 보기 위한 JSON 메트릭"""
+    uptime = metrics.uptime()
+    requests, latency = metrics.snapshot()
+    request.send_json_response(200, {
+        "service": "hello-ai",
+        "timestamp": datetime.utcnow().isoformat(),
+        "uptime_seconds": uptime,
+        "requests": requests,
+        "latency": {
+            "count": latency.count,
+            "avg_ms": round(latency.mean(), 3),
+            "p50_ms": latency.percentile(50),
+            "p90_ms": latency.percentile(90),
+            "p99_ms": latency.percentile(99),
+            "p999_ms": latency.percentile(99.9)
+        },
+        "access_log_dropped": access_log.dropped if access_log is not None else 0
+    })
+
+
+def not_found(request):
+    """404 처리"""
+    response = {
+        "error": "Not found",
+        "path": request.path,
+        "available_endpoints": router.paths()
+    }
+    request.send_json_response(404, response)
+
+
+router.set_not_found(not_found)
+
+
+def method_not_allowed(request):
+    """405 처리"""
+    # 요청 본문을 읽지 않았으므로 연결을 재사용하지 않음
+    if request.headers.get('Content-Length', '0') != '0' or request.headers.get('Transfer-Encoding'):
+        request.close_connection = True
+    response = {
+        "error": "Method not allowed",
+        "path": request.path,
+        "allowed_methods": sorted(request.route.methods)
+    }
+    request.send_json_response(405, response, headers=[('Allow', request.route.allow)])
+
+
+router.set_method_not_allowed(method_not_allowed)
+
 
 class HelloHandler(BaseHTTPRequestHandler):
     server_version = "Hello-AI/1.0"
 
+    # HTTP/1.1 지속 연결: 유휴 타임아웃(초)과 연결당 최대 요청 수
+    protocol_version = "HTTP/1.1"
+    timeout = float(os.environ.get('KEEPALIVE_TIMEOUT', 5))
+    max_requests = int(os.environ.get('KEEPALIVE_MAX_REQUESTS', 100))
+    # 헤더와 본문을 나눠 쓸 때 Nagle 지연이 생기지 않도록 설정
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.requests_handled = 0
+
+    def log_request(self, code='-', size='-'):
+        """기본 접근 로그 비활성화 (timing_middleware가 접근 로그 파이프라인으로 기록)"""
+
     def log_message(self, format, *args):
-        """기본 로그를 구조화된 로그로 대체"""
-        logger.info(format % args)
+        """기본 로그를 구조화된 로그로 대체 (log_error 등 요청 처리 외 메시지)"""
+        logger.warning(format % args)
 
-    def send_json_response(self, status_code, data):
+    def send_json_response(self, status_code, data, headers=()):
         """JSON 응답 전송"""
-        self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('X-Request-ID', self.request_id)
-        self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+        body = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        self.send_body(status_code, body, 'application/json', headers)
 
-    def update_metrics(self, success=True, latency_ms=None):
-        """메트릭 업데이트"""
-        metrics['requests_total'] += 1
-        if success:
-            metrics['requests_success'] += 1
+    def send_cached_response(self, template):
+        """미리 직렬화한 응답 전송 (If-None-Match 일치 시 304)"""
+        if template.not_modified(self.headers.get('If-None-Match')):
+            self.send_body(304, b'', headers=template.headers)
         else:
-            metrics['requests_error'] += 1
-
-        if latency_ms:
-            metrics['latency_ms'].append(latency_ms)
-            # 최근 100개만 유지
-            if len(metrics['latency_ms']) > 100:
-                metrics['latency_ms'] = metrics['latency_ms'][-100:]
-
-    def get_uptime(self):
-        """업타임 계산"""
-        return time.time() - metrics['uptime_start']
-
-    def get_avg_latency(self):
-        """평균 지연시간 계산"""
-        if not metrics['latency_ms']:
-            return 0
-        return sum(metrics['latency_ms']) / len(metrics['latency_ms'])
-
-    def get_health_status(self):
-        """서비스 상태 확인"""
-        uptime = self.get_uptime()
-        return {
-            "status": "ok",
-            "service": "hello-ai",
-            "version": "1.0.0",
-            "timestamp": datetime.utcnow().isoformat(),
-            "uptime_seconds": uptime,
-            "uptime_formatted": f"{uptime:.2f}s"
-        }
+            self.send_body(200, template.render(), headers=template.headers)
 
-    def get_metrics(self):
-        """메트릭 정보 반환"""
-        uptime = self.get_uptime()
-        return {
-            "service": "hello-ai",
-            "timestamp": datetime.utcnow().isoformat(),
-            "uptime_seconds": uptime,
-            "requests": {
-                "total": metrics['requests_total'],
-                "success": metrics['requests_success'],
-                "error": metrics['requests_error']
-            },
-            "latency": {
-                "avg_ms": self.get_avg_latency(),
-                "recent_count": len(metrics['latency_ms'])
-            }
-        }
+    def send_body(self, status_code, body, content_type=None, headers=()):
+        """본문 바이트와 공통 헤더 전송 (headers는 추가 (이름, 값) 목록)"""
+        self.status_code = status_code
+        self.requests_handled += 1
+
+        self.send_response(status_code)
+        if content_type is not None:
+            self.send_header('Content-type', content_type)
+        for name, value in headers:
+            self.send_header(name, value)
+        if status_code != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-Request-ID', self.request_id)
+        if (self.close_connection or self.requests_handled >= self.max_requests
+                or lifecycle.closing_connections()):
+            self.send_header('Connection', 'close')
+        else:
+            self.send_header('Keep-Alive', f"timeout={self.timeout:g}, max={self.max_requests - self.requests_handled}")
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
 
     def do_GET(self):
         """GET 요청 처리"""
-        start_time = time.time()
-        self.request_id = str(uuid.uuid4())[:8]
-
-        try:
-            if self.path == '/api/health':
-                # API 헬스 체크 엔드포인트
-                self.send_json_response(200, self.get_health_status())
-                self.update_metrics(success=True)
-
-            elif self.path == '/health':
-                # 헬스 체크 엔드포인트
-                self.send_json_response(200, self.get_health_status())
-                self.update_metrics(success=True)
-
-            elif self.path == '/metrics':
-                # 메트릭 엔드포인트
-                self.send_json_response(200, self.get_metrics())
-                self.update_metrics(success=True)
-
-            elif self.path == '/':
-                # 기본 엔드포인트
-                response = {
-                    "message": "Hello World from AI Lounge!",
-                    "service": "hello-ai",
-                    "version": "1.0.0",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "endpoints": [
-                        {"path": "/", "method": "GET", "description": "Hello World 메시지"},
-                        {"path": "/health", "method": "GET", "description": "헬스 체크"},
-                        {"path": "/metrics", "method": "GET", "description": "서비스 메트릭"},
-                        {"path": "/info", "method": "GET", "description": "서비스 정보"}
-                    ]
-                }
-                self.send_json_response(200, response)
-                self.update_metrics(success=True)
-
-            elif self.path == '/info':
-                # 서비스 정보 엔드포인트
-                response = {
-                    "service": "hello-ai",
-                    "version": "1.0.0",
-                    "description": "AI Lounge 테스트용 웹 서비스",
-                    "features": [
-                        "구조화된 로깅",
-                        "메트릭 수집",
-                        "헬스 체크",
-                        "요청 ID 추적"
-                    ],
-                    "environment": {
-                        "python_version": "3.12",
-                        "timezone": "UTC"
-                    }
-                }
-                self.send_json_response(200, response)
-                self.update_metrics(success=True)
-
-            else:
-                # 404 처리
-                response = {
-                    "error": "Not found",
-                    "path": self.path,
-                    "available_endpoints": ["/", "/health", "/metrics", "/info"]
-                }
-                self.send_json_response(404, response)
-                self.update_metrics(success=False)
-
-        except Exception as e:
-            # 에러 핸들링
-            logger.error(f"Error handling request: {str(e)}")
-            logger.error(traceback.format_exc())
-
-            response = {
-                "error": "Internal Server Error",
-                "message": str(e),
-                "request_id": self.request_id
-            }
-            self.send_json_response(500, response)
-            self.update_metrics(success=False)
-
-        finally:
-            # 지연시간 계산
-            latency_ms = (time.time() - start_time) * 1000
-            logger.info(f"Request {self.request_id}: {self.path} - {latency_ms:.2f}ms")
+        self.dispatch()
+
+    def do_HEAD(self):
+        """HEAD 요청 처리 (GET과 같은 헤더, 본문 없음)"""
+        self.dispatch()
+
+    # 다른 메서드도 라우터에서 처리 (허용되지 않은 라우트면 405)
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_GET
+
+    def dispatch(self):
+        """라우트 테이블에서 핸들러를 찾아 미들웨어 체인과 함께 실행"""
+        route, self.path_params, self.query_string = router.match(self.path)
+        if route is None:
+            self.route = router.not_found
+            self.route(self)
+        elif self.command not in route.methods:
+            # 메트릭 라벨은 매칭된 라우트 경로를 유지
+            self.route = route
+            router.method_not_allowed(self)
+        else:
+            self.route = route
+            route(self)
 
 def main():
     port = int(os.environ.get('PORT', 8080))
-    server = HTTPServer(('0.0.0.0', port), HelloHandler)
+    mode = os.environ.get('SERVER_MODE', 'threaded')
+    threads = int(os.environ.get('WORKER_THREADS', 8))
+    workers = int(os.environ.get('WORKERS', 2))
+    if mode not in SERVER_MODES:
+        logger.error(f"알 수 없는 SERVER_MODE: {mode} (가능한 값: {', '.join(SERVER_MODES)})")
+        raise SystemExit(2)
+
+    if mode == 'prefork':
+        # 워커 프로세스들의 메트릭을 mmap 파일로 합산
+        metrics_dir = os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'hello-ai-metrics'))
+        metrics.enable_multiprocess(metrics_dir)
 
     logger.info("=" * 60)
     logger.info("Hello-ai 서비스가 시작되었습니다.")
     logger.info("=" * 60)
     logger.info(f"포트: {port}")
+    logger.info(f"서버 모드: {mode} (threads={threads}, workers={workers})")
     logger.info("사용 가능한 엔드포인트:")
     logger.info("  GET /        - Hello World 메시지")
     logger.info("  GET /health  - 헬스 체크")
-    logger.info("  GET /metrics - 서비스 메트릭")
+    logger.info("  GET /ready   - 준비 상태 (드레인 중 503)")
+    logger.info("  GET /metrics - 서비스 메트릭 (Prometheus)")
+    logger.info("  GET /metrics/json - 서비스 메트릭 (JSON)")
     logger.info("  GET /info    - 서비스 정보")
     logger.info("=" * 60)
 
-    server.serve_forever()
+    serve(HelloHandler, lifecycle, port=port, mode=mode, threads=threads, workers=workers)
 
 if __name__ == '__main__':
     main()
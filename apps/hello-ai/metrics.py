@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Hello-ai 메트릭 수집
+
+- 스레드별 카운터 샤드: 요청 경로에서는 자기 스레드 샤드만 갱신하므로 잠금이 필요 없음
+- 읽기 시점에 모든 샤드를 합산
+- 고정 크기 log-linear 지연시간 히스토그램 (HDR 방식, 상대 오차 약 6%)
+- 경로/상태 코드별 시계열과 Prometheus 텍스트 포맷 출력
+- 멀티 프로세스 집계: 프로세스마다 자기 mmap 파일에 스냅샷을 게시하고 읽을 때 합산
+"""
+
+import glob
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 2의 거듭제곱 구간마다 16개 하위 버킷
+SUB_BUCKET_BITS = 4
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+# 마이크로초 단위 최대 기록값 (약 67초, 넘으면 마지막 버킷)
+MAX_LATENCY_US = (1 << 26) - 1
+
+
+def bucket_index(value_us):
+    """마이크로초 값을 버킷 인덱스로 변환"""
+    if value_us < SUB_BUCKET_COUNT:
+        return max(value_us, 0)
+    if value_us > MAX_LATENCY_US:
+        value_us = MAX_LATENCY_US
+    shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKET_COUNT + (value_us >> shift) - SUB_BUCKET_COUNT
+
+
+def bucket_bounds(index):
+    """버킷 인덱스의 [하한, 상한] 마이크로초 값"""
+    if index < SUB_BUCKET_COUNT:
+        return index, index
+    shift = index // SUB_BUCKET_COUNT - 1
+    mantissa = index % SUB_BUCKET_COUNT + SUB_BUCKET_COUNT
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+BUCKET_COUNT = bucket_index(MAX_LATENCY_US) + 1
+
+# Prometheus 히스토그램에 노출할 le 경계 (초)
+EXPOSED_BUCKETS_SECONDS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# mmap 파일 헤더: (세대 번호, 페이로드 길이). 세대가 홀수면 쓰는 중
+_HEADER = struct.Struct('<QQ')
+
+
+class LatencyHistogram:
+    """고정 메모리 지연시간 히스토그램 (기록 O(1), 리스트 재할당 없음)"""
+
+    __slots__ = ('counts', 'count', 'sum_us')
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.sum_us = 0
+
+    def record(self, latency_ms):
+        value_us = int(latency_ms * 1000)
+        self.counts[bucket_index(value_us)] += 1
+        self.count += 1
+        self.sum_us += value_us
+
+    def merge(self, other):
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.sum_us += other.sum_us
+
+    def percentile(self, q):
+        """q 분위(0~100) 지연시간(ms), 버킷 중간값 기준"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(self.count * q / 100.0 + 0.5))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                low, high = bucket_bounds(i)
+                return (low + high) / 2000.0
+        return bucket_bounds(BUCKET_COUNT - 1)[1] / 1000.0
+
+    def mean(self):
+        """평균 지연시간(ms)"""
+        return self.sum_us / self.count / 1000.0 if self.count else 0.0
+
+    def cumulative(self, bounds_seconds):
+        """le 경계별 누적 건수 (버킷 상한이 경계 이하인 것만 포함)"""
+        result = []
+        seen = 0
+        index = 0
+        for bound in bounds_seconds:
+            limit_us = bound * 1_000_000
+            while index < BUCKET_COUNT and bucket_bounds(index)[1] <= limit_us:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def to_dict(self):
+        """직렬화용 희소 표현"""
+        return {
+            'counts': {i: c for i, c in enumerate(self.counts) if c},
+            'count': self.count,
+            'sum_us': self.sum_us,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        for i, c in data['counts'].items():
+            histogram.counts[int(i)] = c
+        histogram.count = data['count']
+        histogram.sum_us = data['sum_us']
+        return histogram
+
+
+class Metrics:
+    """
+    스레드별 샤드를 읽기 시점에 합산하는 메트릭 저장소
+
+    샤드는 {(path, status): LatencyHistogram} 딕셔너리이며 히스토그램의 count가
+    곧 요청 수입니다. enable_multiprocess()를 호출하면 각 프로세스가 자기 샤드
+    합계를 mmap 파일에 주기적으로 게시하고, 읽을 때 모든 프로세스 파일을 합산합니다.
+    """
+
+    def __init__(self):
+        self.uptime_start = time.time()
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._directory = None
+        self._publish_interval = 1.0
+        self._mmap = None
+        self._mmap_pid = None
+        self._generation = 0
+        self._publish_lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # 스레드당 최초 1회만 잠금
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, path, status, latency_ms):
+        """요청 1건 기록"""
+        shard = self._shard()
+        histogram = shard.get((path, status))
+        if histogram is None:
+            histogram = shard[(path, status)] = LatencyHistogram()
+        histogram.record(latency_ms)
+
+    def _local_series(self):
+        """이 프로세스의 모든 스레드 샤드 합산"""
+        with self._shards_lock:
+            shards = list(self._shards)
+
+        series = {}
+        for shard in shards:
+            for key, histogram in list(shard.items()):
+                merged = series.get(key)
+                if merged is None:
+                    merged = series[key] = LatencyHistogram()
+                merged.merge(histogram)
+        return series
+
+    def series(self):
+        """모든 프로세스를 합산한 {(path, status): LatencyHistogram}"""
+        if self._directory is None:
+            return self._local_series()
+
+        self.publish()
+        series = {}
+        for filename in glob.glob(os.path.join(self._directory, 'metrics-*.mmap')):
+            for key, histogram in self._read_file(filename).items():
+                merged = series.get(key)
+                if merged is None:
+                    merged = series[key] = LatencyHistogram()
+                merged.merge(histogram)
+        return series
+
+    def snapshot(self):
+        """요청 합계(total/success/error)와 전체 지연시간 히스토그램"""
+        totals = {'total': 0, 'success': 0, 'error': 0}
+        latency = LatencyHistogram()
+        for (path, status), histogram in self.series().items():
+            totals['total'] += histogram.count
+            totals['success' if status < 400 else 'error'] += histogram.count
+            latency.merge(histogram)
+        return totals, latency
+
+    def uptime(self):
+        return time.time() - self.uptime_start
+
+    # ------------------------------------------------------------------
+    # 멀티 프로세스 집계
+    # ------------------------------------------------------------------
+
+    def enable_multiprocess(self, directory, publish_interval=1.0, clear=True):
+        """프로세스 간 집계 활성화 (fork 전에 호출)"""
+        os.makedirs(directory, exist_ok=True)
+        if clear:
+            for filename in glob.glob(os.path.join(directory, 'metrics-*.mmap')):
+                os.unlink(filename)
+        self._directory = directory
+        self._publish_interval = publish_interval
+        os.register_at_fork(after_in_child=self._after_fork)
+        self._start_publisher()
+
+    def _after_fork(self):
+        # 부모에서 복사된 샤드와 mmap은 자식의 것이 아님
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._mmap = None
+        self._mmap_pid = None
+        self._generation = 0
+        self._start_publisher()
+
+    def _start_publisher(self):
+        def run():
+            while True:
+                time.sleep(self._publish_interval)
+                try:
+                    self.publish()
+                except Exception as e:
+                    logger.error(f"메트릭 게시 실패: {e}")
+
+        threading.Thread(target=run, name='metrics-publisher', daemon=True).start()
+
+    def publish(self):
+        """이 프로세스의 합계를 자기 mmap 파일에 기록"""
+        if self._directory is None:
+            return
+        payload = json.dumps({
+            f"{path}\t{status}": histogram.to_dict()
+            for (path, status), histogram in self._local_series().items()
+        }, separators=(',', ':')).encode('utf-8')
+
+        with self._publish_lock:
+            needed = _HEADER.size + len(payload)
+            if self._mmap is None or self._mmap_pid != os.getpid() or len(self._mmap) < needed:
+                self._remap(needed)
+
+            # 세대 번호가 홀수인 동안은 읽는 쪽이 재시도
+            self._generation += 1
+            _HEADER.pack_into(self._mmap, 0, self._generation, len(payload))
+            self._mmap[_HEADER.size:needed] = payload
+            self._generation += 1
+            _HEADER.pack_into(self._mmap, 0, self._generation, len(payload))
+
+    def _remap(self, needed):
+        size = mmap.PAGESIZE
+        while size < needed:
+            size *= 2
+        filename = os.path.join(self._directory, f"metrics-{os.getpid()}.mmap")
+        fd = os.open(filename, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            if self._mmap is not None and self._mmap_pid == os.getpid():
+                self._mmap.close()
+            self._mmap = mmap.mmap(fd, size)
+            self._mmap_pid = os.getpid()
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_file(filename, retries=5):
+        """다른 프로세스의 mmap 파일을 일관된 상태로 읽기"""
+        try:
+            with open(filename, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return {}
+
+        try:
+            for _ in range(retries):
+                generation, length = _HEADER.unpack_from(mapped, 0)
+                if generation % 2 or length == 0:
+                    continue
+                payload = mapped[_HEADER.size:_HEADER.size + length]
+                if _HEADER.unpack_from(mapped, 0)[0] != generation:
+                    continue
+                try:
+                    data_by_key = json.loads(payload)
+                except ValueError:
+                    # 쓰는 쪽이 파일을 키우는 중이면 잘린 페이로드일 수 있음
+                    continue
+                series = {}
+                for key, data in data_by_key.items():
+                    path, _, status = key.rpartition('\t')
+                    series[(path, int(status))] = LatencyHistogram.from_dict(data)
+                return series
+            return {}
+        finally:
+            mapped.close()
+
+    # ------------------------------------------------------------------
+    # Prometheus 텍스트 포맷
+    # ------------------------------------------------------------------
+
+    def prometheus(self, prefix='hello_ai'):
+        """Prometheus text exposition format 0.0.4 문자열"""
+        series = sorted(self.series().items())
+        lines = [
+            f"# HELP {prefix}_requests_total 처리한 HTTP 요청 수",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        for (path, status), histogram in series:
+            lines.append(f'{prefix}_requests_total{{path="{_escape(path)}",code="{status}"}} {histogram.count}')
+
+        lines += [
+            f"# HELP {prefix}_request_duration_seconds HTTP 요청 처리 시간",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for (path, status), histogram in series:
+            labels = f'path="{_escape(path)}",code="{status}"'
+            for bound, count in zip(EXPOSED_BUCKETS_SECONDS, histogram.cumulative(EXPOSED_BUCKETS_SECONDS)):
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound:g}"}} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {histogram.sum_us / 1_000_000:.6f}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {histogram.count}')
+
+        lines += [
+            f"# HELP {prefix}_uptime_seconds 서비스 업타임",
+            f"# TYPE {prefix}_uptime_seconds gauge",
+            f"{prefix}_uptime_seconds {self.uptime():.3f}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    """Prometheus 라벨 값 이스케이프"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
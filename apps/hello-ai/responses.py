@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Hello-ai 응답 캐시
+
+정적 엔드포인트 응답을 시작 시 한 번만 직렬화해 두고,
+요청마다 timestamp/uptime 같은 동적 필드만 끼워 넣습니다.
+- compact JSON, 미리 인코딩된 바이트
+- 미리 계산한 헤더 목록 (Content-Type, ETag, Cache-Control)
+- ETag / If-None-Match 304 지원
+"""
+
+import hashlib
+import json
+
+
+class ResponseTemplate:
+    """미리 직렬화한 JSON 응답 템플릿"""
+
+    def __init__(self, data, dynamic_fields=(), context=None, content_type='application/json'):
+        """
+        data           : 응답 딕셔너리 (dynamic_fields의 값은 무시되고 자리표시자로 대체)
+        dynamic_fields : 요청마다 다시 계산할 최상위 키 목록
+        context        : 동적 필드 값을 담은 딕셔너리를 반환하는 함수
+        """
+        self.dynamic_fields = tuple(dynamic_fields)
+        self.context = context
+
+        template = dict(data)
+        tokens = []
+        for i, field in enumerate(self.dynamic_fields):
+            token = f"__dynamic_{i}__"
+            template[field] = token
+            tokens.append(json.dumps(token).encode('utf-8'))
+
+        serialized = json.dumps(template, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+        # 자리표시자 기준으로 정적 조각 분리 (필드 순서는 직렬화 순서를 따름)
+        positions = sorted((serialized.index(token), i, token) for i, token in enumerate(tokens))
+        self.parts = []
+        self.field_order = []
+        cursor = 0
+        for position, i, token in positions:
+            self.parts.append(serialized[cursor:position])
+            self.field_order.append(self.dynamic_fields[i])
+            cursor = position + len(token)
+        self.parts.append(serialized[cursor:])
+
+        digest = hashlib.sha1(serialized).hexdigest()[:16]
+        # 동적 필드가 있으면 본문 바이트가 매번 달라지므로 약한 ETag
+        self.etag = f'W/"{digest}"' if self.dynamic_fields else f'"{digest}"'
+        self.static_body = serialized if not self.dynamic_fields else None
+
+        self.headers = (
+            ('Content-Type', content_type),
+            ('ETag', self.etag),
+            ('Cache-Control', 'no-cache'),
+        )
+
+    def render(self):
+        """응답 본문 바이트 생성"""
+        if self.static_body is not None:
+            return self.static_body
+
+        values = self.context()
+        chunks = [self.parts[0]]
+        for field, part in zip(self.field_order, self.parts[1:]):
+            chunks.append(json.dumps(values[field], ensure_ascii=False).encode('utf-8'))
+            chunks.append(part)
+        return b''.join(chunks)
+
+    def not_modified(self, if_none_match):
+        """If-None-Match 헤더가 이 템플릿의 ETag와 일치하는지 (약한 비교)"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        own = self.etag[2:] if self.etag.startswith('W/') else self.etag
+        for candidate in if_none_match.split(','):
+            candidate = candidate.strip()
+            if candidate.startswith('W/'):
+                candidate = candidate[2:]
+            if candidate == own:
+                return True
+        return False
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Hello-ai 라우터
+
+- 정확히 일치하는 경로는 딕셔너리 조회로 O(1) 디스패치
+- 파라미터/접두사 경로({id}, {rest:path})는 하나의 정규식으로 컴파일해 한 번에 매칭
+- 쿼리 문자열은 매칭 전에 분리
+- 미들웨어 체인은 라우트 등록 시 한 번만 조립 (요청마다 조립 비용 없음)
+"""
+
+import re
+
+_PARAM = re.compile(r'\{(\w+)(?::(\w+))?\}')
+
+# 파라미터 변환기별 정규식 조각
+_CONVERTERS = {
+    None: r'[^/]+',
+    'int': r'\d+',
+    'path': r'.*',
+}
+
+
+class Route:
+    """등록된 라우트 하나"""
+
+    def __init__(self, path, handler, methods, middleware):
+        self.path = path
+        self.handler = handler
+        self.methods = frozenset(methods) | ({'HEAD'} if 'GET' in methods else frozenset())
+        self.allow = ', '.join(sorted(self.methods))
+        self.params = _PARAM.findall(path)
+        self.chain = _build_chain(handler, middleware)
+
+    def __call__(self, request):
+        self.chain(request)
+
+
+def _build_chain(handler, middleware):
+    """미들웨어를 바깥에서 안쪽 순서로 감싼 호출 체인"""
+    call = handler
+    for mw in reversed(middleware):
+        call = (lambda mw, inner: lambda request: mw(request, lambda: inner(request)))(mw, call)
+    return call
+
+
+class Router:
+    """
+    선언적 라우트 테이블
+
+    핸들러와 미들웨어는 모두 request(= BaseHTTPRequestHandler 인스턴스)를 받습니다.
+    미들웨어 시그니처는 mw(request, call_next)이며 call_next()로 다음 단계를 호출합니다.
+    매칭 결과는 request.route, request.path_params에 설정됩니다.
+    경로는 맞지만 메서드가 허용되지 않으면 method_not_allowed 핸들러가 실행됩니다
+    (request.route는 매칭된 라우트이므로 route.allow로 Allow 헤더를 만들 수 있음).
+    """
+
+    def __init__(self, middleware=()):
+        self.middleware = list(middleware)
+        self._exact = {}
+        self._dynamic = []
+        self._pattern = None
+        self._pattern_routes = {}
+        self.not_found = None
+        self.method_not_allowed = None
+
+    def route(self, path, methods=('GET',), middleware=()):
+        """라우트 등록 데코레이터"""
+        def decorator(handler):
+            self.add(path, handler, methods, middleware)
+            return handler
+        return decorator
+
+    def add(self, path, handler, methods=('GET',), middleware=()):
+        route = Route(path, handler, methods, self.middleware + list(middleware))
+        if route.params:
+            self._dynamic.append(route)
+            self._compile()
+        else:
+            self._exact[path] = route
+        return route
+
+    def set_not_found(self, handler, middleware=()):
+        """일치하는 라우트가 없을 때 실행할 핸들러 (전역 미들웨어 적용)"""
+        self.not_found = Route('other', handler, ('GET',), self.middleware + list(middleware))
+
+    def set_method_not_allowed(self, handler, middleware=()):
+        """경로는 있지만 메서드가 허용되지 않을 때 실행할 핸들러 (전역 미들웨어 적용)"""
+        self.method_not_allowed = Route('other', handler, ('GET',), self.middleware + list(middleware))
+
+    def _compile(self):
+        alternatives = []
+        self._pattern_routes = {}
+        for i, route in enumerate(self._dynamic):
+            name = f"r{i}"
+            regex = ''
+            cursor = 0
+            for m in _PARAM.finditer(route.path):
+                regex += re.escape(route.path[cursor:m.start()])
+                regex += f"(?P<{name}_{m.group(1)}>{_CONVERTERS[m.group(2)]})"
+                cursor = m.end()
+            regex += re.escape(route.path[cursor:])
+            alternatives.append(f"(?P<{name}>{regex})")
+            self._pattern_routes[name] = route
+        self._pattern = re.compile('(?:' + '|'.join(alternatives) + r')\Z')
+
+    def match(self, raw_path):
+        """(route, path_params, query_string) 반환, 없으면 route는 None"""
+        path, _, query = raw_path.partition('?')
+        route = self._exact.get(path)
+        if route is not None:
+            return route, {}, query
+
+        if self._pattern is not None:
+            m = self._pattern.match(path)
+            if m:
+                name = m.lastgroup
+                route = self._pattern_routes[name]
+                params = {}
+                for param, converter in route.params:
+                    value = m.group(f"{name}_{param}")
+                    params[param] = int(value) if converter == 'int' else value
+                return route, params, query
+
+        return None, {}, query
+
+    def paths(self):
+        """등록된 경로 목록"""
+        return list(self._exact) + [route.path for route in self._dynamic]
+
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Hello-ai 서버 실행 모드
+
+SERVER_MODE 환경 변수로 동시성 모델을 선택합니다.
+- single   : 기존 단일 스레드 HTTPServer (비교 기준)
+- threaded : 고정 크기 스레드 풀 HTTPServer
+- asyncio  : asyncio 이벤트 루프 기반 서버
+- prefork  : 리스닝 소켓을 공유하는 사전 fork 멀티 프로세스
+
+시그널 처리 (모든 모드 공통):
+- SIGTERM : readiness를 실패시키고 drain_delay 동안 계속 서비스한 뒤
+            리스닝을 멈추고 처리 중인 요청을 drain_timeout까지 기다린 후 종료
+- SIGINT  : 지연 없이 리스닝을 멈추고 처리 중인 요청만 마친 후 종료
+- SIGHUP  : 리스닝 소켓은 열어 둔 채 처리 중인 요청을 마치고 같은 명령으로 재실행
+            (소켓 fd는 HELLO_AI_LISTEN_FD로 전달, 그 사이 연결은 커널 backlog에 대기)
+"""
+
+from http.server import HTTPServer
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import collections
+import io
+import logging
+import os
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SERVER_MODES = ('single', 'threaded', 'asyncio', 'prefork')
+
+# asyncio 모드에서 허용하는 요청 헤더 최대 크기
+MAX_HEADER_BYTES = 64 * 1024
+
+# 재실행 시 리스닝 소켓 fd를 넘겨주는 환경 변수
+LISTEN_FD_ENV = 'HELLO_AI_LISTEN_FD'
+
+_SIGNAL_ACTIONS = {
+    signal.SIGTERM: 'drain',
+    signal.SIGINT: 'stop',
+    signal.SIGHUP: 'reload',
+}
+
+
+class PooledHTTPServer(HTTPServer):
+    """요청마다 스레드를 만들지 않고 고정 크기 스레드 풀로 처리하는 HTTPServer
+
+    keep-alive 연결은 요청 사이에 풀 스레드를 붙잡지 않고 selector 스레드에 맡겨 두었다가
+    다음 요청이 도착하면 다시 풀에 넘깁니다. 유휴 연결이 많아도 워커가 고갈되지 않고,
+    handler_class.timeout(초) 동안 요청이 없는 연결은 selector 스레드가 닫습니다.
+    """
+
+    def __init__(self, server_address, handler_class, max_workers=8, bind_and_activate=True):
+        super().__init__(server_address, _parking_handler_class(handler_class), bind_and_activate)
+        self.max_workers = max_workers
+        self.idle_timeout = getattr(handler_class, 'timeout', None)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hello-ai')
+        # 풀 스레드가 반납한 연결 (selector 스레드만 selector에 등록)
+        self._returned = collections.deque()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_send.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        self._closed = False
+        self._idle_thread = threading.Thread(target=self._watch_idle, name='hello-ai-keepalive', daemon=True)
+        self._idle_thread.start()
+
+    def process_request(self, request, client_address):
+        # 첫 요청도 도착한 뒤에야 풀에 넘김 (연결만 맺고 보내지 않는 클라이언트 대비)
+        self._park(self.RequestHandlerClass(request, client_address, self))
+
+    def _park(self, handler):
+        self._returned.append(handler)
+        self._wakeup()
+
+    def _wakeup(self):
+        try:
+            self._wakeup_send.send(b'\0')
+        except OSError:
+            # 버퍼가 찼으면 이미 깨울 신호가 쌓여 있음
+            pass
+
+    def _serve_connection(self, handler):
+        """읽을 데이터가 있는 연결에서 요청을 처리하고, 유지할 연결은 selector에 반납"""
+        try:
+            while True:
+                handler.handle_one_request()
+                if handler.close_connection:
+                    break
+                # 파이프라이닝으로 이미 버퍼에 들어온 요청은 selector가 알 수 없으므로 바로 처리
+                if not handler.has_pending_input():
+                    self._park(handler)
+                    return
+        except Exception:
+            self.handle_error(handler.request, handler.client_address)
+        self._close_connection(handler)
+
+    def _close_connection(self, handler):
+        try:
+            handler.finish()
+        except OSError:
+            pass
+        self.shutdown_request(handler.request)
+
+    def _watch_idle(self):
+        """유휴 연결을 감시해 요청이 도착하면 풀에 넘기고 시간이 지나면 닫음"""
+        # 모두 같은 유휴 시간이므로 삽입 순서가 곧 만료 순서
+        parked = {}
+        while not self._closed:
+            timeout = None
+            if parked and self.idle_timeout is not None:
+                timeout = max(next(iter(parked.values())) - time.monotonic(), 0)
+            for key, _ in self._selector.select(timeout):
+                if key.data is None:
+                    try:
+                        self._wakeup_recv.recv(4096)
+                    except OSError:
+                        pass
+                    continue
+                self._selector.unregister(key.fileobj)
+                del parked[key.data]
+                self._pool.submit(self._serve_connection, key.data)
+
+            now = time.monotonic()
+            while self._returned:
+                handler = self._returned.popleft()
+                self._selector.register(handler.connection, selectors.EVENT_READ, handler)
+                parked[handler] = now + self.idle_timeout if self.idle_timeout is not None else None
+
+            if self.idle_timeout is not None:
+                while parked:
+                    handler, expires = next(iter(parked.items()))
+                    if expires > now:
+                        break
+                    del parked[handler]
+                    self._selector.unregister(handler.connection)
+                    self._close_connection(handler)
+
+        for handler in parked:
+            self._close_connection(handler)
+
+    def server_close(self):
+        super().server_close()
+        self._closed = True
+        self._wakeup()
+        self._idle_thread.join()
+        self._pool.shutdown(wait=True)
+        # 종료 중에 반납된 연결
+        while self._returned:
+            self._close_connection(self._returned.popleft())
+        self._selector.close()
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+
+
+def _parking_handler_class(handler_class):
+    """연결마다 한 번 만들고 요청 단위로 handle_one_request()를 호출하는 핸들러 클래스 생성"""
+
+    class ParkingHandler(handler_class):
+        def __init__(self, request, client_address, server):
+            self.request = request
+            self.client_address = client_address
+            self.server = server
+            self.close_connection = True
+            self.setup()
+
+        def has_pending_input(self):
+            """다음 요청 바이트가 이미 도착했는지 (블로킹하지 않음)"""
+            self.connection.settimeout(0)
+            try:
+                return bool(self.rfile.peek(1))
+            except OSError:
+                return False
+            finally:
+                self.connection.settimeout(self.timeout)
+
+    return ParkingHandler
+
+
+def _buffered_handler_class(handler_class):
+    """소켓 대신 메모리 버퍼로 요청 하나를 처리하는 핸들러 클래스 생성"""
+
+    class BufferedHandler(handler_class):
+        def __init__(self, raw_request, client_address, server, requests_handled=0):
+            self.client_address = client_address
+            self.server = server
+            self.rfile = io.BytesIO(raw_request)
+            self.wfile = io.BytesIO()
+            self.close_connection = True
+            self.requests_handled = requests_handled
+            self.handle_one_request()
+
+    return BufferedHandler
+
+
+def _content_length(head):
+    """요청 헤더에서 Content-Length 추출 (없으면 0)"""
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            try:
+                return max(int(value.strip()), 0)
+            except ValueError:
+                return 0
+    return 0
+
+
+def _listen_socket(host, port):
+    """재실행으로 물려받은 소켓이 있으면 재사용, 없으면 새로 바인드"""
+    fd = os.environ.pop(LISTEN_FD_ENV, None)
+    if fd is not None:
+        sock = socket.socket(fileno=int(fd))
+        logger.info(f"물려받은 리스닝 소켓 사용: fd={fd} {sock.getsockname()}")
+        return sock
+    return socket.create_server((host, port), backlog=128)
+
+
+def _attach_socket(server, sock):
+    """bind_and_activate=False로 만든 서버에 리스닝 소켓 연결"""
+    server.socket.close()
+    server.socket = sock
+    server.server_address = sock.getsockname()
+    return server
+
+
+def _exit(action, sock, lifecycle, is_worker):
+    """드레인이 끝난 뒤 종료하거나 재실행"""
+    lifecycle.run_exit_hooks()
+    logging.shutdown()
+    if action == 'reload' and not is_worker:
+        sock.set_inheritable(True)
+        env = dict(os.environ, **{LISTEN_FD_ENV: str(sock.fileno())})
+        os.execve(sys.executable, [sys.executable] + sys.orig_argv[1:], env)
+    # 남은 keep-alive 연결과 풀 스레드를 정리하지 않고 바로 종료
+    os._exit(0)
+
+
+def _serve_sync(server, sock, lifecycle, is_worker=False):
+    """HTTPServer(single/threaded) 실행과 시그널 기반 드레인"""
+    state = {'action': None}
+
+    def stopper(action):
+        if action == 'drain':
+            lifecycle.start_draining()
+            logger.info(f"드레인 시작: {lifecycle.drain_delay:g}초 동안 readiness 실패 응답")
+            time.sleep(lifecycle.drain_delay)
+        server.shutdown()
+
+    def on_signal(signum, frame):
+        if state['action'] is None:
+            state['action'] = _SIGNAL_ACTIONS[signum]
+            threading.Thread(target=stopper, args=(state['action'],), daemon=True).start()
+
+    for signum in _SIGNAL_ACTIONS:
+        signal.signal(signum, on_signal)
+
+    server.serve_forever()
+
+    lifecycle.stopping.set()
+    if lifecycle.wait_idle(lifecycle.drain_timeout):
+        logger.info(f"처리 중인 요청 완료 ({state['action']})")
+    else:
+        logger.warning(f"드레인 시간 초과: 처리 중인 요청 {lifecycle.inflight}건을 남기고 종료")
+    _exit(state['action'], sock, lifecycle, is_worker)
+
+
+async def _serve_async(sock, handler_class, lifecycle):
+    """asyncio 이벤트 루프에서 연결을 받고 핸들러 로직은 메모리 버퍼로 실행"""
+    buffered = _buffered_handler_class(handler_class)
+    idle_timeout = getattr(handler_class, 'timeout', None)
+    # 요청을 처리하는 중인 연결(True)과 다음 요청을 기다리는 유휴 연결(False)
+    connections = {}
+
+    async def client_connected(reader, writer):
+        task = asyncio.current_task()
+        connections[task] = False
+        peer = writer.get_extra_info('peername') or ('', 0)
+        served = 0
+        try:
+            while not lifecycle.stopping.is_set():
+                head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), idle_timeout)
+                connections[task] = True
+                body = b''
+                length = _content_length(head)
+                if length:
+                    body = await asyncio.wait_for(reader.readexactly(length), idle_timeout)
+                handler = buffered(head + body, peer[:2], None, requests_handled=served)
+                served = handler.requests_handled
+                writer.write(handler.wfile.getvalue())
+                await writer.drain()
+                connections[task] = False
+                if handler.close_connection:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                asyncio.TimeoutError, asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            connections.pop(task, None)
+            writer.close()
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    state = {'action': None}
+
+    def on_signal(signum):
+        if state['action'] is None:
+            state['action'] = _SIGNAL_ACTIONS[signum]
+            stop.set()
+
+    for signum in _SIGNAL_ACTIONS:
+        loop.add_signal_handler(signum, on_signal, signum)
+
+    # Server.close()가 소켓을 닫으므로 복제본을 넘겨 원본은 재실행용으로 유지
+    server = await asyncio.start_server(client_connected, sock=sock.dup(), limit=MAX_HEADER_BYTES)
+    await stop.wait()
+
+    if state['action'] == 'drain':
+        lifecycle.start_draining()
+        logger.info(f"드레인 시작: {lifecycle.drain_delay:g}초 동안 readiness 실패 응답")
+        await asyncio.sleep(lifecycle.drain_delay)
+
+    server.close()
+    lifecycle.stopping.set()
+    for task, busy in list(connections.items()):
+        if not busy:
+            task.cancel()
+    busy_tasks = list(connections)
+    if busy_tasks:
+        _, pending = await asyncio.wait(busy_tasks, timeout=lifecycle.drain_timeout)
+        if pending:
+            logger.warning(f"드레인 시간 초과: 처리 중인 연결 {len(pending)}개를 남기고 종료")
+    return state['action']
+
+
+class _MasterSignal(Exception):
+    def __init__(self, signum):
+        self.signum = signum
+
+
+def _prefork(sock, workers, make_server, lifecycle):
+    """리스닝 소켓을 공유하는 워커 프로세스를 fork하고 죽으면 다시 띄움"""
+    children = set()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            # 워커에서 난 예외가 마스터의 감시 루프로 빠져나가지 않도록 항상 여기서 종료
+            code = 1
+            try:
+                server = _attach_socket(make_server(bind_and_activate=False), sock)
+                _serve_sync(server, sock, lifecycle, is_worker=True)
+                code = 0
+            except BaseException:
+                logger.exception(f"워커 {os.getpid()} 실행 실패")
+            finally:
+                os._exit(code)
+        children.add(pid)
+
+    def on_signal(signum, frame):
+        raise _MasterSignal(signum)
+
+    for signum in _SIGNAL_ACTIONS:
+        signal.signal(signum, on_signal)
+
+    for _ in range(workers):
+        spawn()
+    logger.info(f"prefork 워커 {workers}개 시작: {sorted(children)}")
+
+    try:
+        while True:
+            pid, status = os.wait()
+            children.discard(pid)
+            logger.warning(f"워커 {pid} 종료 (status={status}), 재시작합니다.")
+            spawn()
+    except _MasterSignal as e:
+        action = _SIGNAL_ACTIONS[e.signum]
+
+    # 이후 시그널은 무시하고 워커에 같은 시그널 전달 후 종료 대기
+    for signum in _SIGNAL_ACTIONS:
+        signal.signal(signum, signal.SIG_IGN)
+    worker_signal = {'drain': signal.SIGTERM, 'stop': signal.SIGINT, 'reload': signal.SIGHUP}[action]
+    for pid in children:
+        try:
+            os.kill(pid, worker_signal)
+        except ProcessLookupError:
+            pass
+
+    deadline = time.time() + lifecycle.drain_delay + lifecycle.drain_timeout + 2
+    while children and time.time() < deadline:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid:
+            children.discard(pid)
+        else:
+            time.sleep(0.05)
+    for pid in children:
+        logger.warning(f"워커 {pid}가 제때 종료되지 않아 강제 종료합니다.")
+        os.kill(pid, signal.SIGKILL)
+
+    logger.info(f"prefork 마스터 종료 ({action})")
+    _exit(action, sock, lifecycle, is_worker=False)
+
+
+def serve(handler_class, lifecycle, host='0.0.0.0', port=8080, mode='threaded', threads=8, workers=2):
+    """선택한 모드로 서버 실행 (종료될 때까지 반환하지 않음)"""
+    if mode not in SERVER_MODES:
+        raise ValueError(f"알 수 없는 SERVER_MODE: {mode} (가능한 값: {', '.join(SERVER_MODES)})")
+
+    sock = _listen_socket(host, port)
+
+    if mode == 'single':
+        server = _attach_socket(HTTPServer((host, port), handler_class, bind_and_activate=False), sock)
+        _serve_sync(server, sock, lifecycle)
+
+    elif mode == 'threaded':
+        server = _attach_socket(
+            PooledHTTPServer((host, port), handler_class, max_workers=threads, bind_and_activate=False), sock
+        )
+        _serve_sync(server, sock, lifecycle)
+
+    elif mode == 'asyncio':
+        action = asyncio.run(_serve_async(sock, handler_class, lifecycle))
+        _exit(action, sock, lifecycle, is_worker=False)
+
+    elif mode == 'prefork':
+        def make_server(bind_and_activate):
+            return PooledHTTPServer(
+                (host, port), handler_class,
+                max_workers=threads, bind_and_activate=bind_and_activate
+            )
+
+        _prefork(sock, workers, make_server, lifecycle)
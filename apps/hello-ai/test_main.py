@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Hello-ai 테스트
+"""
+
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import main
+from lifecycle import Lifecycle
+from logpipe import AccessLogPipeline
+from metrics import LatencyHistogram, Metrics, bucket_bounds, bucket_index, MAX_LATENCY_US
+from responses import ResponseTemplate
+from router import Router
+from servers import PooledHTTPServer
+
+
+def start_server(handler_class=main.HelloHandler):
+    server = PooledHTTPServer(('127.0.0.1', 0), handler_class, max_workers=2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def get(port, path, headers=None):
+    """새 연결로 GET 요청 1건 (응답, 본문) 반환"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    try:
+        conn.request('GET', path, headers=headers or {})
+        response = conn.getresponse()
+        return response, response.read()
+    finally:
+        conn.close()
+
+
+def spawn_server(mode, **env):
+    """main.py를 별도 프로세스로 실행하고 응답할 때까지 대기"""
+    port = free_port()
+    env = dict(os.environ, **{'ACCESS_LOG': '0', 'DRAIN_DELAY': '0', **env}, SERVER_MODE=mode, PORT=str(port))
+    process = subprocess.Popen([sys.executable, os.path.join(HERE, 'main.py')], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    deadline = time.time() + 10
+    while True:
+        try:
+            get(port, '/health')
+            return process, port
+        except OSError:
+            if process.poll() is not None or time.time() > deadline:
+                process.kill()
+                raise AssertionError(f"{mode} 서버가 시작되지 않음: {process.communicate()[1]}")
+            time.sleep(0.05)
+
+
+def run_in_child(func):
+    """fork한 자식 프로세스에서 func을 실행하고 JSON 반환값을 받음"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            os.close(read_fd)
+            os.write(write_fd, json.dumps(func()).encode('utf-8'))
+            code = 0
+        finally:
+            os._exit(code)
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as f:
+        data = f.read()
+    _, status = os.waitpid(pid, 0)
+    assert status == 0
+    return json.loads(data)
+
+
+def stop_server(process, signum=signal.SIGINT):
+    """시그널을 보내고 종료 코드와 stderr 로그 반환"""
+    process.send_signal(signum)
+    try:
+        _, log = process.communicate(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        raise
+    return process.returncode, log
+
+
+def test_bucket_bounds_contain_value():
+    for value in [0, 15, 16, 31, 32, 1000, 123456, MAX_LATENCY_US]:
+        low, high = bucket_bounds(bucket_index(value))
+        assert low <= value <= high
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 10)
+    assert abs(histogram.percentile(50) - 50) < 50 * 0.07
+    assert abs(histogram.percentile(99) - 99) < 99 * 0.07
+    assert histogram.count == 1000
+
+
+def test_sharded_counters_merge_across_threads():
+    metrics = Metrics()
+
+    def worker(status):
+        for _ in range(500):
+            metrics.record('/health', status, 2.0)
+
+    threads = [threading.Thread(target=worker, args=(status,)) for status in (200, 200, 200, 503)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    totals, latency = metrics.snapshot()
+    assert totals == {'total': 2000, 'success': 1500, 'error': 500}
+    assert latency.count == 2000 and abs(latency.mean() - 2.0) < 0.01
+    series = metrics.series()
+    assert series[('/health', 200)].count == 1500 and series[('/health', 503)].count == 500
+
+    restored = LatencyHistogram.from_dict(json.loads(json.dumps(latency.to_dict())))
+    assert restored.counts == latency.counts and restored.sum_us == latency.sum_us
+
+def test_prometheus_exposition():
+    metrics = Metrics()
+    for latency_ms in (0.5, 3, 40, 40, 2000):
+        metrics.record('/health', 200, latency_ms)
+    metrics.record('/a"b', 404, 1)
+
+    lines = metrics.prometheus().splitlines()
+    assert '# TYPE hello_ai_requests_total counter' in lines
+    assert 'hello_ai_requests_total{path="/health",code="200"} 5' in lines
+    assert 'hello_ai_requests_total{path="/a\\"b",code="404"} 1' in lines
+
+    buckets = [line for line in lines
+               if line.startswith('hello_ai_request_duration_seconds_bucket{path="/health"')]
+    counts = [int(line.rsplit(' ', 1)[1]) for line in buckets]
+    assert counts == sorted(counts) and counts[-1] == 5
+    assert buckets[-1].endswith('le="+Inf"} 5')
+    assert 'hello_ai_request_duration_seconds_count{path="/health",code="200"} 5' in lines
+    total = next(line for line in lines if line.startswith('hello_ai_request_duration_seconds_sum{path="/health"'))
+    assert abs(float(total.rsplit(' ', 1)[1]) - 2.0835) < 0.01
+
+
+def test_metrics_aggregate_across_processes(tmp_path):
+    directory = str(tmp_path)
+
+    def worker(path, count):
+        def record():
+            metrics = Metrics()
+            metrics.enable_multiprocess(directory, publish_interval=60, clear=False)
+            for _ in range(count):
+                metrics.record(path, 200, 1.0)
+            metrics.publish()
+            return count
+        return record
+
+    def read():
+        metrics = Metrics()
+        metrics.enable_multiprocess(directory, publish_interval=60, clear=False)
+        totals, _ = metrics.snapshot()
+        return {'totals': totals, 'prometheus': metrics.prometheus()}
+
+    # 프로세스마다 자기 mmap 파일에 게시 (종료한 프로세스의 값도 남음)
+    for path, count in (('/health', 3), ('/health', 2), ('/info', 4)):
+        assert run_in_child(worker(path, count)) == count
+    assert len(os.listdir(directory)) == 3
+
+    result = run_in_child(read)
+    assert result['totals'] == {'total': 9, 'success': 9, 'error': 0}
+    assert 'hello_ai_requests_total{path="/health",code="200"} 5' in result['prometheus']
+    assert 'hello_ai_requests_total{path="/info",code="200"} 4' in result['prometheus']
+
+def test_router_exact_param_and_query():
+    router = Router()
+    router.add('/health', lambda request: None)
+    router.add('/items/{id:int}', lambda request: None)
+
+    route, params, query = router.match('/health?x=1')
+    assert route.path == '/health' and query == 'x=1'
+
+    route, params, _ = router.match('/items/42')
+    assert route.path == '/items/{id:int}' and params == {'id': 42}
+
+    assert router.match('/items/abc')[0] is None
+
+
+def test_router_middleware_order():
+    calls = []
+
+    def outer(request, call_next):
+        calls.append('outer')
+        call_next()
+
+    def inner(request, call_next):
+        calls.append('inner')
+        call_next()
+
+    router = Router(middleware=[outer])
+    route = router.add('/', lambda request: calls.append('handler'), middleware=[inner])
+    route(None)
+    assert calls == ['outer', 'inner', 'handler']
+
+
+def test_response_template_splices_dynamic_fields():
+    template = ResponseTemplate(
+        {"a": 1, "ts": None, "b": [1, 2]},
+        dynamic_fields=("ts",),
+        context=lambda: {"ts": "now"}
+    )
+    assert template.render() == b'{"a":1,"ts":"now","b":[1,2]}'
+    assert template.etag.startswith('W/')
+    assert template.not_modified(template.etag)
+    assert not template.not_modified('"other"')
+
+
+def test_static_response_etag_matching():
+    template = ResponseTemplate({"service": "hello-ai", "items": ["한글", 1]})
+    assert template.render() == '{"service":"hello-ai","items":["한글",1]}'.encode('utf-8')
+    assert template.render() is template.render()
+    assert template.etag.startswith('"') and ('ETag', template.etag) in template.headers
+
+    assert template.not_modified(template.etag)
+    assert template.not_modified(f'"other", W/{template.etag}')
+    assert template.not_modified('*')
+    assert not template.not_modified(None) and not template.not_modified('"other"')
+    # 내용이 바뀌면 ETag도 바뀜
+    assert ResponseTemplate({"service": "hello-ai", "items": []}).etag != template.etag
+
+class BlockingStream:
+    """release될 때까지 첫 write에서 멈추는 출력 스트림"""
+
+    def __init__(self):
+        self.lines = []
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.writing.set()
+        self.release.wait(5)
+        self.lines += [json.loads(line) for line in text.splitlines()]
+
+    def flush(self):
+        pass
+
+
+def test_access_log_sampling():
+    stream = BlockingStream()
+    stream.release.set()
+    pipeline = AccessLogPipeline(stream=stream, flush_interval=0.01, sample_rate=0.0)
+    pipeline.log('a', 'GET', '/health', 200, 1.0, sampled=True)
+    pipeline.log('b', 'GET', '/health', 503, 1.0, sampled=True)
+    pipeline.log('c', 'GET', '/info', 200, 1.5)
+    pipeline.close()
+    # 샘플링 대상이라도 에러 응답은 항상 기록
+    assert [line['request_id'] for line in stream.lines] == ['b', 'c']
+    assert stream.lines[1]['path'] == '/info' and stream.lines[1]['latency_ms'] == 1.5
+
+
+def test_access_log_drops_when_queue_full():
+    stream = BlockingStream()
+    pipeline = AccessLogPipeline(stream=stream, max_queue=2, flush_interval=0.01)
+    pipeline.log('first', 'GET', '/', 200, 1.0)
+    assert stream.writing.wait(5)          # 출력이 막힌 동안 큐가 가득 참
+    for i in range(5):
+        pipeline.log(f'r{i}', 'GET', '/', 200, 1.0)
+    assert pipeline.dropped == 3
+
+    stream.release.set()
+    pipeline.close()
+    events = [line for line in stream.lines if line.get('event') == 'access_log_dropped']
+    assert events == [{'event': 'access_log_dropped', 'count': 3}]
+    assert [line['request_id'] for line in stream.lines if 'request_id' in line] == ['first', 'r0', 'r1']
+
+def test_keep_alive_and_etag():
+    server = start_server()
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+        conn.request('GET', '/info')
+        response = conn.getresponse()
+        body = response.read()
+        etag = response.getheader('ETag')
+        assert response.status == 200
+        assert int(response.getheader('Content-Length')) == len(body)
+
+        conn.request('GET', '/info', headers={'If-None-Match': etag})
+        response = conn.getresponse()
+        assert response.status == 304 and response.read() == b''
+
+        conn.request('HEAD', '/health?probe=1')
+        response = conn.getresponse()
+        assert response.status == 200 and response.read() == b''
+
+        conn.request('GET', '/missing')
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 404
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_method_not_allowed():
+    server = start_server()
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+        conn.request('DELETE', '/info')
+        response = conn.getresponse()
+        body = json.loads(response.read())
+        assert response.status == 405
+        assert response.getheader('Allow') == 'GET, HEAD'
+        assert body['allowed_methods'] == ['GET', 'HEAD']
+        assert response.getheader('Connection') != 'close'
+
+        # 읽지 않은 본문이 있으면 연결을 닫음
+        conn.request('POST', '/health', body=b'{}')
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 405 and response.getheader('Connection') == 'close'
+        conn.close()
+
+        response, _ = get(server.server_address[1], '/missing')
+        assert response.status == 404
+        assert main.metrics.series()[('/info', 405)].count >= 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_idle_keep_alive_connections_do_not_block_pool():
+    class ShortIdleHandler(main.HelloHandler):
+        timeout = 1.0
+
+    server = start_server(ShortIdleHandler)
+    port = server.server_address[1]
+    idle = []
+    try:
+        # 워커(2)보다 많은 유휴 연결: 요청 후 대기 중인 연결과 연결만 맺은 소켓
+        for _ in range(4):
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/health')
+            conn.getresponse().read()
+            idle.append(conn)
+        silent = [socket.create_connection(('127.0.0.1', port)) for _ in range(4)]
+
+        started = time.perf_counter()
+        response, _ = get(port, '/health')
+        assert response.status == 200
+        assert time.perf_counter() - started < 0.5
+
+        # 파이프라이닝된 두 요청도 모두 응답
+        raw = socket.create_connection(('127.0.0.1', port), timeout=5)
+        raw.sendall(b'GET /info HTTP/1.1\r\nHost: x\r\n\r\n' * 2)
+        received = b''
+        while received.count(b'HTTP/1.1 200') < 2:
+            received += raw.recv(65536)
+        raw.close()
+
+        # 유휴 연결은 재사용할 수 있고, 유휴 시간이 지나면 서버가 닫음
+        idle[0].request('GET', '/info')
+        assert idle[0].getresponse().read()
+        time.sleep(1.5)
+        for sock in silent:
+            sock.settimeout(5)
+            assert sock.recv(1) == b''
+            sock.close()
+    finally:
+        for conn in idle:
+            conn.close()
+        server.shutdown()
+        server.server_close()
+
+def test_asyncio_mode_keeps_connection_alive():
+    process, port = spawn_server('asyncio')
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        for _ in range(3):
+            conn.request('GET', '/health')
+            response = conn.getresponse()
+            assert response.status == 200
+            assert json.loads(response.read())['status'] == 'ok'
+        conn.request('GET', '/missing')
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 404
+        conn.close()
+    finally:
+        code, log = stop_server(process)
+    assert code == 0, log
+
+
+def test_prefork_mode_serves_from_workers(tmp_path):
+    process, port = spawn_server('prefork', WORKERS='2', WORKER_THREADS='2', METRICS_DIR=str(tmp_path))
+    try:
+        for _ in range(10):
+            response, _ = get(port, '/info')
+            assert response.status == 200
+    finally:
+        code, log = stop_server(process)
+    assert code == 0, log
+    assert 'prefork 워커 2개 시작' in log and 'prefork 마스터 종료 (stop)' in log
+
+
+def test_lifecycle_waits_for_inflight_requests():
+    lifecycle = Lifecycle()
+    lifecycle.request_started()
+    assert not lifecycle.wait_idle(0.05)
+    threading.Timer(0.1, lifecycle.request_finished).start()
+    assert lifecycle.wait_idle(5) and lifecycle.inflight == 0
+    assert not lifecycle.closing_connections()
+    lifecycle.start_draining()
+    assert lifecycle.closing_connections()
+
+
+def test_sigterm_fails_readiness_then_drains():
+    process, port = spawn_server('threaded', DRAIN_DELAY='1.5')
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        conn.request('GET', '/ready')
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 200 and response.getheader('Connection') != 'close'
+
+        process.send_signal(signal.SIGTERM)
+        deadline = time.time() + 1
+        while get(port, '/ready')[0].status != 503:
+            assert time.time() < deadline
+            time.sleep(0.05)
+        # 드레인 지연 동안에도 요청은 처리하지만 keep-alive 연결은 닫음
+        conn.request('GET', '/health')
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 200 and response.getheader('Connection') == 'close'
+        conn.close()
+
+        process.wait(10)
+    finally:
+        code, log = stop_server(process)
+    assert code == 0, log
+    assert '드레인 시작' in log and '처리 중인 요청 완료 (drain)' in log
+    try:
+        get(port, '/health')
+        raise AssertionError('종료 후에도 응답함')
+    except ConnectionRefusedError:
+        pass
+
+
+def test_sighup_reexecs_on_inherited_socket():
+    process, port = spawn_server('threaded')
+    try:
+        time.sleep(1)
+        process.send_signal(signal.SIGHUP)
+        reloaded = time.monotonic()
+        deadline = time.time() + 10
+        while True:
+            # 재실행 중 연결은 커널 backlog에서 기다리므로 거부되지 않음
+            try:
+                response, body = get(port, '/health')
+            except (http.client.RemoteDisconnected, ConnectionResetError):
+                continue
+            assert response.status == 200
+            # 새 프로세스의 uptime은 SIGHUP 이후 경과 시간보다 짧음
+            if json.loads(body)['uptime_seconds'] <= time.monotonic() - reloaded + 0.5:
+                break
+            assert time.time() < deadline
+            time.sleep(0.05)
+        # 같은 PID에서 exec로 교체
+        assert process.poll() is None
+    finally:
+        code, log = stop_server(process)
+    assert code == 0, log
+    assert '물려받은 리스닝 소켓 사용' in log
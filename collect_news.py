@@ -1,11 +1,24 @@
 #!/usr/bin/env python3
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import argparse
 import json
+import threading
 
-headers = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-}
+from collector.archive import DEFAULT_PATH as ARCHIVE_PATH, Archive
+from collector.cache import DEFAULT_PATH as CACHE_PATH, DEFAULT_TTL as CACHE_TTL, HTTPCache, article_key
+from collector.daemon import DEFAULT_SCHEDULE, CronSchedule, Scheduler, run_daemon
+from collector.dedup import DEFAULT_PATH as DEDUP_PATH, DEFAULT_THRESHOLD as DEDUP_THRESHOLD, DuplicateIndex
+from collector.discover import (DEFAULT_PATH as SEEN_PATH, DEFAULT_SECTIONS, SeenIndex,
+                                article_url, discover, section_urls)
+from collector.fetch import ConcurrentFetcher, DEFAULT_HEADERS
+from collector.output import JSONLWriter, is_jsonl, scan_output
+from collector.parse import BACKENDS as PARSERS, DEFAULT_BACKEND as DEFAULT_PARSER, parse_article
+from collector.pipeline import DEFAULT_PROCESSES, ParseStage
+from collector.summarize import iter_summarized
+from collector.throttle import AdaptiveRateLimiter, CircuitBreaker, Deadline
+
+headers = DEFAULT_HEADERS
 
 article_ids = [
     '005/0001830273',
@@ -19,50 +32,273 @@ article_ids = [
     '449/0000334444'
 ]
 
-articles = []
+OUTPUT_PATH = '/home/jj/.openclaw/workspace/news_summary.json'
+
+SUMMARY_LENGTH = 300
+SUMMARY_BATCH = 16
+
 
-for aid in article_ids:
-    url = f'https://n.news.naver.com/article/{aid}'
+def parse_job(job):
+    """파싱 프로세스에서 실행: (HTML, 백엔드) -> ((제목, 본문), 오류)"""
+    text, backend = job
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(resp.text, 'html.parser')
-
-        # 제목 추출
-        title_elem = soup.find('h2', class_='media_end_head_headline') or soup.find('h3')
-        title = title_elem.get_text(strip=True) if title_elem else "제목 없음"
-
-        # 본문 추출
-        article_body = soup.find('article', {'id': 'dic_area'})
-        if article_body:
-            # 불필요한 요소 제거
-            for elem in article_body.find_all(['script', 'style', 'iframe', 'img']):
-                elem.decompose()
-            paragraphs = [p.get_text(strip=True) for p in article_body.find_all(['p', 'div']) if p.get_text(strip=True)]
-            content = ' '.join(paragraphs)
-        else:
-            content = "내용 없음"
+        return parse_article(text, backend), None
+    except Exception as e:
+        return None, str(e)
 
-        # 요약 (처음 200자)
-        summary = content[:300] + '...' if len(content) > 300 else content
 
-        articles.append({
-            'url': url,
-            'title': title,
-            'summary': summary
-        })
+class Collector:
+    """실행 사이에 유지하는 자원 (HTTP 세션, 캐시/색인 연결, 속도 제한 상태, 파싱 프로세스 풀)
 
-        print(f"수집 완료: {title[:50]}...")
+    run() 한 번이 기존 한 번의 실행, 데몬 모드에서는 같은 객체로 run() 을 반복 호출.
+    """
 
-    except Exception as e:
-        print(f"Error fetching {aid}: {e}")
-        articles.append({
-            'url': url,
-            'title': '수집 실패',
-            'summary': str(e)
-        })
-
-# 결과 저장
-with open('/home/jj/.openclaw/workspace/news_summary.json', 'w', encoding='utf-8') as f:
-    json.dump(articles, f, ensure_ascii=False, indent=2)
-
-print(f"\n총 {len(articles)}개 기사 수집 완료")
+    def __init__(self, args):
+        self.args = args
+        # 목록 페이지와 기사 수집이 같은 속도 제한/회로 차단기/시간 예산을 씀 (예산은 실행마다 새로)
+        traffic = {
+            'limiter': AdaptiveRateLimiter(args.rate, target_latency=args.target_latency),
+            'breaker': CircuitBreaker(),
+        }
+        self.cache = None if args.no_cache else HTTPCache(args.cache, ttl=args.cache_ttl,
+                                                                 extractor=f'collect_news/{args.parser}')
+        self.fetcher = ConcurrentFetcher(headers=headers, max_workers=args.workers, retries=args.retries,
+                                         timeout=args.timeout, cache=self.cache, **traffic)
+        self.seen = None
+        self.lister = None
+        if args.discover:
+            # 목록 페이지는 매번 바뀌므로 캐시 없이 받음
+            self.seen = SeenIndex(args.seen_db)
+            self.lister = ConcurrentFetcher(headers=headers, max_workers=args.workers, retries=args.retries,
+                                            timeout=args.timeout, **traffic)
+        self.dedup = None if args.no_dedup else DuplicateIndex(args.dedup_db, threshold=args.dedup_threshold)
+        self.archive = None if args.no_archive else Archive(args.archive)
+        self.processes = DEFAULT_PROCESSES if args.processes is None else args.processes
+        self.pool = self._new_pool()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.processes) if self.processes else None
+
+    def close(self):
+        self.fetcher.close()
+        if self.lister is not None:
+            self.lister.close()
+        if self.pool is not None:
+            self.pool.shutdown()
+        if self.seen is not None:
+            self.seen.close()
+        if self.dedup is not None:
+            self.dedup.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def run(self):
+        """한 번 수집하고 저장한 기사 수 반환"""
+        args = self.args
+        streaming = is_jsonl(args.output)
+        cache, seen, dedup, fetcher = self.cache, self.seen, self.dedup, self.fetcher
+        fetcher.deadline = Deadline(args.budget)
+
+        source_ids = article_ids
+        if seen is not None:
+            self.lister.deadline = fetcher.deadline
+            added = discover(self.lister, seen, section_urls(args.sections.split(',')))
+            source_ids = seen.pending(args.limit)
+            print(f"새로 발견: {len(added)}개, 이번 수집 대상: {len(source_ids)}개")
+
+        pending_ids = source_ids
+        if args.resume:
+            # '수집 실패' 행은 이전 버전 출력 호환용 (지금은 실패를 기록하지 않음)
+            done_ids, _ = scan_output(args.output, key=lambda row: article_key(row['url']),
+                                      done=lambda row: row['title'] != '수집 실패')
+            pending_ids = [aid for aid in source_ids if aid not in done_ids]
+            if seen is not None:
+                seen.mark_collected([aid for aid in source_ids if aid in done_ids])
+            print(f"이어서 수집: {len(source_ids) - len(pending_ids)}개 건너뜀, {len(pending_ids)}개 남음")
+
+        # JSONL이면 기사마다 바로 기록, 아니면 모아서 마지막에 JSON 배열로 저장
+        articles = []
+        writer = JSONLWriter(args.output, append=args.resume) if streaming else None
+        save = writer.write if writer is not None else articles.append
+        saved = 0
+        # 보관소에는 요약과 함께 본문 전체도 남김
+        bodies, archived = {}, []
+
+        urls = [article_url(aid) for aid in pending_ids]
+        collected, failed, deferred, duplicates = [], [], [], []
+        stage = ParseStage(parse_job, processes=self.processes, executor=self.pool)
+        results = [None] * len(urls)
+
+        def hand_off(index, result):
+            # 수집 스레드에서 호출: 파싱 큐가 차 있으면 여기서 대기
+            results[index] = result
+            if result.text is None or result.error:
+                stage.put_result(index, (None, result.error))
+            elif result.parsed:
+                # 본문이 바뀌지 않았으면 이전 파싱 결과 재사용
+                stage.put_result(index, ((result.parsed['title'], result.parsed['content']), None))
+            else:
+                stage.put(index, (result.text, args.parser))
+
+        def produce():
+            try:
+                fetcher.fetch_all(urls, hand_off)
+            finally:
+                stage.close()
+
+        producer = threading.Thread(target=produce, name='fetch-stage')
+        producer.start()
+
+        def rows():
+            # 파싱 결과를 순서대로 행으로 만듦 (summary 에는 아직 본문 전체), 실패는 기록하지 않음
+            for index, (parsed, error) in stage.ordered():
+                aid, result = pending_ids[index], results[index]
+                url = result.url
+                if result.deferred:
+                    deferred.append(aid)
+                    continue
+                try:
+                    if parsed is None:
+                        raise RuntimeError(error)
+
+                    title, content = parsed
+                    if cache is not None and not result.parsed:
+                        cache.set_parsed(result.cache_key, {'title': title, 'content': content})
+
+                    # 같은 기사가 다른 언론사 ID로 이미 수집됐으면 요약/저장 생략
+                    canonical = dedup.check(aid, content) if dedup is not None else None
+                    if canonical is not None and canonical != aid:
+                        print(f"중복 기사: {aid} -> {canonical}")
+                        duplicates.append(aid)
+                        collected.append(aid)
+                        continue
+
+                    print(f"수집 완료: {title[:50]}...")
+                    collected.append(aid)
+                    bodies[url] = content
+                    yield {
+                        'url': url,
+                        'title': title,
+                        'summary': content
+                    }
+
+                except Exception as e:
+                    print(f"Error fetching {aid}: {e}")
+                    failed.append(aid)
+
+        try:
+            with stage:
+                # 요약은 summary_batch 개씩 모아 한 번에 계산한 뒤 순서대로 저장
+                # (JSONL이면 다음 기사를 기다려야 할 때 모인 만큼 먼저 저장)
+                for row in iter_summarized(rows(), 'summary', args.summary_length, args.summary_batch,
+                                           ready=stage.ready if streaming else None):
+                    save(row)
+                    saved += 1
+                    archived.append({**row, 'content': bodies.get(row['url'])})
+
+            # 결과 저장
+            if writer is None:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(articles, f, ensure_ascii=False, indent=2)
+            print(f"\n총 {saved}개 기사 수집 완료")
+        except BrokenProcessPool:
+            # 파싱 프로세스가 죽어 풀이 깨졌으면 다음 실행은 새 풀로
+            self.pool.shutdown(wait=False)
+            self.pool = self._new_pool()
+            raise
+        finally:
+            # 파싱 단계가 먼저 끝났으면 수집 스레드가 넘기는 페이지는 버려지므로 join 이 막히지 않음
+            producer.join()
+            if writer is not None:
+                writer.close()
+            # 실행이 중간에 실패해도 그때까지 수집한 기사는 보관
+            if self.archive is not None:
+                print(f"보관소에 추가: {self.archive.append(archived)}개")
+        if duplicates:
+            print(f"유사 중복으로 생략: {len(duplicates)}개")
+        if failed:
+            print(f"수집 실패: {len(failed)}개")
+        if deferred:
+            print(f"시간 예산/회로 차단으로 미룸: {len(deferred)}개")
+
+        if seen is not None:
+            seen.mark_collected(collected)
+            seen.mark_failed(failed)
+            seen.prune()
+
+        if dedup is not None:
+            dedup.prune()
+
+        if cache is not None:
+            revalidated = sum(1 for result in results if result is not None and result.cached)
+            cache.evict()
+            print(f"캐시 재검증(304): {revalidated}/{len(results)}")
+
+        return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 기사 수집 및 요약")
+    parser.add_argument('--workers', type=int, default=8, help="동시 요청 수")
+    parser.add_argument('--rate', type=float, default=5.0, help="호스트별 초당 요청 수")
+    parser.add_argument('--retries', type=int, default=3, help="요청당 재시도 횟수")
+    parser.add_argument('--timeout', type=float, default=10.0, help="요청별 타임아웃(초)")
+    parser.add_argument('--target-latency', type=float, default=2.0,
+                        help="이보다 느린 응답이 오면 호스트별 요청 속도를 줄임(초)")
+    parser.add_argument('--budget', type=float, default=None,
+                        help="실행 시간 예산(초), 다 쓰면 남은 기사는 보내지 않고 다음 실행으로 미룸")
+    parser.add_argument('--output', default=OUTPUT_PATH,
+                        help="결과 경로 (.json: 끝에 한 번에 저장, .jsonl[.gz|.zst]: 기사마다 한 줄씩 저장)")
+    parser.add_argument('--resume', action='store_true',
+                        help="JSONL 출력에 이미 있는 기사는 건너뛰고 이어서 저장 (실패 항목은 다시 수집)")
+    parser.add_argument('--cache', default=CACHE_PATH, help="HTTP 캐시 SQLite 경로")
+    parser.add_argument('--cache-ttl', type=float, default=CACHE_TTL, help="캐시 보관 기간(초)")
+    parser.add_argument('--no-cache', action='store_true', help="캐시 없이 모두 새로 받기")
+    parser.add_argument('--parser', choices=sorted(PARSERS), default=DEFAULT_PARSER,
+                        help="HTML 파서 (stream: 이벤트 기반, bs4: BeautifulSoup 트리)")
+    parser.add_argument('--processes', type=int, default=None,
+                        help=f"파싱 프로세스 수 (기본: CPU 수, 최대 {DEFAULT_PROCESSES}개, 0이면 프로세스 없이 파싱)")
+    parser.add_argument('--summary-length', type=int, default=SUMMARY_LENGTH, help="요약 최대 글자 수")
+    parser.add_argument('--summary-batch', type=int, default=SUMMARY_BATCH,
+                        help="한 번에 요약할 기사 수 (JSONL 출력은 이만큼씩 모아서 기록)")
+    parser.add_argument('--discover', action='store_true',
+                        help="고정 ID 목록 대신 섹션 페이지에서 새 기사를 찾아 수집")
+    parser.add_argument('--sections', default=','.join(DEFAULT_SECTIONS), help="발견할 섹션 번호 (쉼표 구분)")
+    parser.add_argument('--limit', type=int, default=50, help="한 번에 수집할 최대 새 기사 수 (--discover)")
+    parser.add_argument('--seen-db', default=SEEN_PATH, help="발견 색인 SQLite 경로")
+    parser.add_argument('--dedup-db', default=DEDUP_PATH, help="유사 중복 색인 SQLite 경로")
+    parser.add_argument('--dedup-threshold', type=float, default=DEDUP_THRESHOLD,
+                        help="중복으로 볼 본문 유사도 (0~1)")
+    parser.add_argument('--no-dedup', action='store_true', help="유사 중복 기사도 모두 저장")
+    parser.add_argument('--archive', default=ARCHIVE_PATH, help="날짜별 기사 보관소 디렉터리")
+    parser.add_argument('--no-archive', action='store_true', help="보관소에 남기지 않음")
+    parser.add_argument('--daemon', action='store_true',
+                        help="한 번 실행하고 끝내지 않고 --schedule 일정마다 반복 수집 (연결/캐시/프로세스 풀 유지)")
+    parser.add_argument('--schedule', default=DEFAULT_SCHEDULE, help="데몬 실행 일정 (cron 식, 기본: 매 시간 정각)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="실행 시각마다 0~이 값(초) 사이 무작위로 늦춤")
+    parser.add_argument('--run-now', action='store_true', help="데몬 시작 직후 한 번 바로 실행")
+    parser.add_argument('--status-port', type=int, default=None,
+                        help="상태 엔드포인트 포트 (GET /status: 마지막 실행 시간/처리량)")
+    args = parser.parse_args()
+
+    if args.resume and not is_jsonl(args.output):
+        parser.error("--resume 은 .jsonl 출력에서만 쓸 수 있습니다")
+    try:
+        schedule = CronSchedule(args.schedule)
+    except ValueError as e:
+        parser.error(str(e))
+
+    collector = Collector(args)
+    try:
+        if args.daemon:
+            scheduler = Scheduler(jitter=args.jitter)
+            scheduler.add('collect_news', schedule, collector.run, run_now=args.run_now)
+            run_daemon(scheduler, args.status_port)
+        else:
+            collector.run()
+    finally:
+        collector.close()
+
+
+if __name__ == '__main__':
+    main()
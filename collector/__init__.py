@@ -0,0 +1,9 @@
+"""
+뉴스 수집기 공통 모듈
+
+collect_news.py, naver_news_collector.py가 함께 사용하는 수집/파싱/저장 구성 요소
+
+선택 의존성:
+- zstandard (pip install zstandard): .jsonl.zst 출력과 zstd 보관소 압축에만 필요.
+  설치되어 있지 않으면 그 기능을 쓸 때만 설치 안내 오류가 남
+"""
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+asyncio 기반 HTTP/1.1 수집 클라이언트 (표준 라이브러리만 사용)
+
+- 호스트별 keep-alive 연결 풀 (TLS 핸드셰이크 재사용)
+- 전체 동시 요청 수 / 호스트별 연결 수 제한
+- 요청별 타임아웃
+- 본문 스트리밍 디코딩 (chunked, gzip/deflate, 문자셋 증분 디코딩)
+- 리다이렉트 추적
+- 디스크 캐시가 있으면 조건부 GET (304면 캐시 본문과 파싱 결과 재사용)
+- 적응형 속도 제한 / 호스트별 회로 차단 / 실행 시간 예산 (collector.throttle)
+  보내지 않은 요청은 Deferred 예외
+"""
+
+from urllib.parse import urljoin, urlsplit
+import asyncio
+import codecs
+import ssl
+import time
+import zlib
+
+from collector.cache import article_key
+from collector.throttle import CircuitBreaker, Deadline
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# 한 번에 읽는 본문 크기
+READ_CHUNK = 64 * 1024
+
+
+class HTTPError(Exception):
+    """응답 형식 오류 등 HTTP 수준 실패"""
+
+
+class Response:
+    """디코딩된 응답"""
+
+    __slots__ = ('url', 'status', 'headers', 'text', 'cache_key', 'cached', 'parsed')
+
+    def __init__(self, url, status, headers, text):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.text = text
+        # 캐시 사용 시: 기사 ID, 304 재검증 여부, 본문이 바뀌지 않았을 때의 이전 파싱 결과
+        self.cache_key = None
+        self.cached = False
+        self.parsed = None
+
+
+class _Connection:
+    __slots__ = ('reader', 'writer')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncHTTPClient:
+    """호스트별 연결 풀을 가진 asyncio HTTP/1.1 클라이언트"""
+
+    def __init__(self, concurrency=16, per_host=6, timeout=10.0, user_agent=DEFAULT_USER_AGENT,
+                 max_redirects=5, extra_headers=None, cache=None, limiter=None, breaker=None, deadline=None):
+        self.timeout = timeout
+        self.per_host = per_host
+        self.user_agent = user_agent
+        self.max_redirects = max_redirects
+        self.extra_headers = dict(extra_headers or {})
+        self.cache = cache
+        # limiter 가 없으면 속도 제한 없음
+        self.limiter = limiter
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.deadline = deadline if deadline is not None else Deadline()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._idle = {}
+        self._host_slots = {}
+        self._ssl = ssl.create_default_context()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for connections in self._idle.values():
+            for conn in connections:
+                conn.close()
+        self._idle.clear()
+
+    async def get(self, url, headers=None):
+        """GET 요청 (리다이렉트 추적, 전체에 self.timeout 적용)"""
+        host = urlsplit(url).netloc
+        self.deadline.check()
+        probe = self.breaker.check(host)
+        recorded = False
+        try:
+            if self.limiter is not None:
+                await self.limiter.acquire_async(host, self.deadline)
+
+            headers = dict(headers or {})
+            entry = None
+            if self.cache is not None:
+                key = article_key(url)
+                entry = self.cache.get(key)
+                if entry is not None:
+                    headers.update(entry.conditional_headers())
+
+            async with self._semaphore:
+                # 동시 요청 자리를 기다리는 동안 예산이 끝났을 수 있음
+                self.deadline.check()
+                sent = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(self._get(url, headers), self.deadline.timeout(self.timeout))
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HTTPError):
+                    # 예산에 맞춰 줄인 타임아웃으로 끊긴 요청은 실패가 아니라 미룸
+                    self.deadline.check()
+                    recorded = True
+                    self._record(host, time.perf_counter() - sent, None)
+                    raise
+            recorded = True
+            self._record(host, time.perf_counter() - sent, response.status)
+        finally:
+            # 시험 요청을 보내지 못하고 미루거나 취소됐으면 자리를 돌려줌 (아니면 계속 half-open)
+            if probe and not recorded:
+                self.breaker.release(host)
+
+        if self.cache is not None:
+            response.cache_key = key
+            if response.status == 304 and entry is not None:
+                self.cache.revalidated(key, response.headers)
+                response.text = entry.text
+                response.cached = True
+                response.parsed = entry.parsed
+            elif response.status == 200:
+                response.parsed = self.cache.store(key, url, response.text, response.headers).parsed
+        return response
+
+    def _record(self, host, latency, status):
+        if self.limiter is not None:
+            self.limiter.record(host, latency, status)
+        self.breaker.record(host, status is not None and status < 500 and status != 429)
+
+    async def _get(self, url, headers):
+        for _ in range(self.max_redirects + 1):
+            response = await self._request(url, headers)
+            location = response.headers.get('location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            return response
+        raise HTTPError(f"리다이렉트 횟수 초과: {url}")
+
+    async def _request(self, url, headers):
+        parts = urlsplit(url)
+        secure = parts.scheme == 'https'
+        port = parts.port or (443 if secure else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+        slots = self._host_slots.get(key)
+        if slots is None:
+            slots = self._host_slots[key] = asyncio.Semaphore(self.per_host)
+
+        async with slots:
+            # 재사용한 연결이 서버 쪽에서 이미 닫혔으면 새 연결로 한 번 더 시도
+            for attempt in range(2):
+                conn, reused = await self._acquire(key, parts.hostname, port, secure)
+                try:
+                    status, response_headers, text, keep_alive = await self._exchange(
+                        conn, parts, target, headers
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError, HTTPError):
+                    conn.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                if keep_alive:
+                    self._idle.setdefault(key, []).append(conn)
+                else:
+                    conn.close()
+                return Response(url, status, response_headers, text)
+
+    async def _acquire(self, key, host, port, secure):
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof():
+                return conn, True
+            conn.close()
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self._ssl if secure else None, limit=READ_CHUNK
+        )
+        return _Connection(reader, writer), False
+
+    async def _exchange(self, conn, parts, target, headers):
+        host_header = parts.netloc.rsplit('@', 1)[-1]
+        lines = [
+            f"GET {target} HTTP/1.1",
+            f"Host: {host_header}",
+            f"User-Agent: {self.user_agent}",
+            "Accept: text/html,application/xhtml+xml,*/*",
+            "Accept-Encoding: gzip, deflate",
+            "Connection: keep-alive",
+        ]
+        for name, value in {**self.extra_headers, **headers}.items():
+            lines.append(f"{name}: {value}")
+        conn.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await conn.writer.drain()
+
+        reader = conn.reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("서버가 응답 없이 연결을 닫았습니다")
+        try:
+            version, status, _ = status_line.decode('latin-1').split(' ', 2)
+            status = int(status)
+        except ValueError:
+            raise HTTPError(f"잘못된 상태 줄: {status_line!r}")
+
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        decoder = _BodyDecoder(response_headers)
+        if status in (204, 304) or 100 <= status < 200:
+            pass
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    # 트레일러 헤더 건너뛰기
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                decoder.feed(await reader.readexactly(size))
+                await reader.readexactly(2)
+        elif 'content-length' in response_headers:
+            remaining = int(response_headers['content-length'])
+            while remaining > 0:
+                chunk = await reader.read(min(remaining, READ_CHUNK))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b'', remaining)
+                decoder.feed(chunk)
+                remaining -= len(chunk)
+        else:
+            # 길이 정보가 없으면 연결이 닫힐 때까지 읽음
+            while chunk := await reader.read(READ_CHUNK):
+                decoder.feed(chunk)
+            response_headers['connection'] = 'close'
+
+        keep_alive = (
+            version == 'HTTP/1.1'
+            and response_headers.get('connection', '').lower() != 'close'
+        )
+        return status, response_headers, decoder.finish(), keep_alive
+
+
+class _BodyDecoder:
+    """Content-Encoding 해제와 문자셋 디코딩을 조각 단위로 수행"""
+
+    def __init__(self, headers):
+        encoding = headers.get('content-encoding', '').lower()
+        if encoding == 'gzip':
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            self._decompressor = zlib.decompressobj()
+        else:
+            self._decompressor = None
+        charset = _charset(headers.get('content-type', '')) or 'utf-8'
+        try:
+            self._text = codecs.getincrementaldecoder(charset)(errors='replace')
+        except LookupError:
+            self._text = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._parts = []
+
+    def feed(self, data):
+        if self._decompressor is not None:
+            data = self._decompressor.decompress(data)
+        if data:
+            self._parts.append(self._text.decode(data))
+
+    def finish(self):
+        if self._decompressor is not None:
+            tail = self._decompressor.flush()
+            if tail:
+                self._parts.append(self._text.decode(tail))
+        self._parts.append(self._text.decode(b'', final=True))
+        return ''.join(self._parts)
+
+
+def _charset(content_type):
+    for param in content_type.split(';')[1:]:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'charset':
+            return value.strip().strip('"\'')
+    return None
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+수집 기사 보관소 (날짜별 파티션, 추가만 하는 압축 컬럼 형식)
+
+    <루트>/2026/02/03/<시각>-<pid>.narc     추가 한 번(수집 실행 한 번)마다 세그먼트 파일 하나
+
+세그먼트 파일:
+    MAGIC | 블록 0 의 필드별 압축 데이터 | 블록 1 ... | 꼬리 색인 (압축 JSON) | 꼬리 길이 (4바이트) | MAGIC
+
+- 기사 BLOCK_SIZE 개씩 블록으로 묶고 블록 안에서 필드(title, summary, content, url ...)마다
+  따로 압축 -> 제목만 읽을 때는 본문을 풀지 않음
+- 언론사 ID는 세그먼트마다 사전(['005', '031', ...])으로 두고 기사마다 사전 번호만 저장
+- 꼬리 색인: 기사 ID(언론사 번호 + 기사 번호), 수집 시각, 블록별 필드 위치
+  -> 기사 하나를 찾을 때는 꼬리만 읽고 그 기사가 든 블록에서 필요한 필드만 풂
+- 날짜 범위 읽기는 해당 날짜 디렉터리의 세그먼트만 엶
+- 세그먼트는 임시 이름으로 다 쓴 뒤 rename (쓰다 죽어도 반쯤 쓴 파일은 보이지 않음),
+  한 번 쓴 파일은 고치지 않음. 최근 DEDUP_DAYS 일 안에 이미 보관한 기사 ID는 다시 넣지 않음
+- 압축: zlib (기본), zstd (선택 의존성: pip install zstandard), 세그먼트마다 꼬리 색인에 기록
+
+예시:
+    python3 -m collector.archive import naver/economy_only_news.json --date 2026-02-03
+    python3 -m collector.archive scan --from 2026-02-01 --to 2026-02-07 --fields title
+    python3 -m collector.archive get 005/0001830273
+    python3 -m collector.archive stats
+"""
+
+from datetime import date, datetime, timedelta
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+
+from collector.cache import article_key
+from collector.output import _zstandard
+from collector.search import iter_records
+
+DEFAULT_PATH = os.environ.get(
+    'NEWS_ARCHIVE_PATH', os.path.expanduser('~/.local/share/ai-lounge/news-archive')
+)
+
+MAGIC = b'NARC1\n'
+TRAILER = struct.Struct('<I')
+SUFFIX = '.narc'
+
+BLOCK_SIZE = 128
+CODECS = ('zlib', 'zstd')
+DEFAULT_CODEC = 'zlib'
+
+# 이 기간 안에 이미 보관한 기사 ID는 다시 넣지 않음 (고정 목록 수집은 매번 같은 기사)
+DEDUP_DAYS = 7
+
+ID_PATTERN = re.compile(r'^(\d{3})/(\d+)$')
+URL_FIELDS = ('url', 'link')
+
+
+def split_id(key):
+    """기사 ID -> (언론사, 기사 번호), 네이버 기사 ID가 아니면 언론사 ''"""
+    match = ID_PATTERN.match(key)
+    return (match.group(1), match.group(2)) if match else ('', key)
+
+
+def record_key(record):
+    """레코드의 기사 ID (URL 이 없으면 제목 해시)"""
+    url = next((record[field] for field in URL_FIELDS if record.get(field)), None)
+    if url:
+        return article_key(url)
+    return 'title:' + hashlib.sha1(record['title'].encode('utf-8')).hexdigest()
+
+
+def _compress(data, codec):
+    if codec == 'zstd':
+        return _zstandard().ZstdCompressor(level=9).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data, codec):
+    if codec == 'zstd':
+        return _zstandard().ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _encode(values, codec):
+    return _compress(json.dumps(values, ensure_ascii=False).encode('utf-8'), codec)
+
+
+def write_segment(path, records, collected, codec=DEFAULT_CODEC, block_size=BLOCK_SIZE):
+    """레코드를 세그먼트 파일 하나로 기록 (collected: 기사별 수집 시각, epoch 초)"""
+    keys = [record_key(record) for record in records]
+    fields = sorted({field for record in records for field in record})
+    presses, press_ids, numbers = [], [], []
+    press_index = {}
+    for key in keys:
+        press, number = split_id(key)
+        if press not in press_index:
+            press_index[press] = len(presses)
+            presses.append(press)
+        press_ids.append(press_index[press])
+        numbers.append(number)
+
+    temp_path = path + '.tmp'
+    blocks = []
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        for start in range(0, len(records), block_size):
+            chunk = records[start:start + block_size]
+            columns = {}
+            for field in fields:
+                data = _encode([record.get(field) for record in chunk], codec)
+                columns[field] = [f.tell(), len(data)]
+                f.write(data)
+            blocks.append({'count': len(chunk), 'columns': columns})
+        footer = zlib.compress(json.dumps({
+            'version': 1,
+            'codec': codec,
+            'fields': fields,
+            'presses': presses,
+            'press': press_ids,
+            'number': numbers,
+            'collected': [round(when) for when in collected],
+            'blocks': blocks,
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        f.write(footer)
+        f.write(TRAILER.pack(len(footer)))
+        f.write(MAGIC)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class Segment:
+    """세그먼트 파일 하나 (꼬리 색인만 읽어 두고 블록은 필요할 때 읽음)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            f.seek(-(TRAILER.size + len(MAGIC)), os.SEEK_END)
+            trailer = f.read(TRAILER.size + len(MAGIC))
+            if trailer[TRAILER.size:] != MAGIC:
+                raise ValueError(f"보관소 세그먼트가 아님: {path}")
+            length, = TRAILER.unpack(trailer[:TRAILER.size])
+            f.seek(-(TRAILER.size + len(MAGIC) + length), os.SEEK_END)
+            footer = json.loads(zlib.decompress(f.read(length)))
+        self.codec = footer['codec']
+        self.fields = footer['fields']
+        self.presses = footer['presses']
+        self.keys = [f"{self.presses[press]}/{number}" if self.presses[press] else number
+                     for press, number in zip(footer['press'], footer['number'])]
+        self.press = [self.presses[press] for press in footer['press']]
+        self.collected = footer['collected']
+        self.blocks = footer['blocks']
+        self._positions = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def _columns(self, f, block, fields):
+        columns = {}
+        for field in fields:
+            location = block['columns'].get(field)
+            if location is None:
+                columns[field] = [None] * block['count']
+                continue
+            f.seek(location[0])
+            columns[field] = json.loads(_decompress(f.read(location[1]), self.codec))
+        return columns
+
+    def _record(self, index, columns, offset, fields):
+        record = {'id': self.keys[index], 'press': self.press[index], 'collected': self.collected[index]}
+        for field in fields:
+            value = columns[field][offset]
+            if value is not None:
+                record[field] = value
+        return record
+
+    def read(self, fields=None):
+        """기사 레코드 생성 (fields 를 주면 그 필드만 풂, ID/언론사/수집 시각은 항상)"""
+        fields = self.fields if fields is None else [field for field in fields if field in self.fields]
+        index = 0
+        with open(self.path, 'rb') as f:
+            for block in self.blocks:
+                columns = self._columns(f, block, fields)
+                for offset in range(block['count']):
+                    yield self._record(index, columns, offset, fields)
+                    index += 1
+
+    def get(self, key, fields=None):
+        """기사 하나 (그 기사가 든 블록의 필요한 필드만 풂), 없으면 None"""
+        index = self._positions.get(key)
+        if index is None:
+            return None
+        fields = self.fields if fields is None else [field for field in fields if field in self.fields]
+        offset = index
+        for block in self.blocks:
+            if offset < block['count']:
+                break
+            offset -= block['count']
+        with open(self.path, 'rb') as f:
+            return self._record(index, self._columns(f, block, fields), offset, fields)
+
+
+def _parse_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+class Archive:
+    """날짜별 파티션 보관소 (세그먼트는 바뀌지 않으므로 꼬리 색인을 메모리에 캐시)"""
+
+    def __init__(self, root=DEFAULT_PATH, codec=DEFAULT_CODEC, block_size=BLOCK_SIZE, dedup_days=DEDUP_DAYS):
+        if codec not in CODECS:
+            raise ValueError(f"지원하지 않는 압축: {codec}")
+        self.root = root
+        self.codec = codec
+        self.block_size = block_size
+        self.dedup_days = dedup_days
+        self._segments = {}
+        self._lock = threading.Lock()
+
+    def _directory(self, day):
+        return os.path.join(self.root, f'{day:%Y}', f'{day:%m}', f'{day:%d}')
+
+    def days(self, start=None, end=None):
+        """세그먼트가 있는 날짜 목록 (start/end 포함, 오래된 순)"""
+        start, end = _parse_date(start), _parse_date(end)
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for year in sorted(os.listdir(self.root)):
+            if not year.isdigit() or (start and int(year) < start.year) or (end and int(year) > end.year):
+                continue
+            for month in sorted(os.listdir(os.path.join(self.root, year))):
+                if not month.isdigit():
+                    continue
+                for day in sorted(os.listdir(os.path.join(self.root, year, month))):
+                    try:
+                        current = date(int(year), int(month), int(day))
+                    except ValueError:
+                        continue
+                    if (start is None or current >= start) and (end is None or current <= end):
+                        found.append(current)
+        return found
+
+    def segments(self, day):
+        """그날의 세그먼트 (쓴 순서대로)"""
+        directory = self._directory(day)
+        try:
+            names = sorted(name for name in os.listdir(directory) if name.endswith(SUFFIX))
+        except FileNotFoundError:
+            return []
+        segments = []
+        for name in names:
+            path = os.path.join(directory, name)
+            with self._lock:
+                segment = self._segments.get(path)
+            if segment is None:
+                segment = Segment(path)
+                with self._lock:
+                    self._segments[path] = segment
+            segments.append(segment)
+        return segments
+
+    def append(self, records, when=None, day=None):
+        """레코드를 새 세그먼트로 추가하고 추가한 수 반환
+
+        when: 수집 시각 (epoch 초, 기본 지금), day: 파티션 날짜 (기본 when 의 날짜)
+        """
+        when = time.time() if when is None else when
+        day = _parse_date(day) or datetime.fromtimestamp(when).date()
+        start = day - timedelta(days=self.dedup_days - 1)
+        recent = [segment for current in self.days(start, day) for segment in self.segments(current)]
+        fresh, keys = [], set()
+        for record in records:
+            key = record_key(record)
+            if key in keys or any(key in segment for segment in recent):
+                continue
+            keys.add(key)
+            fresh.append(record)
+        if not fresh:
+            return 0
+
+        directory = self._directory(day)
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.fromtimestamp(when)
+        path = os.path.join(directory, f'{stamp:%Y%m%dT%H%M%S%f}-{os.getpid()}{SUFFIX}')
+        write_segment(path, fresh, [when] * len(fresh), self.codec, self.block_size)
+        return len(fresh)
+
+    def scan(self, start=None, end=None, fields=None):
+        """날짜 범위의 기사 레코드 생성 (날짜 순, fields 를 주면 그 필드만 풂)
+
+        레코드마다 id, press, collected, day 가 붙음.
+        """
+        for day in self.days(start, end):
+            for segment in self.segments(day):
+                for record in segment.read(fields):
+                    record['day'] = day.isoformat()
+                    yield record
+
+    def get(self, key, start=None, end=None, fields=None):
+        """기사 ID로 하나 찾기 (최근 날짜부터 꼬리 색인만 보고, 찾은 블록만 풂)"""
+        for day in reversed(self.days(start, end)):
+            for segment in reversed(self.segments(day)):
+                if key in segment:
+                    record = segment.get(key, fields)
+                    record['day'] = day.isoformat()
+                    return record
+        return None
+
+    def stats(self, start=None, end=None):
+        days = self.days(start, end)
+        segments = [segment for day in days for segment in self.segments(day)]
+        return {
+            'days': len(days),
+            'first_day': days[0].isoformat() if days else None,
+            'last_day': days[-1].isoformat() if days else None,
+            'segments': len(segments),
+            'articles': sum(len(segment) for segment in segments),
+            'bytes': sum(os.path.getsize(segment.path) for segment in segments),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 기사 보관소")
+    parser.add_argument('--root', default=DEFAULT_PATH, help="보관소 디렉터리")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_command = commands.add_parser('import', help="수집 결과 파일을 보관소에 추가")
+    import_command.add_argument('paths', nargs='+', help=".json / .jsonl[.gz|.zst] 파일")
+    import_command.add_argument('--date', help="파티션 날짜 YYYY-MM-DD (기본: 레코드의 date 필드, 없으면 오늘)")
+    import_command.add_argument('--codec', choices=CODECS, default=DEFAULT_CODEC, help="블록 압축 방식")
+
+    scan_command = commands.add_parser('scan', help="날짜 범위의 기사 출력 (JSONL)")
+    scan_command.add_argument('--from', dest='start', help="시작 날짜 YYYY-MM-DD")
+    scan_command.add_argument('--to', dest='end', help="끝 날짜 YYYY-MM-DD")
+    scan_command.add_argument('--fields', help="읽을 필드 (쉼표 구분, 기본: 전부)")
+
+    get_command = commands.add_parser('get', help="기사 ID로 하나 출력")
+    get_command.add_argument('article_id', help="언론사/기사번호 (예: 005/0001830273)")
+
+    commands.add_parser('stats', help="보관소 요약")
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        archive = Archive(args.root, codec=args.codec)
+        for path in args.paths:
+            try:
+                records = list(iter_records(path))
+            except (OSError, ValueError) as e:
+                print(f"읽기 실패: {path} ({e})", file=sys.stderr)
+                continue
+            # 날짜가 있는 레코드는 그 날짜 파티션으로
+            by_day = {}
+            for record in records:
+                day = args.date or str(record.get('date') or '')[:10] or None
+                by_day.setdefault(day, []).append(record)
+            for day, group in by_day.items():
+                try:
+                    added = archive.append(group, day=day)
+                except ValueError as e:
+                    print(f"날짜 오류: {path} ({e})", file=sys.stderr)
+                    continue
+                print(f"{path}: {added}/{len(group)}개 추가 ({day or '오늘'})", file=sys.stderr)
+    elif args.command == 'scan':
+        archive = Archive(args.root)
+        fields = args.fields.split(',') if args.fields else None
+        for record in archive.scan(args.start, args.end, fields):
+            print(json.dumps(record, ensure_ascii=False))
+    elif args.command == 'get':
+        record = Archive(args.root).get(args.article_id)
+        if record is None:
+            print(f"없음: {args.article_id}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(record, ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps(Archive(args.root).stats(), ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
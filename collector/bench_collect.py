@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+수집기 벤치마크 / 회귀 검사 (저장된 기사 페이지를 로컬 스텁 서버로 재생)
+
+- 코퍼스: naver/naver_news_top9.json 기사마다 실제 기사 구조의 페이지를 만들고
+  (뒤에 naver/naver_debug.html 을 붙여 실제 페이지 크기와 비슷하게) 정답(제목/본문)을 함께 둠.
+  --save-corpus 로 디렉터리에 저장해 두고 --corpus 로 다시 읽거나 페이지를 추가할 수 있음
+  (페이지 이름.html + 정답 이름.json)
+- 대상마다 새 프로세스에서 실행해 최대 RSS를 따로 잼
+    collect_news:<파서>  ConcurrentFetcher -> parse_job -> 300자 요약 -> JSON
+    naver                AsyncHTTPClient -> extract_article -> 1000자 요약 -> JSON
+- 단계별 시간: fetch(다운로드), parse(HTML -> 제목/본문), extract(추출 요약), serialize(JSON)
+  각 단계를 순서대로 따로 돌려 시간을 나눔 (실제 수집기는 단계가 겹쳐 돌아감)
+- 정확도: 제목이 같고 본문 토큰 F1 이 ACCURACY_THRESHOLD 이상인 페이지 비율
+- --baseline 결과와 비교해 처리량이 --tolerance 보다 떨어지거나 정확도가 낮아지면 종료 코드 1
+
+예시:
+    python3 -m collector.bench_collect
+    python3 -m collector.bench_collect --copies 10 --output bench.json
+    python3 -m collector.bench_collect --baseline bench.json --tolerance 0.2
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import asyncio
+import gzip
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+import time
+
+from collector.bench_parse import DEBUG_PAGE, TOP9_JSON, article_page
+from collector.parse import BACKENDS
+from collector.search import tokenize
+
+ACCURACY_THRESHOLD = 0.9
+
+TARGETS = tuple(f'collect_news:{backend}' for backend in sorted(BACKENDS)) + ('naver',)
+
+
+def build_corpus():
+    """{이름: (HTML, 정답)} - top9 기사 + 검색 결과 페이지 꼬리"""
+    with open(TOP9_JSON, encoding='utf-8') as f:
+        articles = json.load(f)
+    with open(DEBUG_PAGE, encoding='utf-8') as f:
+        tail = f.read()
+    corpus = {}
+    for article in articles:
+        record = {'title': article['title'], 'content': article.get('fullContent') or article['content']}
+        corpus[f"top9-{article['rank']}"] = (article_page(record, tail), record)
+    return corpus
+
+
+def load_corpus(directory):
+    corpus = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.html'):
+            continue
+        stem = name[:-len('.html')]
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            page = f.read()
+        with open(os.path.join(directory, stem + '.json'), encoding='utf-8') as f:
+            corpus[stem] = (page, json.load(f))
+    return corpus
+
+
+def save_corpus(corpus, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, (page, expected) in corpus.items():
+        with open(os.path.join(directory, name + '.html'), 'w', encoding='utf-8') as f:
+            f.write(page)
+        with open(os.path.join(directory, name + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(expected, f, ensure_ascii=False, indent=2)
+
+
+def start_stub(corpus, latency=0.0):
+    """코퍼스를 /article/<이름> 으로 내주는 로컬 서버 (gzip 요청이면 압축)"""
+    pages = {name: page.encode('utf-8') for name, (page, _) in corpus.items()}
+    compressed = {name: gzip.compress(body, 6) for name, body in pages.items()}
+
+    class CorpusHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            name = self.path.rsplit('/', 1)[-1].split('?')[0]
+            if name not in pages:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if latency:
+                time.sleep(latency)
+            body = pages[name]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = compressed[name]
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CorpusHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def content_f1(expected, actual):
+    """본문 토큰(한국어 2-gram) F1"""
+    left, right = Counter(tokenize(expected)), Counter(tokenize(actual))
+    overlap = sum((left & right).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(right.values())
+    recall = overlap / sum(left.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _fetch_threaded(urls, workers):
+    from collector.fetch import ConcurrentFetcher
+
+    fetcher = ConcurrentFetcher(max_workers=workers, per_host_rate=10000.0, retries=0)
+    try:
+        return [result.text for result in fetcher.fetch_all(urls)]
+    finally:
+        fetcher.close()
+
+
+def _fetch_async(urls, workers):
+    from collector.aiofetch import AsyncHTTPClient
+
+    async def fetch():
+        async with AsyncHTTPClient(concurrency=workers, per_host=workers) as client:
+            responses = await asyncio.gather(*(client.get(url) for url in urls), return_exceptions=True)
+        return [None if isinstance(response, BaseException) else response.text for response in responses]
+
+    return asyncio.run(fetch())
+
+
+def run_target(target, base_url, names, expected, workers=8):
+    """대상 하나를 단계별로 실행하고 측정값 반환 (expected: {이름: 정답})"""
+    from collector.summarize import summarize_batch
+
+    urls = [f'{base_url}/article/{name}' for name in names]
+    stages = {}
+
+    started = time.perf_counter()
+    if target == 'naver':
+        texts = _fetch_async(urls, workers)
+    else:
+        texts = _fetch_threaded(urls, workers)
+    stages['fetch'] = time.perf_counter() - started
+    fetched = sum(len(text.encode('utf-8')) for text in texts if text is not None)
+
+    started = time.perf_counter()
+    if target == 'naver':
+        from naver_news_collector import extract_article
+
+        parsed = [extract_article(url, text) if text is not None else None for url, text in zip(urls, texts)]
+        parsed = [(article['title'], article['content']) if article else None for article in parsed]
+    else:
+        from collect_news import parse_job
+
+        backend = target.split(':', 1)[1]
+        parsed = [parse_job((text, backend))[0] if text is not None else None for text in texts]
+    stages['parse'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    length = 1000 if target == 'naver' else 300
+    summaries = summarize_batch([item[1] if item else '' for item in parsed], length)
+    stages['extract'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    records = [{'url': url, 'title': item[0] if item else '수집 실패', 'summary': summary}
+               for url, item, summary in zip(urls, parsed, summaries)]
+    serialized = json.dumps(records, ensure_ascii=False, indent=2)
+    stages['serialize'] = time.perf_counter() - started
+
+    correct = 0
+    for name, item in zip(names, parsed):
+        answer = expected[name]
+        if item and item[0] == answer['title'] and content_f1(answer['content'], item[1]) >= ACCURACY_THRESHOLD:
+            correct += 1
+
+    total = sum(stages.values())
+    return {
+        'pages': len(urls),
+        'failed': sum(1 for text in texts if text is None),
+        'bytes': fetched,
+        'output_bytes': len(serialized.encode('utf-8')),
+        'pages_per_sec': round(len(urls) / total, 2),
+        'bytes_per_sec': round(fetched / total),
+        'stages_ms': {stage: round(seconds * 1000, 3) for stage, seconds in stages.items()},
+        'accuracy': round(correct / len(urls), 4),
+        # 리눅스는 KiB 단위
+        'peak_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_isolated(target, base_url, names, expected, workers):
+    """새 프로세스에서 실행 (최대 RSS가 다른 대상과 섞이지 않게)"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_target, target, base_url, names, expected, workers).result()
+
+
+def compare(report, baseline, tolerance):
+    """기준 결과 대비 회귀 목록"""
+    regressions = []
+    for target, stats in report.items():
+        before = baseline.get(target)
+        if before is None:
+            continue
+        if stats['pages_per_sec'] < before['pages_per_sec'] * (1 - tolerance):
+            regressions.append(f"{target}: 처리량 {before['pages_per_sec']} -> {stats['pages_per_sec']} pages/s")
+        if stats['accuracy'] < before['accuracy']:
+            regressions.append(f"{target}: 정확도 {before['accuracy']} -> {stats['accuracy']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집기 벤치마크 / 회귀 검사")
+    parser.add_argument('--targets', default=','.join(TARGETS), help="실행할 대상 (쉼표 구분)")
+    parser.add_argument('--corpus', help="코퍼스 디렉터리 (이름.html + 이름.json), 기본: naver/ 에서 생성")
+    parser.add_argument('--save-corpus', help="생성한 코퍼스를 이 디렉터리에 저장")
+    parser.add_argument('--copies', type=int, default=5, help="코퍼스 반복 횟수 (페이지마다 다른 URL)")
+    parser.add_argument('--workers', type=int, default=8, help="동시 요청 수")
+    parser.add_argument('--latency', type=float, default=0.0, help="스텁 서버 응답 지연(초)")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--baseline', help="비교할 이전 결과 JSON")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="허용하는 처리량 감소 비율")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_corpus()
+    if args.save_corpus:
+        save_corpus(corpus, args.save_corpus)
+
+    # 같은 페이지도 복사본마다 URL을 달리해 캐시/연결 재사용 효과를 실제 수집과 비슷하게
+    served = {f'{name}-{copy}': corpus[name] for copy in range(args.copies) for name in corpus}
+    expected = {name: answer for name, (_, answer) in served.items()}
+    server, base_url = start_stub(served, args.latency)
+
+    report = {}
+    failures = []
+    try:
+        for target in [name.strip() for name in args.targets.split(',') if name.strip()]:
+            stats = report[target] = run_isolated(target, base_url, list(served), expected, args.workers)
+            stages = '  '.join(f"{stage} {ms:.1f}ms" for stage, ms in stats['stages_ms'].items())
+            print(f"{target}")
+            print(f"  {stats['pages']}페이지  {stats['pages_per_sec']:.1f} pages/s  "
+                  f"{stats['bytes_per_sec'] / 1024 / 1024:.1f} MiB/s  최대 RSS {stats['peak_rss_kib'] / 1024:.1f} MiB")
+            print(f"  {stages}")
+            print(f"  정확도 {stats['accuracy'] * 100:.1f}%  실패 {stats['failed']}")
+            if stats['accuracy'] < 1.0 or stats['failed']:
+                failures.append(f"{target}: 정확도 {stats['accuracy']}, 실패 {stats['failed']}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures.extend(compare(report, json.load(f), args.tolerance))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for failure in failures:
+        print(f"회귀: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+collect_news.py 파서 백엔드 벤치마크
+
+저장된 HTML 페이지마다 백엔드별로 파싱 시간(평균/최소)과 최대 메모리
+(tracemalloc 기준)를 재고, 두 백엔드의 결과가 같은지 확인합니다.
+기본 입력은 naver/naver_debug.html 과, naver/naver_news_top9.json 본문으로 만든
+기사 페이지(제목/dic_area 뒤에 검색 결과 페이지를 붙인 형태) 입니다.
+
+예시:
+    python3 -m collector.bench_parse
+    python3 -m collector.bench_parse naver/naver_debug.html --repeat 50 --output parse.json
+"""
+
+import argparse
+import html
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from collector.parse import BACKENDS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEBUG_PAGE = os.path.join(ROOT, 'naver', 'naver_debug.html')
+TOP9_JSON = os.path.join(ROOT, 'naver', 'naver_news_top9.json')
+
+
+def article_page(article, tail=''):
+    """기사 레코드(title, content)로 실제 기사 페이지 구조를 흉내낸 HTML"""
+    sentences = [s for s in article['content'].split('. ') if s]
+    paragraphs = ''.join(
+        f'<br><span class="end_photo_org"><img src="x.jpg"></span>{html.escape(s)}.<br>'
+        for s in sentences
+    )
+    title = html.escape(article['title'])
+    return (
+        f'<html><head><meta property="og:title" content="{title}"><script>var a = 1;</script></head><body>'
+        f'<h2 id="title_area" class="media_end_head_headline"><span>{title}</span></h2>'
+        '<div id="newsct_article" class="newsct_article _article_body">'
+        f'<article id="dic_area" class="go_trans _article_content"><div>{paragraphs}</div></article>'
+        '</div>' + tail
+    )
+
+
+def sample_article_page():
+    """top9 첫 기사 본문 + 검색 결과 페이지 꼬리"""
+    with open(TOP9_JSON, encoding='utf-8') as f:
+        article = json.load(f)[0]
+    with open(DEBUG_PAGE, encoding='utf-8') as f:
+        tail = f.read()
+    return article_page(article, tail)
+
+
+def measure(parse, page, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = parse(page)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    parse(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, {
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'min_ms': round(min(timings) * 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="collect_news.py 파서 백엔드 벤치마크")
+    parser.add_argument('pages', nargs='*', help="HTML 파일 (기본: naver_debug.html + 샘플 기사)")
+    parser.add_argument('--backends', default=','.join(BACKENDS), help="비교할 백엔드 (쉼표 구분)")
+    parser.add_argument('--repeat', type=int, default=20, help="페이지당 반복 횟수")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    pages = {}
+    for path in args.pages:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages[os.path.basename(path)] = f.read()
+    if not pages:
+        with open(DEBUG_PAGE, encoding='utf-8') as f:
+            pages['naver_debug.html'] = f.read()
+        pages['sample_article'] = sample_article_page()
+
+    backends = [name.strip() for name in args.backends.split(',') if name.strip()]
+    report = {}
+    mismatches = 0
+    for name, page in pages.items():
+        report[name] = {'bytes': len(page.encode('utf-8'))}
+        results = {}
+        for backend in backends:
+            results[backend], report[name][backend] = measure(BACKENDS[backend], page, args.repeat)
+        report[name]['same_output'] = len(set(results.values())) == 1
+        mismatches += not report[name]['same_output']
+
+        print(f"{name} ({report[name]['bytes'] / 1024:.0f} KiB)")
+        for backend in backends:
+            stats = report[name][backend]
+            print(f"  {backend:<8} 평균 {stats['mean_ms']:>8.2f}ms  최소 {stats['min_ms']:>8.2f}ms  "
+                  f"최대 메모리 {stats['peak_kib']:>9.1f} KiB")
+        print(f"  결과 일치: {'예' if report[name]['same_output'] else '아니오'}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
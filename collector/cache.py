@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+기사 HTTP 디스크 캐시 (SQLite)
+
+- 기사 ID(언론사/기사번호) 단위로 본문, ETag, Last-Modified 저장
+- 저장된 검증자로 조건부 GET 요청 헤더 생성 (304면 재다운로드 없음)
+- 본문 해시(sha1)가 같으면 이전 파싱 결과를 재사용 (재파싱 생략)
+- 파싱 결과는 만든 추출기 이름과 함께 저장, 같은 캐시 파일을 쓰는 다른 추출기의 결과는 재사용하지 않음
+- TTL 만료 항목 삭제 후 총 크기 상한을 넘으면 오래 안 쓴 항목부터 삭제
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_PATH = os.environ.get(
+    'NEWS_CACHE_PATH', os.path.expanduser('~/.cache/ai-lounge/news-cache.sqlite')
+)
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# n.news.naver.com/article/005/0001830273, n.news.naver.com/mnews/article/005/0001830273 등
+ARTICLE_ID_PATTERN = re.compile(r'/article/(?:\w+/)?(\d{3})/(\d{10})')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    digest TEXT NOT NULL,
+    body BLOB NOT NULL,
+    parsed TEXT,
+    extractor TEXT,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+def article_key(url):
+    """URL에서 기사 ID('005/0001830273') 추출, 기사 URL이 아니면 URL 그대로"""
+    match = ARTICLE_ID_PATTERN.search(url)
+    return f"{match.group(1)}/{match.group(2)}" if match else url
+
+
+class CacheEntry:
+    """캐시된 응답 하나"""
+
+    __slots__ = ('key', 'url', 'etag', 'last_modified', 'digest', 'text', 'parsed', 'stored_at')
+
+    def __init__(self, key, url, etag, last_modified, digest, text, parsed, stored_at):
+        self.key = key
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.text = text
+        self.parsed = parsed
+        self.stored_at = stored_at
+
+    def conditional_headers(self):
+        """조건부 GET 요청 헤더"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """여러 스레드에서 공유 가능한 SQLite 응답 캐시
+
+    extractor 는 set_parsed 로 저장하는 파싱 결과를 만든 추출기 이름
+    (예: 'naver_news_collector', 'collect_news/stream'). 다른 이름으로 저장된 결과는 없는 것으로 봄.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES, extractor=None):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.extractor = extractor
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute('PRAGMA table_info(entries)')}
+        if 'extractor' not in columns:
+            # 추출기 이름 없이 저장된 이전 캐시 (그 파싱 결과는 이름을 준 캐시에서 재사용하지 않음)
+            self._db.execute('ALTER TABLE entries ADD COLUMN extractor TEXT')
+
+    def get(self, key):
+        """TTL 안의 항목 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT url, etag, last_modified, digest, body, parsed, extractor, stored_at '
+                'FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            url, etag, last_modified, digest, body, parsed, extractor, stored_at = row
+            if extractor != self.extractor:
+                parsed = None
+            now = time.time()
+            if self.ttl and now - stored_at > self.ttl:
+                self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                return None
+            self._db.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+        return CacheEntry(key, url, etag, last_modified, digest,
+                          zlib.decompress(body).decode('utf-8'),
+                          json.loads(parsed) if parsed else None, stored_at)
+
+    def store(self, key, url, text, headers):
+        """200 응답 저장, 본문이 이전과 같으면 파싱 결과 유지"""
+        raw = text.encode('utf-8')
+        digest = hashlib.sha1(raw).hexdigest()
+        body = zlib.compress(raw, 6)
+        etag, last_modified = _validators(headers)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                'SELECT digest, parsed, extractor FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            keep = row is not None and row[0] == digest and row[2] == self.extractor
+            parsed = row[1] if keep else None
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(key, url, etag, last_modified, digest, body, parsed, extractor, size, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, url, etag, last_modified, digest, body, parsed, self.extractor if keep else None,
+                 len(body), now, now)
+            )
+        return CacheEntry(key, url, etag, last_modified, digest, text,
+                          json.loads(parsed) if parsed else None, now)
+
+    def revalidated(self, key, headers=None):
+        """304 응답: 저장 시각 갱신 (새 검증자가 오면 함께 갱신)"""
+        etag, last_modified = _validators(headers or {})
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'UPDATE entries SET stored_at = ?, accessed_at = ?, '
+                'etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) '
+                'WHERE key = ?', (now, now, etag, last_modified, key)
+            )
+
+    def set_parsed(self, key, parsed):
+        """파싱 결과 저장 (다음 실행에서 본문과 추출기가 같으면 재사용)"""
+        with self._lock:
+            self._db.execute(
+                'UPDATE entries SET parsed = ?, extractor = ? WHERE key = ?',
+                (json.dumps(parsed, ensure_ascii=False), self.extractor, key)
+            )
+
+    def evict(self):
+        """만료 항목 삭제 후 크기 상한까지 LRU 삭제, 삭제 건수 반환"""
+        with self._lock:
+            removed = 0
+            if self.ttl:
+                removed += self._db.execute(
+                    'DELETE FROM entries WHERE stored_at < ?', (time.time() - self.ttl,)
+                ).rowcount
+            total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if self.max_bytes and total > self.max_bytes:
+                victims = []
+                for key, size in self._db.execute(
+                    'SELECT key, size FROM entries ORDER BY accessed_at'
+                ):
+                    if total <= self.max_bytes:
+                        break
+                    victims.append((key,))
+                    total -= size
+                self._db.executemany('DELETE FROM entries WHERE key = ?', victims)
+                removed += len(victims)
+            return removed
+
+    def stats(self):
+        with self._lock:
+            count, size = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()
+        return {'entries': count, 'bytes': size}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _validators(headers):
+    """응답 헤더에서 (ETag, Last-Modified) 추출 (대소문자 무시)"""
+    etag = last_modified = None
+    for name, value in headers.items():
+        lowered = name.lower()
+        if lowered == 'etag':
+            etag = value
+        elif lowered == 'last-modified':
+            last_modified = value
+    return etag, last_modified
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+수집기 데몬 (cron 으로 매번 새로 띄우는 대신 한 프로세스 안에서 일정에 맞춰 반복 실행)
+
+- CronSchedule: 5필드 cron 식 (분 시 일 월 요일). *, */n, a-b, a-b/n, a,b 와 @hourly 같은 별칭 지원.
+  요일은 0~7 (0과 7이 일요일), 일/요일이 둘 다 제한되면 둘 중 하나만 맞아도 실행 (cron 과 같음)
+- Scheduler: 실행 시각마다 0~jitter 초 사이 무작위로 늦춰 실행. 이전 실행이 아직 안 끝났으면
+  이번 실행은 건너뜀 (겹침 방지)
+- 실행 사이에 HTTP 연결 풀, 캐시/색인 연결, 파싱 프로세스 풀을 그대로 두므로
+  매 실행마다 프로세스/연결을 새로 만드는 비용이 없음
+- 상태 엔드포인트: GET /status -> 작업별 마지막 실행 시간, 기사 처리량 등 JSON, GET /healthz -> ok
+
+기본 일정은 매 시간 정각 (NEWS_SCHEDULE 환경 변수로 변경).
+"""
+
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import json
+import os
+import random
+import signal
+import sys
+import threading
+import time
+import traceback
+
+DEFAULT_SCHEDULE = os.environ.get('NEWS_SCHEDULE', '0 * * * *')
+
+ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+}
+
+# (이름, 최솟값, 최댓값)
+FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 7),
+)
+
+# 이 기간 안에 맞는 시각이 없으면 (예: 2월 30일) 잘못된 식으로 봄
+SEARCH_YEARS = 5
+
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"cron 간격은 1 이상이어야 합니다: {text}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_text, end_text = part.split('-', 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part)
+            # 'a/n' 은 a 부터 끝까지 n 간격
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"cron 필드 범위 밖: {text} ({low}-{high})")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """5필드 cron 식 (로컬 시각 기준)"""
+
+    def __init__(self, expr):
+        self.expr = expr
+        fields = ALIASES.get(expr.strip(), expr).split()
+        if len(fields) != len(FIELDS):
+            raise ValueError(f"cron 식은 5개 필드여야 합니다: {expr!r}")
+        try:
+            parsed = [_parse_field(text, low, high) for text, (_, low, high) in zip(fields, FIELDS)]
+        except ValueError as e:
+            raise ValueError(f"잘못된 cron 식 {expr!r}: {e}") from None
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # 7 도 일요일
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        # 일/요일 중 '*' 로 시작하지 않는 쪽만 제한으로 봄
+        self._day_restricted = not fields[2].startswith('*')
+        self._weekday_restricted = not fields[4].startswith('*')
+
+    def __repr__(self):
+        return f"CronSchedule({self.expr!r})"
+
+    def _day_matches(self, when):
+        day = when.day in self.days
+        weekday = when.isoweekday() % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day or weekday
+        return day and weekday
+
+    def next_after(self, when):
+        """when 보다 뒤의 첫 실행 시각 (분 단위)"""
+        candidate = when.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = when.year + SEARCH_YEARS
+        while candidate.year <= limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"{SEARCH_YEARS}년 안에 실행 시각이 없는 cron 식: {self.expr!r}")
+
+
+class JobStatus:
+    """작업 하나의 실행 기록"""
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.running = False
+        self.next_run = None
+        self.last_started = None
+        self.last_duration = None
+        self.last_articles = None
+        self.last_error = None
+        self.total_articles = 0
+
+    def snapshot(self):
+        throughput = None
+        if self.last_duration and self.last_articles is not None:
+            throughput = round(self.last_articles / self.last_duration, 3)
+        return {
+            'schedule': self.schedule.expr,
+            'running': self.running,
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'next_run': self.next_run.isoformat(timespec='seconds') if self.next_run else None,
+            'last_started': (datetime.fromtimestamp(self.last_started).isoformat(timespec='seconds')
+                             if self.last_started else None),
+            'last_duration_sec': round(self.last_duration, 3) if self.last_duration is not None else None,
+            'last_articles': self.last_articles,
+            'articles_per_sec': throughput,
+            'total_articles': self.total_articles,
+            'last_error': self.last_error,
+        }
+
+
+class Scheduler:
+    """cron 일정으로 작업을 실행하는 스케줄러 (작업마다 실행 스레드 하나, 겹치면 건너뜀)
+
+    작업 함수는 인자 없이 호출되고 이번 실행에서 처리한 기사 수를 반환.
+    """
+
+    def __init__(self, jitter=0.0, now=datetime.now):
+        self.jitter = jitter
+        self.now = now
+        self.started = time.time()
+        self._jobs = {}
+        self._threads = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def add(self, name, schedule, func, run_now=False):
+        status = JobStatus(schedule)
+        status.next_run = self.now() if run_now else schedule.next_after(self.now())
+        self._jobs[name] = (func, status)
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def run_pending(self):
+        """실행 시각이 된 작업을 시작하고 다음 실행 시각까지 남은 초 반환"""
+        now = self.now()
+        for name, (func, status) in self._jobs.items():
+            if status.next_run > now:
+                continue
+            status.next_run = status.schedule.next_after(now)
+            with self._lock:
+                if status.running:
+                    status.skipped += 1
+                    print(f"[{name}] 이전 실행이 끝나지 않아 건너뜀", file=sys.stderr)
+                    continue
+                status.running = True
+            delay = random.uniform(0, self.jitter) if self.jitter else 0.0
+            thread = threading.Thread(target=self._run, args=(name, func, status, delay), name=f'job-{name}')
+            self._threads = [t for t in self._threads if t.is_alive()] + [thread]
+            thread.start()
+        upcoming = min(status.next_run for _, status in self._jobs.values())
+        return max((upcoming - self.now()).total_seconds(), 0.0)
+
+    def _run(self, name, func, status, delay):
+        try:
+            # 지터 대기 중 종료 요청이 오면 실행하지 않음
+            if delay and self._stop.wait(delay):
+                return
+            status.last_started = time.time()
+            started = time.perf_counter()
+            try:
+                articles = func() or 0
+            except Exception as e:
+                traceback.print_exc()
+                status.failures += 1
+                status.last_error = f"{type(e).__name__}: {e}"
+                articles = 0
+            else:
+                status.last_error = None
+            status.last_duration = time.perf_counter() - started
+            status.last_articles = articles
+            status.total_articles += articles
+            status.runs += 1
+            print(f"[{name}] {articles}개 기사, {status.last_duration:.1f}초", file=sys.stderr)
+        finally:
+            with self._lock:
+                status.running = False
+
+    def run_forever(self):
+        """stop() 이 불릴 때까지 실행, 끝나면 진행 중인 실행을 기다림"""
+        while not self._stop.is_set():
+            self._stop.wait(self.run_pending())
+        for thread in self._threads:
+            thread.join()
+
+    def status(self):
+        with self._lock:
+            return {
+                'uptime_sec': round(time.time() - self.started, 1),
+                'jobs': {name: status.snapshot() for name, (_, status) in self._jobs.items()},
+            }
+
+
+def make_status_handler(scheduler):
+    """GET /status (작업별 실행 기록 JSON), GET /healthz 를 처리하는 요청 핸들러"""
+
+    class StatusHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == '/status':
+                self._send(200, scheduler.status())
+            elif path == '/healthz':
+                self._send(200, {'ok': not scheduler.stopped})
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return StatusHandler
+
+
+def run_daemon(scheduler, status_port=None, status_host='127.0.0.1'):
+    """SIGTERM/SIGINT 를 받을 때까지 스케줄러 실행 (status_port 가 있으면 상태 엔드포인트도)"""
+    server = None
+    if status_port is not None:
+        server = ThreadingHTTPServer((status_host, status_port), make_status_handler(scheduler))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='status', daemon=True).start()
+        print(f"상태 엔드포인트: http://{status_host}:{server.server_address[1]}/status", file=sys.stderr)
+
+    owner = os.getpid()
+
+    def shutdown(signum, frame):
+        if os.getpid() != owner:
+            # fork로 물려받은 파싱 프로세스는 무시 (메인 프로세스가 풀을 닫을 때 끝남)
+            return
+        print("종료 요청, 진행 중인 실행이 끝나면 종료합니다", file=sys.stderr)
+        scheduler.stop()
+
+    previous = {sig: signal.signal(sig, shutdown) for sig in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        for name, (_, status) in scheduler._jobs.items():
+            print(f"[{name}] 일정 {status.schedule.expr}, 다음 실행 {status.next_run:%Y-%m-%d %H:%M}",
+                  file=sys.stderr)
+        scheduler.run_forever()
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        if server is not None:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+유사 중복 기사 탐지 (문자 n-gram 슁글 + MinHash LSH, SQLite 저장)
+
+같은 통신사 기사가 여러 언론사 ID로 올라오는 경우를 묶어서 첫 기사(대표)만
+요약/출력하도록 함.
+
+- 본문을 정규화한 뒤 문자 5-gram 집합으로 슁글링 (한국어는 형태소 분석 없이도 충분)
+- 슁글 해시에 128개 해시 함수를 적용해 MinHash 서명 (NumPy 벡터 연산)
+- 서명을 16밴드 x 8행으로 나눠 밴드별 버킷을 SQLite에 색인 (후보만 빠르게 조회)
+- 후보는 서명 일치율(자카드 유사도 추정치)이 임계값 이상일 때만 중복으로 판정
+- 실행 간에 유지되므로 지난 실행에서 본 기사와의 중복도 걸러냄
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+DEFAULT_PATH = os.environ.get(
+    'NEWS_DEDUP_PATH', os.path.expanduser('~/.cache/ai-lounge/news-dedup.sqlite')
+)
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_RETENTION = 30 * 24 * 3600
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 5
+# 이보다 짧은 본문('내용 없음' 등)은 중복 판정하지 않음
+MIN_LENGTH = 50
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20260301)
+_A = _rng.integers(1, _PRIME, size=(NUM_PERM, 1), dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, size=(NUM_PERM, 1), dtype=np.uint64)
+
+_NOISE = re.compile(r'[\s\W_]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    article_id TEXT PRIMARY KEY,
+    cluster_id TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    article_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket);
+CREATE INDEX IF NOT EXISTS buckets_article ON buckets (article_id);
+"""
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """공백/문장부호를 지운 본문의 문자 n-gram 집합"""
+    normalized = _NOISE.sub('', text).lower()
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def minhash(text):
+    """MinHash 서명 (uint32 NUM_PERM개), 슁글이 없으면 None"""
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(gram.encode('utf-8')) & _PRIME for gram in grams),
+        dtype=np.uint64, count=len(grams)
+    )
+    # (a * h + b) mod p 를 해시 함수마다 계산해 슁글 축으로 최솟값
+    return ((_A * hashes + _B) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def similarity(left, right):
+    """두 서명의 자카드 유사도 추정치"""
+    return float(np.count_nonzero(left == right)) / len(left)
+
+
+def _band_buckets(signature):
+    rows = NUM_PERM // BANDS
+    for band in range(BANDS):
+        digest = hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest()
+        yield band, int.from_bytes(digest, 'big', signed=True)
+
+
+class DuplicateIndex:
+    """실행 간에 유지되는 유사 중복 색인"""
+
+    def __init__(self, path=DEFAULT_PATH, threshold=DEFAULT_THRESHOLD, retention=DEFAULT_RETENTION):
+        self.path = path
+        self.threshold = threshold
+        self.retention = retention
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def check(self, article_id, text):
+        """기사를 색인에 넣고 대표 기사 ID 반환
+
+        이미 본 기사와 유사하면 그 묶음의 대표 ID, 새 묶음이면 article_id 자신.
+        너무 짧아 판정하지 않는 본문은 None.
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT cluster_id FROM signatures WHERE article_id = ?', (article_id,)
+            ).fetchone()
+        if row is not None:
+            return row[0]
+        if len(text) < MIN_LENGTH:
+            return None
+        signature = minhash(text)
+        if signature is None:
+            return None
+        buckets = list(_band_buckets(signature))
+
+        with self._lock:
+            candidates = set()
+            for band, bucket in buckets:
+                candidates.update(row[0] for row in self._db.execute(
+                    'SELECT article_id FROM buckets WHERE band = ? AND bucket = ?', (band, bucket)
+                ))
+            cluster_id, best = article_id, self.threshold
+            for candidate in candidates:
+                stored = self._db.execute(
+                    'SELECT cluster_id, signature FROM signatures WHERE article_id = ?', (candidate,)
+                ).fetchone()
+                if stored is None:
+                    continue
+                score = similarity(signature, np.frombuffer(stored[1], dtype=np.uint32))
+                if score >= best:
+                    cluster_id, best = stored[0], score
+
+            self._db.execute('BEGIN')
+            self._db.execute(
+                'INSERT INTO signatures (article_id, cluster_id, signature, added_at) VALUES (?, ?, ?, ?)',
+                (article_id, cluster_id, signature.tobytes(), time.time())
+            )
+            self._db.executemany(
+                'INSERT INTO buckets (band, bucket, article_id) VALUES (?, ?, ?)',
+                [(band, bucket, article_id) for band, bucket in buckets]
+            )
+            self._db.execute('COMMIT')
+        return cluster_id
+
+    def prune(self):
+        """보관 기간이 지난 서명 삭제, 삭제 건수 반환"""
+        cutoff = time.time() - self.retention
+        with self._lock:
+            self._db.execute('BEGIN')
+            self._db.execute(
+                'DELETE FROM buckets WHERE article_id IN '
+                '(SELECT article_id FROM signatures WHERE added_at < ?)', (cutoff,)
+            )
+            removed = self._db.execute('DELETE FROM signatures WHERE added_at < ?', (cutoff,)).rowcount
+            self._db.execute('COMMIT')
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+네이버 뉴스 기사 발견 단계
+
+- 섹션/목록 페이지를 받아 기사 링크에서 기사 ID(언론사/기사번호) 추출
+- SQLite 색인에 처음 본 ID만 추가 (이미 본 ID는 무시)
+- 아직 수집하지 않은 ID만 수집 대상으로 넘기고, 수집에 성공하면 완료 표시
+  (실패한 기사는 다음 실행에서 다시 대상이 됨)
+
+예시:
+    python3 -m collector.discover                  # 섹션 페이지 훑고 새 ID 출력
+    python3 -m collector.discover --sections 101,105 --limit 20
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_PATH = os.environ.get(
+    'NEWS_SEEN_PATH', os.path.expanduser('~/.cache/ai-lounge/news-seen.sqlite')
+)
+
+SECTION_URL = 'https://news.naver.com/section/{}'
+
+# 정치, 경제, 사회, 생활/문화, 세계, IT/과학
+DEFAULT_SECTIONS = ('100', '101', '102', '103', '104', '105')
+
+# 네이버 기사 링크 (n.news / m.entertain / m.sports 등, 상대 경로 포함)
+LINK_PATTERN = re.compile(
+    r'(?:naver\.com|href=")/(?:mnews/)?article/(?:\w+/)?(\d{3})/(\d{10})'
+)
+
+# 수집 완료 후 이 기간이 지난 ID는 색인에서 정리
+DEFAULT_RETENTION = 30 * 24 * 3600
+
+# 이 횟수만큼 수집에 실패한 ID는 더 이상 대상으로 넘기지 않음 (삭제된 기사 등)
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    article_id TEXT PRIMARY KEY,
+    source TEXT,
+    discovered_at REAL NOT NULL,
+    collected_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS articles_pending ON articles (collected_at, discovered_at);
+"""
+
+
+def article_url(article_id):
+    return f'https://n.news.naver.com/article/{article_id}'
+
+
+def extract_article_ids(html):
+    """페이지의 기사 ID를 처음 나온 순서대로 (중복 제거)"""
+    ids = {}
+    for match in LINK_PATTERN.finditer(html):
+        ids.setdefault(f"{match.group(1)}/{match.group(2)}", None)
+    return list(ids)
+
+
+class SeenIndex:
+    """발견/수집한 기사 ID 색인 (SQLite)"""
+
+    def __init__(self, path=DEFAULT_PATH, retention=DEFAULT_RETENTION, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.retention = retention
+        self.max_attempts = max_attempts
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def add(self, article_ids, source=None):
+        """처음 보는 ID만 추가, 새로 추가된 ID 목록 반환"""
+        now = time.time()
+        added = []
+        with self._lock:
+            self._db.execute('BEGIN')
+            for article_id in article_ids:
+                cursor = self._db.execute(
+                    'INSERT OR IGNORE INTO articles (article_id, source, discovered_at) VALUES (?, ?, ?)',
+                    (article_id, source, now)
+                )
+                if cursor.rowcount:
+                    added.append(article_id)
+            self._db.execute('COMMIT')
+        return added
+
+    def pending(self, limit=None):
+        """아직 수집하지 않은 ID (먼저 발견한 순)"""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT article_id FROM articles WHERE collected_at IS NULL AND attempts < ? '
+                'ORDER BY discovered_at, rowid LIMIT ?',
+                (self.max_attempts, -1 if limit is None else limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def mark_collected(self, article_ids):
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                'UPDATE articles SET collected_at = ? WHERE article_id = ?',
+                [(now, article_id) for article_id in article_ids]
+            )
+
+    def mark_failed(self, article_ids):
+        with self._lock:
+            self._db.executemany(
+                'UPDATE articles SET attempts = attempts + 1 WHERE article_id = ?',
+                [(article_id,) for article_id in article_ids]
+            )
+
+    def prune(self):
+        """보관 기간이 지난 수집 완료/포기 ID 삭제, 삭제 건수 반환"""
+        cutoff = time.time() - self.retention
+        with self._lock:
+            return self._db.execute(
+                'DELETE FROM articles WHERE (collected_at IS NOT NULL AND collected_at < ?) '
+                'OR (attempts >= ? AND discovered_at < ?)',
+                (cutoff, self.max_attempts, cutoff)
+            ).rowcount
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def section_urls(sections=DEFAULT_SECTIONS):
+    return [SECTION_URL.format(section) for section in sections]
+
+
+def _succeeded(status):
+    # 오류 페이지(4xx/5xx)에도 기사 링크가 있을 수 있지만 목록으로 믿지 않음
+    return status is not None and 200 <= status < 300
+
+
+def _report_failures(failed, total):
+    if failed:
+        print(f"목록 페이지 실패: {failed}/{total}개", file=sys.stderr)
+
+
+def discover(fetcher, index, urls):
+    """목록 페이지들을 받아 새 기사 ID를 색인에 추가, 새로 추가된 ID 반환 (2xx 응답만 사용)"""
+    added = []
+    failed = 0
+    for result in fetcher.fetch_all(urls):
+        if result.text is None or not _succeeded(result.status):
+            failed += 1
+            print(f"목록 페이지 실패: {result.url} ({result.error or f'HTTP {result.status}'})", file=sys.stderr)
+            continue
+        added.extend(index.add(extract_article_ids(result.text), source=result.url))
+    _report_failures(failed, len(urls))
+    return added
+
+
+async def discover_async(client, index, urls):
+    """discover 의 asyncio 버전 (AsyncHTTPClient 사용)"""
+    responses = await asyncio.gather(*(client.get(url) for url in urls), return_exceptions=True)
+    added = []
+    failed = 0
+    for url, response in zip(urls, responses):
+        if isinstance(response, BaseException) or not _succeeded(response.status):
+            failed += 1
+            reason = response if isinstance(response, BaseException) else f"HTTP {response.status}"
+            print(f"목록 페이지 실패: {url} ({reason})", file=sys.stderr)
+            continue
+        added.extend(index.add(extract_article_ids(response.text), source=url))
+    _report_failures(failed, len(urls))
+    return added
+
+
+def main():
+    from collector.fetch import ConcurrentFetcher
+
+    parser = argparse.ArgumentParser(description="네이버 뉴스 새 기사 발견")
+    parser.add_argument('--sections', default=','.join(DEFAULT_SECTIONS), help="섹션 번호 (쉼표 구분)")
+    parser.add_argument('--db', default=DEFAULT_PATH, help="발견 색인 SQLite 경로")
+    parser.add_argument('--limit', type=int, default=None, help="출력할 최대 ID 수")
+    args = parser.parse_args()
+
+    index = SeenIndex(args.db)
+    fetcher = ConcurrentFetcher(max_workers=4, per_host_rate=2.0)
+    try:
+        added = discover(fetcher, index, section_urls(args.sections.split(',')))
+        pending = index.pending(args.limit)
+    finally:
+        fetcher.close()
+        index.close()
+
+    print(f"새로 발견: {len(added)}개, 수집 대기: {len(pending)}개", file=sys.stderr)
+    for article_id in pending:
+        print(article_id)
+
+
+if __name__ == '__main__':
+    main()
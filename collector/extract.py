@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+네이버 기사 추출 엔진 (정규식 사전 컴파일, 단일 스캔)
+
+- og:title 과 본문 후보(표식이 있는 article/div 시작 태그)를 정규식 하나로 앞에서부터 한 번만 훑음
+- 본문 후보는 기존처럼 전략 우선순위대로 고름 (문서에서 먼저 나온 후보가 아니라 우선순위가 높은 후보)
+- 더 높은 우선순위 후보가 모두 나온 뒤 충분히 긴 본문이 있으면 거기서 스캔 중단
+- 본문을 못 찾으면 <p> 문단 대체 추출 (문단당 태그 제거 1회)
+- 추출 전략별 호출 수 / 누적 시간 집계
+"""
+
+from html import unescape
+import re
+import threading
+import time
+
+# og:title 메타 또는 본문 후보 표식이 있는 시작 태그 (다른 div 는 정규식 안에서 건너뜀)
+SCAN_PATTERN = re.compile(
+    r'<meta property="og:title" content="(?P<title>[^"]*)"'
+    r'|<(?P<tag>article|div)(?P<attrs>[^>]*(?:id="articleBody"|id="newsct_article"|class="newsct_article")[^>]*)>'
+)
+TITLE_PATTERN = re.compile(r'<meta property="og:title" content="([^"]*)"')
+PARAGRAPH_PATTERN = re.compile(r'<p[^>]*>(.*?)</p>', re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+SPACE_PATTERN = re.compile(r'\s+')
+
+# (전략 이름, 태그, 속성 표식) - 기존 패턴 순서 그대로 (앞이 우선)
+BODY_STRATEGIES = (
+    ('article#articleBody', 'article', 'id="articleBody"'),
+    ('div#articleBody', 'div', 'id="articleBody"'),
+    ('div#newsct_article', 'div', 'id="newsct_article"'),
+    ('div.newsct_article', 'div', 'class="newsct_article"'),
+)
+
+# 본문으로 인정하는 최소 길이, 이보다 짧으면 <p> 대체 추출
+ACCEPT_LENGTH = 100
+FALLBACK_LENGTH = 50
+
+
+def strip_tags(fragment):
+    """태그를 공백으로 바꾸고 공백 정리"""
+    return SPACE_PATTERN.sub(' ', TAG_PATTERN.sub(' ', fragment)).strip()
+
+
+class ExtractionStats:
+    """전략별 호출 수와 누적 시간"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._seconds = {}
+
+    def record(self, strategy, seconds):
+        with self._lock:
+            self._counts[strategy] = self._counts.get(strategy, 0) + 1
+            self._seconds[strategy] = self._seconds.get(strategy, 0.0) + seconds
+
+    def drain(self):
+        """누적값을 {전략: (호출 수, 초)}로 꺼내고 초기화 (파싱 프로세스 -> 메인 프로세스 전달용)"""
+        with self._lock:
+            drained = {strategy: (count, self._seconds[strategy]) for strategy, count in self._counts.items()}
+            self._counts.clear()
+            self._seconds.clear()
+        return drained
+
+    def reset(self):
+        self.drain()
+
+    def merge(self, drained):
+        with self._lock:
+            for strategy, (count, seconds) in drained.items():
+                self._counts[strategy] = self._counts.get(strategy, 0) + count
+                self._seconds[strategy] = self._seconds.get(strategy, 0.0) + seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                strategy: {
+                    'count': count,
+                    'total_ms': round(self._seconds[strategy] * 1000, 3),
+                    'avg_ms': round(self._seconds[strategy] * 1000 / count, 3),
+                }
+                for strategy, count in sorted(self._counts.items())
+            }
+
+
+class ArticleExtractor:
+    """기사 HTML에서 (제목, 본문) 추출 (max_length=None 이면 본문을 자르지 않음)"""
+
+    def __init__(self, max_length=1000):
+        self.max_length = max_length
+        self.stats = ExtractionStats()
+
+    def extract(self, html):
+        started = time.perf_counter()
+        title, content, strategy = self._scan(html)
+        scanned = time.perf_counter()
+        self.stats.record('scan', scanned - started)
+
+        if len(content) < FALLBACK_LENGTH:
+            content = self._paragraphs(html)
+            strategy = 'paragraphs'
+            self.stats.record('paragraphs', time.perf_counter() - scanned)
+
+        # 어떤 본문 전략이 채택됐는지 (시간은 전체 추출 시간)
+        self.stats.record(f'body:{strategy}', time.perf_counter() - started)
+
+        # og:title 속성값과 본문의 문자 참조(&quot; 등) 복원
+        title, content = unescape(title or ''), unescape(content)
+        if self.max_length is not None and len(content) > self.max_length:
+            content = content[:self.max_length] + "..."
+        return title or "제목 없음", content or "본문 없음"
+
+    def _scan(self, html):
+        """단일 스캔: 제목과 전략별 첫 번째 본문 후보를 모으고 우선순위대로 본문 선택"""
+        title = None
+        candidates = {}
+        pos = 0
+        while True:
+            match = SCAN_PATTERN.search(html, pos)
+            if match is None:
+                break
+            pos = match.end()
+
+            if match.group('title') is not None:
+                if title is None:
+                    title = match.group('title')
+                continue
+
+            tag, attrs = match.group('tag'), match.group('attrs')
+            for name, strategy_tag, marker in BODY_STRATEGIES:
+                if tag != strategy_tag or name in candidates or marker not in attrs:
+                    continue
+                # 기존 비탐욕 패턴과 같게 첫 번째 닫는 태그까지를 본문으로 봄
+                end = html.find(f'</{tag}>', pos)
+                if end < 0:
+                    continue
+                candidates[name] = strip_tags(html[pos:end])
+
+            if self._choose(candidates) is not None:
+                if title is None:
+                    found = TITLE_PATTERN.search(html, pos)
+                    title = found.group(1) if found else None
+                break
+
+        chosen = self._choose(candidates, final=True)
+        if chosen is None:
+            return title, '', 'none'
+        return title, candidates[chosen], chosen
+
+    @staticmethod
+    def _choose(candidates, final=False):
+        """기존 패턴 순서대로 시도한 것과 같은 결과의 전략 이름
+
+        우선순위대로 처음으로 충분히 긴 후보, 없으면 마지막으로 나온 후보.
+        final 이 아니면 그보다 앞선 전략이 아직 안 나왔을 때 (뒤에 나올 수 있으므로) None.
+        """
+        last = None
+        for name, _, _ in BODY_STRATEGIES:
+            if name not in candidates:
+                if not final:
+                    return None
+                continue
+            if len(candidates[name]) > ACCEPT_LENGTH:
+                return name
+            last = name
+        return last
+
+    def _paragraphs(self, html):
+        """대체 추출: 태그 제거 후 50자 넘는 <p> 문단 연결"""
+        texts = (TAG_PATTERN.sub(' ', p).strip() for p in PARAGRAPH_PATTERN.findall(html))
+        return SPACE_PATTERN.sub(' ', ' '.join(t for t in texts if len(t) > FALLBACK_LENGTH)).strip()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+동시 기사 수집기 (requests 기반)
+
+- Session 하나로 호스트별 연결 풀 재사용 (TCP/TLS 핸드셰이크 1회)
+- 스레드 풀로 동시 요청 수 제한
+- 호스트별 적응형 속도 제한 (느린 응답/429면 줄이고 정상이면 늘림) + 회로 차단기
+- 연결 오류/5xx/429 재시도 (지터 포함 지수 백오프, Retry-After 존중)
+- 실행 시간 예산(Deadline)이 다 되면 남은 URL은 보내지 않고 미룸 (FetchResult.deferred)
+- 디스크 캐시가 있으면 조건부 GET (304면 캐시 본문과 파싱 결과 재사용)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from collector.cache import article_key
+from collector.throttle import AdaptiveRateLimiter, CircuitBreaker, Deadline, Deferred
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# 재시도 대상 HTTP 상태 코드
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class FetchResult:
+    """URL 하나의 수집 결과"""
+
+    __slots__ = ('url', 'status', 'text', 'headers', 'elapsed', 'attempts', 'error',
+                 'deferred', 'cache_key', 'cached', 'parsed')
+
+    def __init__(self, url, status=None, text=None, headers=None, elapsed=0.0, attempts=0, error=None):
+        self.url = url
+        self.status = status
+        self.text = text
+        self.headers = headers or {}
+        self.elapsed = elapsed
+        self.attempts = attempts
+        self.error = error
+        # 시간 예산 소진/회로 차단으로 보내지 않음 (실패가 아니라 다음 실행으로 미룸)
+        self.deferred = False
+        # 캐시 사용 시: 기사 ID, 304 재검증 여부, 본문이 바뀌지 않았을 때의 이전 파싱 결과
+        self.cache_key = None
+        self.cached = False
+        self.parsed = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and 200 <= self.status < 400
+
+
+class ConcurrentFetcher:
+    """연결 풀을 공유하는 동시 수집기"""
+
+    def __init__(self, headers=None, max_workers=8, per_host_rate=5.0, retries=3,
+                 backoff=0.5, max_backoff=10.0, timeout=10, cache=None,
+                 limiter=None, breaker=None, deadline=None):
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        # 여러 수집기가 같은 제한기/차단기/예산을 공유할 수 있음
+        self.rate_limiter = limiter if limiter is not None else AdaptiveRateLimiter(per_host_rate)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.deadline = deadline if deadline is not None else Deadline()
+        self.cache = cache
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        # 워커 수만큼 호스트별 keep-alive 연결 유지, 재시도는 직접 처리
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_workers, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _sleep_before_retry(self, attempt, retry_after=None):
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            # full jitter: 0 ~ backoff * 2^attempt
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        time.sleep(min(delay, self.max_backoff, self.deadline.remaining()))
+
+    def _record(self, host, latency, status):
+        self.rate_limiter.record(host, latency, status)
+        self.breaker.record(host, status is not None and status < 500 and status != 429)
+
+    def fetch(self, url):
+        """URL 하나 수집 (재시도 포함, 예외 대신 FetchResult.error로 반환)"""
+        host = urlsplit(url).netloc
+        started = time.perf_counter()
+        result = FetchResult(url)
+        entry = None
+        request_headers = {}
+        if self.cache is not None:
+            result.cache_key = article_key(url)
+            entry = self.cache.get(result.cache_key)
+            if entry is not None:
+                request_headers = entry.conditional_headers()
+
+        for attempt in range(self.retries + 1):
+            probe = False
+            try:
+                self.deadline.check()
+                probe = self.breaker.check(host)
+                self.rate_limiter.acquire(host, self.deadline)
+                # 토큰을 기다리는 동안 예산이 다 떨어졌으면 타임아웃 0으로 보내지 않고 미룸
+                self.deadline.check()
+            except Deferred as e:
+                if probe:
+                    self.breaker.release(host)
+                result.error = str(e)
+                result.deferred = True
+                break
+            result.attempts = attempt + 1
+            sent = time.perf_counter()
+            try:
+                resp = self.session.get(url, headers=request_headers,
+                                        timeout=self.deadline.timeout(self.timeout))
+            except requests.RequestException as e:
+                result.error = str(e)
+                if self.deadline.expired():
+                    # 예산에 맞춰 줄인 타임아웃으로 끊긴 요청은 실패가 아니라 미룸
+                    if probe:
+                        self.breaker.release(host)
+                    result.deferred = True
+                    break
+                self._record(host, time.perf_counter() - sent, None)
+                if attempt < self.retries:
+                    self._sleep_before_retry(attempt)
+                    continue
+                break
+
+            self._record(host, time.perf_counter() - sent, resp.status_code)
+            result.status = resp.status_code
+            result.headers = dict(resp.headers)
+            if resp.status_code in RETRY_STATUSES and attempt < self.retries:
+                result.error = f"HTTP {resp.status_code}"
+                self._sleep_before_retry(attempt, _retry_after(resp.headers.get('Retry-After')))
+                continue
+
+            if resp.status_code == 304 and entry is not None:
+                self.cache.revalidated(result.cache_key, resp.headers)
+                result.text = entry.text
+                result.cached = True
+                result.parsed = entry.parsed
+                result.error = None
+                break
+
+            result.text = resp.text
+            result.error = None if resp.status_code < 400 else f"HTTP {resp.status_code}"
+            if self.cache is not None and resp.status_code == 200:
+                result.parsed = self.cache.store(result.cache_key, url, resp.text, resp.headers).parsed
+            break
+
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def fetch_all(self, urls, callback=None):
+        """여러 URL을 동시에 수집, 입력 순서대로 결과 반환
+
+        callback(index, result)는 수집 직후 작업 스레드에서 호출됨. callback이
+        막히면(예: 파싱 큐가 가득 참) 그 스레드는 다음 URL을 가져가지 않음.
+        """
+        def fetch_one(index, url):
+            result = self.fetch(url)
+            if callback is not None:
+                callback(index, result)
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fetch') as pool:
+            return list(pool.map(fetch_one, range(len(urls)), urls))
+
+    def close(self):
+        self.session.close()
+
+
+def _retry_after(value):
+    """Retry-After 헤더(초 단위)만 해석, 그 외 형식은 무시"""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+수집 결과 스트리밍 저장 (JSONL)
+
+- 기사 하나마다 한 줄씩 쓰고 바로 flush (중간에 죽어도 그때까지의 결과는 남음)
+- 확장자로 압축 선택: .jsonl, .jsonl.gz (gzip), .jsonl.zst (zstd, 선택 의존성: pip install zstandard)
+- 이어쓰기(resume): 기존 파일에서 이미 수집한 ID를 읽어 건너뛰고 뒤에 추가
+  (잘린 마지막 줄이나 닫히지 않은 압축 스트림은 읽을 수 있는 데까지 살려서 정리)
+"""
+
+import gzip
+import io
+import json
+import os
+import zlib
+
+
+def compression_for(path):
+    """파일 이름으로 압축 방식 결정"""
+    if path.endswith('.gz'):
+        return 'gzip'
+    if path.endswith('.zst'):
+        return 'zstd'
+    return None
+
+
+def is_jsonl(path):
+    """JSONL 출력 경로인지 (.jsonl, .jsonl.gz, .jsonl.zst)"""
+    return path.endswith(('.jsonl', '.jsonl.gz', '.jsonl.zst'))
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd 압축에는 zstandard 패키지가 필요합니다 (pip install zstandard)")
+    return zstandard
+
+
+def _open_binary_reader(path, compression):
+    raw = open(path, 'rb')
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='rb')
+    if compression == 'zstd':
+        return _zstandard().ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+    return raw
+
+
+def read_jsonl(path):
+    """JSONL 레코드 생성 (잘린 줄 / 닫히지 않은 압축 스트림은 읽을 수 있는 데까지)"""
+    for record, complete in _read(path):
+        if complete:
+            yield record
+
+
+def _truncation_errors(compression):
+    """기록 도중 중단된(끝 표시 없는) 압축 스트림을 읽을 때 나는 예외"""
+    if compression == 'gzip':
+        return (EOFError, zlib.error, gzip.BadGzipFile)
+    if compression == 'zstd':
+        return (_zstandard().ZstdError,)
+    return ()
+
+
+def _read(path):
+    """(레코드, 온전한지) 생성, 잘린 곳을 만나면 (None, False)를 내고 끝냄"""
+    compression = compression_for(path)
+    errors = _truncation_errors(compression)
+    with _open_binary_reader(path, compression) as binary:
+        reader = io.BufferedReader(binary) if compression == 'zstd' else binary
+        while True:
+            try:
+                line = reader.readline()
+            except errors:
+                yield None, False
+                return
+            if not line:
+                return
+            if not line.endswith(b'\n'):
+                # 마지막 줄이 쓰다 만 상태
+                yield None, False
+                return
+            try:
+                yield json.loads(line), True
+            except ValueError:
+                yield None, False
+                return
+
+
+def scan_output(path, key, done=None):
+    """기존 출력에서 이미 끝난 ID 집합과 파일이 온전한지 반환
+
+    key(record) 는 레코드의 ID, done(record) 가 False 인 레코드(예: 실패 항목)는
+    다시 수집하도록 집합에서 뺌.
+    """
+    ids = set()
+    clean = True
+    if not os.path.exists(path):
+        return ids, clean
+    for record, complete in _read(path):
+        if not complete:
+            clean = False
+            break
+        if done is None or done(record):
+            ids.add(key(record))
+    return ids, clean
+
+
+class JSONLWriter:
+    """기사 단위로 flush 하는 JSONL 기록기"""
+
+    def __init__(self, path, append=False, compression=None):
+        self.path = path
+        self.compression = compression or compression_for(path)
+        self.count = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if append and os.path.exists(path):
+            self._repair()
+        self._raw = open(path, 'ab' if append else 'wb')
+        if self.compression == 'gzip':
+            # 이어쓰면 새 gzip 멤버가 붙음 (여러 멤버 gzip은 표준 형식)
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='wb')
+        elif self.compression == 'zstd':
+            zstandard = _zstandard()
+            self._zstd_flush = zstandard.FLUSH_BLOCK
+            self._stream = zstandard.ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+
+    def _repair(self):
+        """중간에 끊긴 파일이면 온전한 레코드만 옮겨 다시 씀"""
+        _, clean = scan_output(self.path, key=lambda record: None)
+        if clean:
+            return
+        temp_path = self.path + '.tmp'
+        with JSONLWriter(temp_path, compression=self.compression) as writer:
+            for record in read_jsonl(self.path):
+                writer.write(record)
+        os.replace(temp_path, self.path)
+
+    def write(self, record):
+        self._stream.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+        if self.compression == 'gzip':
+            self._stream.flush(zlib.Z_SYNC_FLUSH)
+        elif self.compression == 'zstd':
+            self._stream.flush(self._zstd_flush)
+        self._raw.flush()
+        self.count += 1
+
+    def close(self):
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+collect_news.py 기사 파서 (백엔드 선택 가능)
+
+- bs4: 페이지 전체를 BeautifulSoup 트리로 만든 뒤 탐색 (기존 방식)
+- stream: html.parser 이벤트만 받아 제목과 dic_area 문단 텍스트만 모음
+  (트리를 만들지 않고, 제목과 본문이 모두 닫히면 나머지 HTML은 파싱하지 않음)
+
+두 백엔드는 같은 (제목, 본문)을 돌려줌.
+"""
+
+from html.parser import HTMLParser
+
+DEFAULT_BACKEND = 'stream'
+
+# 한 번에 파서에 넣는 글자 수 (조기 종료 판단 단위)
+FEED_CHUNK = 16 * 1024
+
+# BeautifulSoup 이 시작 태그만으로 닫는 빈 요소
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link',
+    'menuitem', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+    'command', 'frame', 'image', 'isindex', 'nextid', 'spacer',
+])
+
+# 본문에서 제거하는 요소 (하위 텍스트 포함)
+SKIP_ELEMENTS = frozenset(['script', 'style', 'iframe', 'img'])
+
+# BeautifulSoup 이 별도 문자열 타입으로 담아 get_text 에서 빼는 요소
+STRING_CONTAINERS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+HEADLINE_CLASS = 'media_end_head_headline'
+BODY_ID = 'dic_area'
+
+
+def parse_bs4(html):
+    """BeautifulSoup 트리 기반 추출"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 제목 추출
+    title_elem = soup.find('h2', class_=HEADLINE_CLASS) or soup.find('h3')
+    title = title_elem.get_text(strip=True) if title_elem else "제목 없음"
+
+    # 본문 추출
+    article_body = soup.find('article', {'id': BODY_ID})
+    if article_body:
+        # 불필요한 요소 제거
+        for elem in article_body.find_all(list(SKIP_ELEMENTS)):
+            elem.decompose()
+        paragraphs = [p.get_text(strip=True) for p in article_body.find_all(['p', 'div']) if p.get_text(strip=True)]
+        content = ' '.join(paragraphs)
+    else:
+        content = "내용 없음"
+
+    return title, content
+
+
+class _Done(Exception):
+    """제목과 본문을 모두 찾아 더 읽을 필요 없음"""
+
+
+class _ArticleStream(HTMLParser):
+    """제목 요소와 dic_area 하위 p/div 텍스트만 모으는 이벤트 파서
+
+    BeautifulSoup(html.parser)과 같은 결과가 나오도록 규칙을 맞춤:
+    - 닫는 태그는 가장 최근에 열린 같은 이름의 태그까지 닫고, 없으면 무시
+    - 태그 사이의 연속된 텍스트는 하나의 문자열로 보고 strip
+    - script/style/template/rt/rp 안의 텍스트는 get_text 대상이 아님
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # [태그 이름, 역할, 텍스트 조각 리스트]
+        self.stack = []
+        self.headline = None
+        self.headline_done = False
+        self.h3 = None
+        self.body_found = False
+        self.body_done = False
+        self.in_body = False
+        self.skip_depth = 0
+        self.container_depth = 0
+        # 시작 태그 순서대로의 p/div 텍스트 조각 (get_text 결과에 해당)
+        self.blocks = []
+        self._pending = []
+        self._closed_voids = []
+
+    def _flush(self):
+        if not self._pending:
+            return
+        text = ''.join(self._pending).strip()
+        self._pending.clear()
+        if not text or self.container_depth:
+            return
+        for _, role, parts in self.stack:
+            if role == 'title' or (role == 'block' and not self.skip_depth):
+                parts.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in VOID_ELEMENTS:
+            self._closed_voids.append(tag)
+            return
+        role = parts = None
+        if self.skip_depth:
+            if tag in SKIP_ELEMENTS:
+                role = 'skip'
+                self.skip_depth += 1
+        elif self.in_body:
+            if tag in SKIP_ELEMENTS:
+                role = 'skip'
+                self.skip_depth = 1
+            elif tag == 'p' or tag == 'div':
+                role, parts = 'block', []
+                self.blocks.append(parts)
+        elif tag == 'article' and not self.body_found and _attr(attrs, 'id') == BODY_ID:
+            role = 'body'
+            self.body_found = self.in_body = True
+
+        if role is None:
+            if tag == 'h2' and self.headline is None and HEADLINE_CLASS in _attr(attrs, 'class', '').split():
+                role, parts = 'title', []
+                self.headline = parts
+            elif tag == 'h3' and self.h3 is None:
+                role, parts = 'title', []
+                self.h3 = parts
+        if tag in STRING_CONTAINERS:
+            self.container_depth += 1
+        self.stack.append([tag, role, parts])
+
+    def handle_endtag(self, tag):
+        if tag in self._closed_voids:
+            # <br> 뒤의 </br> 처럼 이미 닫힌 빈 요소의 닫는 태그
+            self._closed_voids.remove(tag)
+            return
+        self._flush()
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > index:
+            self._close(self.stack.pop())
+        if self.body_done and self.headline_done:
+            raise _Done()
+
+    def _close(self, entry):
+        tag, role, parts = entry
+        if tag in STRING_CONTAINERS:
+            self.container_depth -= 1
+        if role == 'skip':
+            self.skip_depth -= 1
+        elif role == 'body':
+            self.in_body = False
+            self.body_done = True
+        elif role == 'title' and parts is self.headline:
+            self.headline_done = True
+
+    def handle_data(self, data):
+        self._pending.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    handle_decl = handle_pi = unknown_decl = handle_comment
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _attr(attrs, name, default=None):
+    for key, value in attrs:
+        if key == name:
+            return value if value is not None else ''
+    return default
+
+
+def parse_stream(html):
+    """HTMLParser 이벤트 기반 추출 (트리 없음, 조기 종료)"""
+    parser = _ArticleStream()
+    try:
+        for start in range(0, len(html), FEED_CHUNK):
+            parser.feed(html[start:start + FEED_CHUNK])
+        parser.close()
+    except _Done:
+        pass
+
+    title_parts = parser.headline if parser.headline is not None else parser.h3
+    title = ''.join(title_parts) if title_parts is not None else "제목 없음"
+
+    if parser.body_found:
+        content = ' '.join(text for text in (''.join(parts) for parts in parser.blocks) if text)
+    else:
+        content = "내용 없음"
+
+    return title, content
+
+
+BACKENDS = {
+    'bs4': parse_bs4,
+    'stream': parse_stream,
+}
+
+
+def parse_article(html, backend=DEFAULT_BACKEND):
+    """기사 HTML에서 (제목, 본문) 추출"""
+    try:
+        parse = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"알 수 없는 파서 백엔드: {backend} (사용 가능: {', '.join(BACKENDS)})")
+    return parse(html)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+수집 파이프라인의 파싱 단계 (I/O 단계와 분리된 프로세스 풀)
+
+    I/O 단계(스레드/asyncio) --put--> 제한 큐 --> 프로세스 풀 파싱 --> 순서대로 결과
+
+- 큐가 차면 put 이 막혀 I/O 단계가 다음 다운로드를 멈춤 (back-pressure)
+- 프로세스 풀에 넘긴 작업 수도 제한해 큐 밖에서 페이지가 쌓이지 않게 함
+- ordered() 는 입력 인덱스 순서대로, 앞 번호가 끝나는 대로 바로 결과를 내보냄
+- processes=0 이면 프로세스 없이 디스패처 스레드에서 바로 파싱 (작은 실행/테스트용)
+- 풀이 깨지면(BrokenProcessPool) 남은 항목은 모두 그 오류로 끝냄, 풀을 새로 만드는 것은 풀 주인의 몫
+- 결과를 읽는 쪽이 먼저 끝나면(with 블록을 빠져나가면) 그 뒤의 put 은 버려지므로
+  I/O 단계는 막히지 않고 끝까지 돌아 join 할 수 있음
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import os
+import queue
+import threading
+
+_END = object()
+
+# 기본 파싱 프로세스 수 (파싱은 I/O 보다 빨라 CPU가 많아도 몇 개면 충분)
+DEFAULT_PROCESSES = min(os.cpu_count() or 1, 4)
+
+# 큐가 찬 put 이 단계가 멈췄는지 확인하는 간격 (초)
+STOP_POLL = 0.1
+
+
+class ParseStage:
+    """제한 큐 + 프로세스 풀 파싱 단계
+
+    parse 는 프로세스 간에 전달되므로 모듈 최상위 함수여야 함.
+    initializer 는 파싱 프로세스마다 시작 시 한 번 실행 (fork로 물려받은 상태 정리 등).
+    executor 를 주면 그 프로세스 풀을 쓰고 shutdown 때 닫지 않음 (데몬에서 실행 간 재사용).
+    """
+
+    def __init__(self, parse, processes=None, queue_size=None, initializer=None, executor=None):
+        self.parse = parse
+        self.processes = DEFAULT_PROCESSES if processes is None else processes
+        workers = max(self.processes, 1)
+        self.queue = queue.Queue(maxsize=queue_size or workers * 2)
+        self._owns_pool = executor is None
+        if executor is not None:
+            self._pool = executor if self.processes else None
+        else:
+            self._pool = (ProcessPoolExecutor(max_workers=workers, initializer=initializer)
+                          if self.processes else None)
+        # 풀에 동시에 넘기는 작업 수 (작업자마다 하나 실행 + 하나 대기)
+        self._slots = threading.BoundedSemaphore(workers * 2)
+        self._cond = threading.Condition()
+        self._results = {}
+        self._submitted = 0
+        self._completed = 0
+        self._closed = False
+        self._stopped = False
+        self._broken = None
+        self._next_index = 0
+        self._dispatcher = threading.Thread(target=self._dispatch, name='parse-dispatch', daemon=True)
+        self._dispatcher.start()
+
+    def put(self, index, payload):
+        """파싱할 페이지 전달 (큐가 차 있으면 빌 때까지 대기)"""
+        with self._cond:
+            self._submitted += 1
+        self._enqueue((index, payload))
+
+    async def put_async(self, index, payload):
+        """asyncio I/O 단계용 put (큐가 차면 이벤트 루프 대신 작업만 대기)"""
+        with self._cond:
+            self._submitted += 1
+        try:
+            self.queue.put_nowait((index, payload))
+        except queue.Full:
+            await asyncio.to_thread(self._enqueue, (index, payload))
+
+    def _enqueue(self, item):
+        # 읽는 쪽이 끝나 디스패처가 멈췄으면 가득 찬 큐에서 영원히 기다리지 않고 버림
+        while not self._stopped:
+            try:
+                self.queue.put(item, timeout=STOP_POLL)
+                return
+            except queue.Full:
+                pass
+
+    def put_result(self, index, value):
+        """파싱이 필요 없는 항목(수집 실패, 캐시 재사용)의 결과를 바로 등록"""
+        with self._cond:
+            self._submitted += 1
+        self._finish(index, value, None)
+
+    def close(self):
+        """더 이상 입력 없음 (I/O 단계가 끝나면 호출)"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self.queue.put(_END)
+
+    def _dispatch(self):
+        while True:
+            item = self.queue.get()
+            if item is _END:
+                break
+            index, payload = item
+            if self._stopped:
+                continue
+            if self._broken is not None:
+                # 입력 쪽이 막히지 않도록 큐는 계속 비움
+                self._finish(index, None, self._broken)
+                continue
+            if self._pool is None:
+                try:
+                    self._finish(index, self.parse(payload), None)
+                except Exception as e:
+                    self._finish(index, None, e)
+                continue
+            self._slots.acquire()
+            try:
+                future = self._pool.submit(self.parse, payload)
+            except Exception as e:
+                self._slots.release()
+                self._broken = e
+                self._finish(index, None, e)
+                continue
+            future.add_done_callback(lambda f, index=index: self._collect(index, f))
+
+    def _collect(self, index, future):
+        self._slots.release()
+        try:
+            value, error = future.result(), None
+        except Exception as e:
+            value, error = None, e
+            if isinstance(e, BrokenProcessPool):
+                self._broken = e
+        self._finish(index, value, error)
+
+    def _finish(self, index, value, error):
+        with self._cond:
+            self._results[index] = (value, error)
+            self._completed += 1
+            self._cond.notify_all()
+
+    def ordered(self):
+        """(index, 결과)를 인덱스 순서대로 생성, 파싱 예외는 해당 위치에서 다시 발생"""
+        while True:
+            with self._cond:
+                while self._next_index not in self._results and not self._drained():
+                    self._cond.wait()
+                if self._next_index in self._results:
+                    index = self._next_index
+                elif self._results:
+                    # 비어 있는 인덱스는 건너뜀
+                    index = min(self._results)
+                else:
+                    return
+                value, error = self._results.pop(index)
+                self._next_index = index + 1
+            if error is not None:
+                raise error
+            yield index, value
+
+    def ready(self):
+        """ordered() 가 기다리지 않고 바로 다음 결과를 낼 수 있는지"""
+        with self._cond:
+            return self._next_index in self._results or self._drained()
+
+    def _drained(self):
+        return self._closed and self._completed == self._submitted
+
+    def shutdown(self):
+        self._dispatcher.join()
+        if self._pool is not None and self._owns_pool:
+            self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # 결과를 더 읽지 않으므로 남은 입력은 파싱하지 않고 버림
+        self._stopped = True
+        self.close()
+        self.shutdown()
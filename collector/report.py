@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+주간 뉴스 리포트 (보관소 기사로 집계, 브라우저 없이)
+
+- 날짜별 키워드/언론사/분류 카운터를 SQLite에 미리 쌓아 둠 (증분)
+  보관소 세그먼트는 바뀌지 않으므로 처음 보는 세그먼트만 읽고, 본문 전체 대신
+  제목/요약 필드만 풂. 같은 기사 ID는 한 번만 셈
+- 주간 리포트는 7일치 일별 카운터를 더하기만 함 (기사를 다시 읽지 않음)
+- 키워드는 분류별로 한 번씩만 (예전 weekly_news_report.js 의 중복 목록 정리),
+  제목+요약에 들어 있으면 기사당 한 번 셈 (대소문자 무시)
+- 결과: JSON (예전 weekly_news_summary.json 과 같은 주요 필드) + 마크다운
+- --daemon 이면 --schedule 일정마다 (기본 매주 월요일 09:00) 다시 만듦
+
+예시:
+    python3 -m collector.report                                # 오늘까지 7일, 마크다운 stdout
+    python3 -m collector.report --end 2026-02-08 --json weekly.json --markdown weekly.md
+    python3 -m collector.report --daemon --json weekly.json --markdown weekly.md
+"""
+
+from datetime import date, datetime, timedelta, timezone
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from collector.archive import DEFAULT_PATH as ARCHIVE_PATH, Archive
+from collector.daemon import CronSchedule, Scheduler, run_daemon
+
+DEFAULT_PATH = os.environ.get(
+    'NEWS_REPORT_PATH', os.path.expanduser('~/.cache/ai-lounge/news-report.sqlite')
+)
+
+# 예전 리포트와 같은 매주 월요일 오전 9시
+DEFAULT_SCHEDULE = '0 9 * * 1'
+
+WEEK_DAYS = 7
+TOP_CATEGORIES = 5
+TOP_KEYWORDS = 20
+TOP_PRESSES = 10
+TOP_HEADLINES = 20
+
+# 분류 -> 키워드 (키워드는 전체에서 한 번씩만)
+CATEGORIES = {
+    '경제': ('경제', '주식', 'IPO', '공모주', 'M&A', '금융', '환율', '통화', '무역',
+             '부동산', '부동', '공시', '기업공시', '실적', '주주'),
+    '산업/기술': ('산업', '기술', 'AI', '반도체', '배터리', '자동차', '조선', '철강', '석유',
+              '가스전력', '원전력', '에너지', '기술주', '이노베이션', '스타트업', '벤처', '공기'),
+    '정치': ('정치', '헌법', '행정', '공무원', '대통령', '입법', '법안', '사면', '선거',
+           '민주', '지방선거', '국회', '국정'),
+    '사회': ('사회', '판사', '노사', '고용', '노조'),
+    '외교/안보': ('외교', '북한', '남북', '국방', '방위', '안보', '방산', '보안', '첩보', '정보'),
+}
+OTHER_CATEGORY = '기타'
+
+KEYWORDS = tuple(keyword for keywords in CATEGORIES.values() for keyword in keywords)
+KEYWORD_CATEGORY = {keyword: category for category, keywords in CATEGORIES.items() for keyword in keywords}
+
+# 주요 언론사 ID -> 이름 (없으면 ID 그대로)
+PRESS_NAMES = {
+    '001': '연합뉴스', '003': '뉴시스', '005': '국민일보', '008': '머니투데이', '009': '매일경제',
+    '011': '서울경제', '014': '파이낸셜뉴스', '015': '한국경제', '018': '이데일리', '020': '동아일보',
+    '023': '조선일보', '025': '중앙일보', '028': '한겨레', '031': '아이뉴스24', '032': '경향신문',
+    '055': 'SBS', '056': 'KBS', '214': 'MBC', '421': '뉴스1', '437': 'JTBC', '448': 'TV조선',
+    '449': '채널A',
+}
+
+# 요약이 없는 세그먼트(예전 리포트를 가져온 것)는 본문으로 셈
+TEXT_FIELDS = ('summary', 'content', 'fullContent')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    path TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    articles INTEGER NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    article_id TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    press TEXT NOT NULL,
+    title TEXT NOT NULL,
+    keywords TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_day ON articles (day);
+CREATE TABLE IF NOT EXISTS counts (
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, kind, name)
+) WITHOUT ROWID;
+"""
+
+
+def match_keywords(text):
+    """텍스트에 들어 있는 키워드 (KEYWORDS 순서)"""
+    text = text.lower()
+    return [keyword for keyword in KEYWORDS if keyword.lower() in text]
+
+
+def classify(keywords, category=None):
+    """키워드로 분류 목록 (레코드에 분류가 있으면 그것도), 없으면 기타"""
+    categories = list(dict.fromkeys(KEYWORD_CATEGORY[keyword] for keyword in keywords))
+    if category and category not in categories:
+        categories.append(category)
+    return categories or [OTHER_CATEGORY]
+
+
+class DailyCounters:
+    """날짜별 키워드/언론사/분류 카운터 (SQLite, 세그먼트 단위 증분)"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def update(self, archive, start=None, end=None):
+        """보관소에서 아직 세지 않은 세그먼트만 읽어 카운터에 더하고 새로 센 기사 수 반환"""
+        with self._lock:
+            done = {row[0] for row in self._db.execute('SELECT path FROM segments')}
+        added = 0
+        for day in archive.days(start, end):
+            for segment in archive.segments(day):
+                if segment.path not in done:
+                    added += self._add_segment(day.isoformat(), segment)
+        return added
+
+    def _add_segment(self, day, segment):
+        text_field = next((field for field in TEXT_FIELDS if field in segment.fields), None)
+        fields = ['title', 'category'] + ([text_field] if text_field else [])
+        counts = {}
+        with self._lock:
+            self._db.execute('BEGIN')
+            try:
+                added = 0
+                for record in segment.read(fields):
+                    keywords = match_keywords(f"{record.get('title', '')} {record.get(text_field, '')}")
+                    cursor = self._db.execute(
+                        'INSERT OR IGNORE INTO articles (article_id, day, press, title, keywords) VALUES (?, ?, ?, ?, ?)',
+                        (record['id'], day, record['press'], record.get('title', ''), ','.join(keywords))
+                    )
+                    if not cursor.rowcount:
+                        # 다른 날 이미 센 기사
+                        continue
+                    added += 1
+                    names = [('article', '')] + [('keyword', keyword) for keyword in keywords]
+                    names.append(('press', record['press']))
+                    names.extend(('category', category) for category in classify(keywords, record.get('category')))
+                    for name in names:
+                        counts[name] = counts.get(name, 0) + 1
+                self._db.executemany(
+                    'INSERT INTO counts (day, kind, name, count) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT (day, kind, name) DO UPDATE SET count = count + excluded.count',
+                    [(day, kind, name, count) for (kind, name), count in counts.items()]
+                )
+                self._db.execute(
+                    'INSERT INTO segments (path, day, articles, added_at) VALUES (?, ?, ?, ?)',
+                    (segment.path, day, added, time.time())
+                )
+                self._db.execute('COMMIT')
+            except BaseException:
+                # 세그먼트를 읽다 실패하면 일부만 센 기사/카운터를 되돌려 다음 update 에서 다시 셈
+                self._db.execute('ROLLBACK')
+                raise
+        return added
+
+    def totals(self, start, end, kind, limit=None):
+        """기간의 (이름, 합계) 목록 (많은 순)"""
+        with self._lock:
+            return self._db.execute(
+                'SELECT name, SUM(count) AS total FROM counts WHERE day BETWEEN ? AND ? AND kind = ? '
+                'GROUP BY name ORDER BY total DESC, name LIMIT ?',
+                (start, end, kind, -1 if limit is None else limit)
+            ).fetchall()
+
+    def daily(self, start, end):
+        """날짜별 기사 수"""
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT day, count FROM counts WHERE day BETWEEN ? AND ? AND kind = 'article' ORDER BY day",
+                (start, end)
+            ).fetchall())
+
+    def headlines(self, start, end, weights, limit=TOP_HEADLINES):
+        """기간에 많이 나온 키워드를 많이 담은 기사 순 (같으면 최근 날짜 먼저)"""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT article_id, day, press, title, keywords FROM articles WHERE day BETWEEN ? AND ?',
+                (start, end)
+            ).fetchall()
+        scored = []
+        for article_id, day, press, title, keywords in rows:
+            keywords = keywords.split(',') if keywords else []
+            scored.append((sum(weights.get(keyword, 0) for keyword in keywords), day, article_id,
+                           {'id': article_id, 'title': title, 'date': day, 'press': press, 'keywords': keywords}))
+        scored.sort(key=lambda item: (item[0], item[1], item[2]), reverse=True)
+        return [item[3] for item in scored[:limit]]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def weekly_report(counters, end=None, days=WEEK_DAYS):
+    """end 날짜까지 days 일의 리포트 (일별 카운터 합)"""
+    end = end or date.today()
+    start = end - timedelta(days=days - 1)
+    start, end = start.isoformat(), end.isoformat()
+
+    daily = counters.daily(start, end)
+    total = sum(daily.values())
+    categories = dict(counters.totals(start, end, 'category'))
+    keywords = dict(counters.totals(start, end, 'keyword'))
+    presses = [{'press': press, 'name': PRESS_NAMES.get(press, press or '기타'), 'count': count}
+               for press, count in counters.totals(start, end, 'press', TOP_PRESSES)]
+    top_categories = dict(list(categories.items())[:TOP_CATEGORIES])
+    headlines = counters.headlines(start, end, keywords)
+    return {
+        'reportType': 'weekly',
+        'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'dateRange': {'start': start, 'end': end},
+        'stats': {
+            'totalNews': total,
+            'daily': daily,
+            'categories': categories,
+        },
+        'topCategories': top_categories,
+        'keywords': dict(list(keywords.items())[:TOP_KEYWORDS]),
+        'presses': presses,
+        'topHeadlines': headlines,
+    }
+
+
+def render_markdown(report):
+    total = report['stats']['totalNews']
+    lines = [
+        '# 주간 하드뉴스 분석 보고서',
+        '',
+        f"**보고서 생성일**: {report['generatedAt'][:10]}",
+        f"**뉴스 분석 기간**: {report['dateRange']['start']} ~ {report['dateRange']['end']}",
+        '',
+        '## 통계 개요',
+        '',
+        f"- **총 뉴스 기사**: {total}건",
+        f"- **분석된 카테고리**: {len(report['stats']['categories'])}개",
+        '',
+        '| 날짜 | 기사 수 |',
+        '|------|---------|',
+    ]
+    lines.extend(f"| {day} | {count}건 |" for day, count in report['stats']['daily'].items())
+
+    lines += ['', f"## 상위 뉴스 (상위 {TOP_HEADLINES}개)", '', '| 순위 | 뉴스 헤드라인 | 언론사 | 날짜 |',
+              '|------|---------------|--------|------|']
+    for rank, item in enumerate(report['topHeadlines'], 1):
+        title = item['title'].replace('|', '\\|')
+        press = PRESS_NAMES.get(item['press'], item['press'] or '기타')
+        lines.append(f"| {rank} | {title} | {press} | {item['date'][5:]} |")
+
+    lines += ['', '## 주요 카테고리 분석', '', '| 카테고리 | 뉴스 건수 | 비율 |', '|----------|-----------|------|']
+    for category, count in report['topCategories'].items():
+        share = count / total * 100 if total else 0.0
+        lines.append(f"| {category} | {count}건 | {share:.1f}% |")
+
+    lines += ['', '## 주요 키워드 분석', '', '| 순위 | 키워드 | 언급 기사 수 |', '|------|--------|--------------|']
+    lines.extend(f"| {rank} | {keyword} | {count}건 |"
+                 for rank, (keyword, count) in enumerate(report['keywords'].items(), 1))
+
+    lines += ['', '## 언론사별 기사 수', '', '| 언론사 | 기사 수 |', '|--------|---------|']
+    lines.extend(f"| {item['name']} | {item['count']}건 |" for item in report['presses'])
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주간 뉴스 리포트 (보관소 기사 집계)")
+    parser.add_argument('--archive', default=ARCHIVE_PATH, help="기사 보관소 디렉터리")
+    parser.add_argument('--db', default=DEFAULT_PATH, help="일별 카운터 SQLite 경로")
+    parser.add_argument('--end', help="리포트 마지막 날짜 YYYY-MM-DD (기본: 오늘)")
+    parser.add_argument('--days', type=int, default=WEEK_DAYS, help="리포트 기간(일)")
+    parser.add_argument('--json', help="리포트 JSON 저장 경로")
+    parser.add_argument('--markdown', help="마크다운 리포트 저장 경로 (--json/--markdown 둘 다 없으면 stdout)")
+    parser.add_argument('--daemon', action='store_true', help="--schedule 일정마다 리포트를 다시 만듦")
+    parser.add_argument('--schedule', default=DEFAULT_SCHEDULE, help="데몬 실행 일정 (cron 식, 기본: 매주 월요일 09:00)")
+    parser.add_argument('--status-port', type=int, default=None, help="상태 엔드포인트 포트 (GET /status)")
+    args = parser.parse_args()
+
+    try:
+        end = datetime.strptime(args.end, '%Y-%m-%d').date() if args.end else None
+        schedule = CronSchedule(args.schedule)
+    except ValueError as e:
+        parser.error(str(e))
+
+    archive = Archive(args.archive)
+    counters = DailyCounters(args.db)
+
+    def run():
+        started = time.perf_counter()
+        added = counters.update(archive)
+        report = weekly_report(counters, end, args.days)
+        print(f"새로 집계: {added}개, 기간 기사: {report['stats']['totalNews']}개 "
+              f"({time.perf_counter() - started:.2f}초)", file=sys.stderr)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        if args.markdown:
+            with open(args.markdown, 'w', encoding='utf-8') as f:
+                f.write(render_markdown(report))
+        if not args.json and not args.markdown:
+            sys.stdout.write(render_markdown(report))
+        return added
+
+    try:
+        if args.daemon:
+            scheduler = Scheduler()
+            scheduler.add('weekly_report', schedule, run)
+            run_daemon(scheduler, args.status_port)
+        else:
+            run()
+    finally:
+        counters.close()
+
+
+if __name__ == '__main__':
+    main()
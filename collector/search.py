@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+수집한 기사 전문 검색 (SQLite 역색인 + BM25)
+
+- 한국어는 형태소 분석 없이 문자 2-gram으로, 영문/숫자는 단어 단위로 토큰화
+  (조사가 붙은 '코스피가' 도 '코스피' 검색에 걸림)
+- 색인은 증분: 크기/수정 시각이 바뀐 파일만 다시 읽고, 본문이 바뀐 기사만 다시 색인
+- 기사 ID(언론사/기사번호)가 같으면 여러 파일에 있어도 문서 하나
+- 지원 입력: 수집기 출력(.json, .jsonl[.gz|.zst])과 naver/*.json 리포트
+  (기사 목록이 최상위이거나 'articles', 'news' 등 목록 필드 안에 있는 형식)
+
+예시:
+    python3 -m collector.search index news_summary.json naver/*.json
+    python3 -m collector.search query 코스피 급등
+    python3 -m collector.search serve --port 8765   # GET /search?q=코스피&limit=10
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+
+from collector.cache import article_key
+from collector.output import is_jsonl, read_jsonl
+
+DEFAULT_PATH = os.environ.get(
+    'NEWS_SEARCH_PATH', os.path.expanduser('~/.cache/ai-lounge/news-search.sqlite')
+)
+
+# BM25 파라미터
+K1 = 1.2
+B = 0.75
+
+WORD_PATTERN = re.compile(r'\w+')
+SPACE_PATTERN = re.compile(r'\s+')
+# 한글/한자/가나가 섞인 토큰은 2-gram으로 나눔
+CJK_PATTERN = re.compile(r'[ᄀ-ᇿ぀-ヿ㄰-㆏一-鿿가-힯]')
+
+BODY_FIELDS = ('content', 'fullContent', 'summary')
+URL_FIELDS = ('url', 'link')
+
+SNIPPET_LENGTH = 120
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    url TEXT,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    source TEXT,
+    digest TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text):
+    """검색 토큰 목록 (한국어 문자 2-gram, 영문/숫자 단어)"""
+    tokens = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        if not CJK_PATTERN.search(word) or len(word) == 1:
+            tokens.append(word)
+            continue
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def _find_articles(data):
+    """JSON 파일에서 기사 목록 찾기 (최상위 목록 또는 첫 번째 기사 목록 필드)"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for value in data.values():
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                return value
+    return []
+
+
+def iter_records(path):
+    """파일의 기사 레코드 생성 (제목 없는 항목은 건너뜀)"""
+    if is_jsonl(path):
+        records = read_jsonl(path)
+    else:
+        with open(path, encoding='utf-8') as f:
+            records = _find_articles(json.load(f))
+    for record in records:
+        if isinstance(record, dict) and isinstance(record.get('title'), str):
+            yield record
+
+
+def _document(record):
+    """레코드 -> (키, URL, 제목, 본문)"""
+    url = next((record[field] for field in URL_FIELDS if record.get(field)), None)
+    body = next((record[field] for field in BODY_FIELDS if record.get(field)), '')
+    title = record['title']
+    key = article_key(url) if url else 'title:' + hashlib.sha1(title.encode('utf-8')).hexdigest()
+    return key, url, title, body
+
+
+class SearchIndex:
+    """증분 역색인 (SQLite)"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def add(self, record, source=None):
+        """기사 하나 색인, 새로 넣거나 바뀌었으면 True"""
+        key, url, title, body = _document(record)
+        digest = hashlib.sha1(f'{title}\n{body}'.encode('utf-8')).hexdigest()
+        with self._lock:
+            row = self._db.execute('SELECT doc_id, digest FROM documents WHERE key = ?', (key,)).fetchone()
+            if row is not None and row[1] == digest:
+                return False
+            terms = {}
+            for token in tokenize(title) + tokenize(body):
+                terms[token] = terms.get(token, 0) + 1
+            length = sum(terms.values())
+
+            self._db.execute('BEGIN')
+            if row is None:
+                doc_id = self._db.execute(
+                    'INSERT INTO documents (key, url, title, body, source, digest, length) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (key, url, title, body, source, digest, length)
+                ).lastrowid
+            else:
+                doc_id = row[0]
+                self._db.execute('DELETE FROM postings WHERE doc_id = ?', (doc_id,))
+                self._db.execute(
+                    'UPDATE documents SET url = ?, title = ?, body = ?, source = ?, digest = ?, length = ? '
+                    'WHERE doc_id = ?',
+                    (url, title, body, source, digest, length, doc_id)
+                )
+            self._db.executemany(
+                'INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)',
+                [(term, doc_id, tf) for term, tf in terms.items()]
+            )
+            self._db.execute('COMMIT')
+        return True
+
+    def add_file(self, path):
+        """파일 색인, 바뀌지 않은 파일은 건너뜀. 새로 넣거나 바뀐 기사 수 반환"""
+        stat = os.stat(path)
+        source = os.path.abspath(path)
+        with self._lock:
+            row = self._db.execute('SELECT size, mtime_ns FROM files WHERE path = ?', (source,)).fetchone()
+        if row == (stat.st_size, stat.st_mtime_ns):
+            return 0
+        changed = sum(self.add(record, source) for record in iter_records(path))
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO files (path, size, mtime_ns) VALUES (?, ?, ?)',
+                (source, stat.st_size, stat.st_mtime_ns)
+            )
+        return changed
+
+    def search(self, query, limit=10):
+        """BM25 점수 순 [{'url', 'title', 'score', 'snippet'}]"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self._lock:
+            count, total = self._db.execute('SELECT COUNT(*), SUM(length) FROM documents').fetchone()
+            if not count:
+                return []
+            average = (total / count) or 1.0
+            scores = {}
+            for term in terms:
+                postings = self._db.execute(
+                    'SELECT p.doc_id, p.tf, d.length FROM postings p JOIN documents d USING (doc_id) '
+                    'WHERE p.term = ?', (term,)
+                ).fetchall()
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf, length in postings:
+                    norm = tf + K1 * (1 - B + B * length / average)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (K1 + 1) / norm
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            hits = []
+            for doc_id, score in ranked:
+                url, title, body = self._db.execute(
+                    'SELECT url, title, body FROM documents WHERE doc_id = ?', (doc_id,)
+                ).fetchone()
+                hits.append({'url': url, 'title': title, 'score': round(score, 4),
+                             'snippet': snippet(body, query)})
+        return hits
+
+    def stats(self):
+        with self._lock:
+            documents, = self._db.execute('SELECT COUNT(*) FROM documents').fetchone()
+            terms, = self._db.execute('SELECT COUNT(DISTINCT term) FROM postings').fetchone()
+            files, = self._db.execute('SELECT COUNT(*) FROM files').fetchone()
+        return {'documents': documents, 'terms': terms, 'files': files}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def snippet(body, query):
+    """질의 단어가 처음 나오는 부근의 본문 일부"""
+    lowered = body.lower()
+    positions = [lowered.find(word) for word in WORD_PATTERN.findall(query.lower())]
+    found = [position for position in positions if position >= 0]
+    start = max(min(found) - SNIPPET_LENGTH // 4, 0) if found else 0
+    text = SPACE_PATTERN.sub(' ', body[start:start + SNIPPET_LENGTH]).strip()
+    return ('...' if start else '') + text + ('...' if start + SNIPPET_LENGTH < len(body) else '')
+
+
+def make_handler(index):
+    """GET /search?q=...&limit=N 을 처리하는 요청 핸들러"""
+
+    class SearchHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            request = urlparse(self.path)
+            if request.path != '/search':
+                self._send(404, {'error': 'not found'})
+                return
+            params = parse_qs(request.query)
+            query = params.get('q', [''])[0]
+            try:
+                limit = int(params.get('limit', ['10'])[0])
+            except ValueError:
+                self._send(400, {'error': 'limit must be an integer'})
+                return
+            if not query:
+                self._send(400, {'error': 'q is required'})
+                return
+            self._send(200, {'query': query, 'results': index.search(query, limit)})
+
+        def _send(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return SearchHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집한 기사 전문 검색")
+    parser.add_argument('--db', default=DEFAULT_PATH, help="검색 색인 SQLite 경로")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    index_command = commands.add_parser('index', help="수집 결과 파일 색인 (바뀐 파일만)")
+    index_command.add_argument('paths', nargs='+', help=".json / .jsonl[.gz|.zst] 파일")
+
+    query_command = commands.add_parser('query', help="검색")
+    query_command.add_argument('words', nargs='+', help="검색어")
+    query_command.add_argument('--limit', type=int, default=10, help="최대 결과 수")
+
+    serve_command = commands.add_parser('serve', help="HTTP 검색 엔드포인트 (GET /search?q=...)")
+    serve_command.add_argument('--host', default='127.0.0.1')
+    serve_command.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    index = SearchIndex(args.db)
+    try:
+        if args.command == 'index':
+            for path in args.paths:
+                try:
+                    changed = index.add_file(path)
+                except (OSError, ValueError) as e:
+                    print(f"색인 실패: {path} ({e})", file=sys.stderr)
+                    continue
+                print(f"{path}: {changed}개 색인", file=sys.stderr)
+            print(json.dumps(index.stats(), ensure_ascii=False), file=sys.stderr)
+        elif args.command == 'query':
+            hits = index.search(' '.join(args.words), args.limit)
+            print(json.dumps(hits, ensure_ascii=False, indent=2))
+        else:
+            server = ThreadingHTTPServer((args.host, args.port), make_handler(index))
+            print(f"검색 서버: http://{args.host}:{args.port}/search?q=", file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+배치 추출 요약 (TF-IDF + TextRank, NumPy 행렬 연산)
+
+- 본문을 문장으로 나누고, 배치 전체 문장을 한 번에 TF-IDF 벡터로 만듦
+  (토큰은 검색 색인과 같은 한국어 문자 2-gram, 특징 해싱으로 차원 고정)
+- 기사마다 문장 유사도 행렬을 (기사 수, 문장 수, 문장 수) 텐서로 쌓아
+  TextRank 반복 계산을 배치 전체에 대해 한 번에 수행
+- 점수 높은 문장을 길이 제한 안에서 고르고 원래 순서로 이어 붙임
+- 네트워크/GPU 없이 동작 (NumPy만 사용)
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+from collector.search import tokenize
+
+# 문장 끝: 마침표/물음표/느낌표 뒤 공백, 또는 공백 없이 바로 다음 문장이 붙은 경우
+# (본문 태그를 지우면서 '...했습니다.한국거래소에' 처럼 붙는 일이 많음, 소수점은 제외)
+SENTENCE_END = re.compile(r'(?<=[.!?。])(?:\s+|(?=[가-힣A-Z\'"‘“\[(◇▲■]))|(?<=[가-힣][.!?])(?=\d)')
+SPACE_PATTERN = re.compile(r'\s+')
+MIN_SENTENCE = 10
+# 이미 고른 문장과 이보다 비슷한 문장은 요약에서 뺌 (같은 내용 반복 방지)
+REDUNDANCY = 0.7
+
+# 기사당 앞에서부터 이 문장 수까지만 점수 계산 (텐서 크기 상한)
+MAX_SENTENCES = 64
+FEATURES = 1 << 11
+DAMPING = 0.85
+ITERATIONS = 30
+
+
+def split_sentences(text):
+    """본문 -> 문장 목록 (너무 짧은 조각은 앞 문장에 붙임)"""
+    sentences = []
+    for piece in SENTENCE_END.split(text.strip()):
+        piece = SPACE_PATTERN.sub(' ', piece).strip()
+        if not piece:
+            continue
+        if sentences and len(piece) < MIN_SENTENCE:
+            sentences[-1] += ' ' + piece
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def _feature(token, cache):
+    index = cache.get(token)
+    if index is None:
+        index = cache[token] = zlib.crc32(token.encode('utf-8')) & (FEATURES - 1)
+    return index
+
+
+def rank_sentences(documents):
+    """문장 목록들 -> 기사별 (TextRank 점수, 문장 유사도 행렬) 목록 (배치 한 번에 계산)"""
+    count = len(documents)
+    width = max((len(sentences) for sentences in documents), default=0)
+    if not width:
+        return [(np.zeros(0), np.zeros((0, 0))) for _ in documents]
+
+    # (기사, 문장, 특징) 텐서에 단어 빈도 누적
+    cache = {}
+    articles, positions, features = [], [], []
+    for article, sentences in enumerate(documents):
+        for position, sentence in enumerate(sentences):
+            for token in tokenize(sentence):
+                articles.append(article)
+                positions.append(position)
+                features.append(_feature(token, cache))
+    vectors = np.zeros((count, width, FEATURES), dtype=np.float32)
+    np.add.at(vectors, (np.array(articles, dtype=np.intp), np.array(positions, dtype=np.intp),
+                        np.array(features, dtype=np.intp)), 1.0)
+
+    # TF-IDF: 로그 빈도 x 배치 전체 문장 기준 역문서 빈도, 문장 벡터는 단위 길이로
+    mask = np.zeros((count, width), dtype=bool)
+    for article, sentences in enumerate(documents):
+        mask[article, :len(sentences)] = True
+    total = mask.sum()
+    frequency = (vectors > 0).sum(axis=(0, 1))
+    idf = np.log((1.0 + total) / (1.0 + frequency)) + 1.0
+    vectors = np.log1p(vectors, out=vectors) * idf.astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=2, keepdims=True)
+    vectors /= np.where(norms > 0, norms, 1.0)
+
+    # 기사별 문장 유사도 (자기 자신, 빈 자리 제외) -> 행 정규화한 전이 행렬
+    similarity = vectors @ vectors.transpose(0, 2, 1)
+    pair_mask = mask[:, :, None] & mask[:, None, :]
+    pair_mask &= ~np.eye(width, dtype=bool)
+    similarity = np.where(pair_mask, similarity, 0.0)
+    sizes = mask.sum(axis=1, keepdims=True).astype(np.float32)
+    rows = similarity.sum(axis=2, keepdims=True)
+    # 다른 문장과 전혀 겹치지 않는 문장은 모든 문장으로 고르게 이동
+    uniform = np.where(pair_mask, 1.0 / np.maximum(sizes[:, :, None] - 1, 1), 0.0)
+    transition = np.where(rows > 0, similarity / np.where(rows > 0, rows, 1.0), uniform)
+
+    scores = np.where(mask, 1.0 / sizes, 0.0)
+    for _ in range(ITERATIONS):
+        scores = (1 - DAMPING) / sizes + DAMPING * np.einsum('aij,ai->aj', transition, scores)
+        scores = np.where(mask, scores, 0.0)
+
+    return [(scores[article, :len(sentences)], similarity[article, :len(sentences), :len(sentences)])
+            for article, sentences in enumerate(documents)]
+
+
+def _select(sentences, scores, similarity, max_length):
+    """점수 순으로 길이 제한까지 문장 선택, 원래 순서로 연결"""
+    # 동점이면 앞 문장 우선
+    order = sorted(range(len(sentences)), key=lambda i: (-scores[i], i))
+    chosen, length = [], 0
+    for i in order:
+        extra = len(sentences[i]) + (1 if chosen else 0)
+        if length + extra > max_length:
+            continue
+        if chosen and similarity[i, chosen].max() > REDUNDANCY:
+            continue
+        chosen.append(i)
+        length += extra
+    if not chosen:
+        # 가장 중요한 문장 하나도 길이를 넘으면 '...' 까지 max_length 자가 되도록 잘라서 사용
+        return sentences[order[0]][:max(max_length - 3, 0)] + '...'
+    return ' '.join(sentences[i] for i in sorted(chosen))
+
+
+def summarize_batch(texts, max_length=300):
+    """본문 목록 -> 요약 목록 (max_length 자 이내, 짧은 본문은 그대로)"""
+    summaries = [None] * len(texts)
+    pending, documents = [], []
+    for i, text in enumerate(texts):
+        text = text.strip()
+        if len(text) <= max_length:
+            summaries[i] = text
+            continue
+        pending.append(i)
+        documents.append(split_sentences(text)[:MAX_SENTENCES])
+
+    for i, sentences, (scores, similarity) in zip(pending, documents, rank_sentences(documents)):
+        summaries[i] = _select(sentences, scores, similarity, max_length)
+    return summaries
+
+
+def summarize(text, max_length=300):
+    return summarize_batch([text], max_length)[0]
+
+
+def iter_summarized(records, field, max_length=300, batch_size=16, keep=None, ready=None):
+    """레코드를 batch_size 개씩 모아 field 본문을 요약으로 바꿔 입력 순서대로 생성
+
+    keep(record) 가 True 인 레코드(수집 실패 항목 등)는 그대로 내보냄.
+    ready() 를 주면 다음 레코드가 바로 나오지 않을 때(입력이 막힘) 모인 만큼 먼저 내보냄
+    (기사마다 바로 기록하는 출력이 입력을 기다리는 동안 요약된 기사를 붙잡고 있지 않도록).
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size or (ready is not None and not ready()):
+            yield from _summarize_records(batch, field, max_length, keep)
+            batch = []
+    if batch:
+        yield from _summarize_records(batch, field, max_length, keep)
+
+
+def _summarize_records(batch, field, max_length, keep):
+    targets = [record for record in batch if keep is None or not keep(record)]
+    for record, summary in zip(targets, summarize_batch([record[field] for record in targets], max_length)):
+        record[field] = summary
+    return batch
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+asyncio 수집 클라이언트 테스트 (로컬 스텁 HTTP 서버 사용)
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import gzip
+import threading
+import time
+
+from collector.aiofetch import AsyncHTTPClient
+
+ARTICLE = '<meta property="og:title" content="테스트 제목"><p>{}</p>'.format('본문 ' * 40)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        StubHandler.connections.add(self.client_address)
+        body = ARTICLE.encode('utf-8')
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/gzip')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/slow':
+            time.sleep(0.3)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        if self.path == '/gzip':
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == '/chunked':
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(0, len(body), 100):
+                piece = body[i:i + 100]
+                self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    # 기본 대기열(5)을 넘는 동시 연결은 SYN 재전송(약 1초)을 기다리게 되어 시간 검사가 흔들림
+    request_queue_size = 64
+
+
+def start_stub():
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_decodes_plain_gzip_chunked_and_redirect():
+    server, base = start_stub()
+
+    async def run():
+        async with AsyncHTTPClient() as client:
+            return [await client.get(f"{base}{path}") for path in ('/plain', '/gzip', '/chunked', '/redirect')]
+
+    try:
+        responses = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert all(r.status == 200 and r.text == ARTICLE for r in responses)
+
+
+def test_reuses_connection():
+    server, base = start_stub()
+    StubHandler.connections.clear()
+
+    async def run():
+        async with AsyncHTTPClient(per_host=1) as client:
+            for _ in range(5):
+                await client.get(f"{base}/plain")
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert len(StubHandler.connections) == 1
+
+
+def test_concurrent_and_timeout():
+    server, base = start_stub()
+
+    async def run():
+        async with AsyncHTTPClient(concurrency=8, per_host=8, timeout=1.0) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(client.get(f"{base}/slow") for _ in range(8)))
+            elapsed = time.perf_counter() - started
+        async with AsyncHTTPClient(timeout=0.1) as client:
+            try:
+                await client.get(f"{base}/slow")
+                timed_out = False
+            except asyncio.TimeoutError:
+                timed_out = True
+        return elapsed, timed_out
+
+    try:
+        elapsed, timed_out = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert elapsed < 1.5
+    assert timed_out
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+기사 보관소 테스트 (날짜 파티션, 블록/필드 단위 읽기, 꼬리 색인)
+"""
+
+from datetime import date
+import os
+
+from collector.archive import Archive, Segment
+
+
+def make_records(count, press='005'):
+    return [{
+        'url': f'https://n.news.naver.com/article/{press}/{i:010d}',
+        'title': f'제목 {press}-{i}',
+        'summary': f'요약 {i}',
+        'content': f'본문 {i} ' * 50,
+    } for i in range(count)]
+
+
+def test_scan_and_get_across_days_and_blocks(tmp_path):
+    archive = Archive(str(tmp_path), block_size=4)
+    assert archive.append(make_records(10), day='2026-02-02') == 10
+    assert archive.append(make_records(3, press='031'), day='2026-02-04') == 3
+
+    assert [day.isoformat() for day in archive.days()] == ['2026-02-02', '2026-02-04']
+    records = list(archive.scan('2026-02-01', '2026-02-03'))
+    assert len(records) == 10
+    assert records[9]['id'] == '005/0000000009' and records[9]['press'] == '005'
+    assert records[9]['content'] == '본문 9 ' * 50 and records[9]['day'] == '2026-02-02'
+
+    # 제목만 읽으면 본문/요약은 풀지 않음
+    titles = list(archive.scan(date(2026, 2, 4), fields=['title']))
+    assert [record['title'] for record in titles] == ['제목 031-0', '제목 031-1', '제목 031-2']
+    assert all('content' not in record and 'summary' not in record for record in titles)
+
+    # 세 번째 블록의 기사 하나
+    record = archive.get('005/0000000009')
+    assert record['title'] == '제목 005-9' and record['day'] == '2026-02-02'
+    assert archive.get('005/0000000099') is None
+
+    segment, = archive.segments(date(2026, 2, 2))
+    assert segment.presses == ['005'] and len(segment.blocks) == 3
+
+
+def test_recent_articles_are_not_archived_twice(tmp_path):
+    archive = Archive(str(tmp_path), dedup_days=7)
+    assert archive.append(make_records(3), day='2026-02-01') == 3
+    assert archive.append(make_records(5), day='2026-02-03') == 2
+    assert archive.append(make_records(3), day='2026-02-03') == 0
+    # 기간이 지나면 다시 보관
+    assert archive.append(make_records(1), day='2026-02-20') == 1
+    assert archive.stats()['articles'] == 6
+
+
+def test_unfinished_segments_are_ignored(tmp_path):
+    archive = Archive(str(tmp_path))
+    archive.append(make_records(2), day='2026-02-01')
+    directory = tmp_path / '2026' / '02' / '01'
+    (directory / 'crashed.narc.tmp').write_bytes(b'NARC1\npartial')
+
+    # 새 보관소 객체도 꼬리 색인만으로 찾음
+    reopened = Archive(str(tmp_path))
+    assert len(list(reopened.scan())) == 2
+    name, = [name for name in os.listdir(directory) if name.endswith('.narc')]
+    assert '005/0000000001' in Segment(os.path.join(directory, name))
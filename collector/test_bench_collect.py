@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+수집기 벤치마크 하네스 테스트 (로컬 스텁 서버로 코퍼스 재생)
+"""
+
+from collector.bench_collect import build_corpus, compare, run_target, start_stub
+
+
+def test_replays_corpus_through_both_collectors():
+    corpus = build_corpus()
+    expected = {name: answer for name, (_, answer) in corpus.items()}
+    server, base_url = start_stub(corpus)
+    try:
+        report = {target: run_target(target, base_url, list(corpus), expected, workers=4)
+                  for target in ('collect_news:stream', 'naver')}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for stats in report.values():
+        assert stats['pages'] == len(corpus) and stats['failed'] == 0
+        assert stats['accuracy'] == 1.0
+        assert set(stats['stages_ms']) == {'fetch', 'parse', 'extract', 'serialize'}
+        assert stats['bytes'] > 0 and stats['peak_rss_kib'] > 0
+
+    slower = {target: dict(stats, pages_per_sec=stats['pages_per_sec'] * 2) for target, stats in report.items()}
+    assert compare(report, report, 0.2) == []
+    assert len(compare(report, slower, 0.2)) == 2
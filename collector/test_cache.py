@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+HTTP 디스크 캐시 테스트 (로컬 스텁 HTTP 서버 사용)
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import threading
+import time
+
+from collector.aiofetch import AsyncHTTPClient
+from collector.cache import HTTPCache, article_key
+from collector.fetch import ConcurrentFetcher
+
+BODY = '<html><h3>캐시 기사</h3></html>'
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    full_responses = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        ETagHandler.full_responses += 1
+        body = BODY.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_article_key():
+    assert article_key('https://n.news.naver.com/article/005/0001830273') == '005/0001830273'
+    assert article_key('https://n.news.naver.com/mnews/article/011/0004586711?sid=101') == '011/0004586711'
+    assert article_key('https://example.com/x') == 'https://example.com/x'
+
+
+def test_conditional_get_reuses_body_and_parsed(tmp_path):
+    server, base = start_stub()
+    ETagHandler.full_responses = 0
+    cache = HTTPCache(str(tmp_path / 'cache.sqlite'))
+    url = f"{base}/article/005/0001830273"
+    try:
+        fetcher = ConcurrentFetcher(per_host_rate=0, retries=0, cache=cache)
+        first = fetcher.fetch(url)
+        cache.set_parsed(first.cache_key, {'title': '캐시 기사'})
+        second = fetcher.fetch(url)
+        fetcher.close()
+
+        async def run():
+            async with AsyncHTTPClient(cache=cache) as client:
+                return await client.get(url)
+
+        third = asyncio.run(run())
+    finally:
+        server.shutdown()
+        cache.close()
+
+    assert not first.cached and first.parsed is None
+    assert second.cached and second.text == BODY and second.parsed == {'title': '캐시 기사'}
+    assert third.cached and third.text == BODY
+    assert ETagHandler.full_responses == 1
+
+
+def test_evicts_expired_then_least_recently_used(tmp_path):
+    cache = HTTPCache(str(tmp_path / 'cache.sqlite'), ttl=60, max_bytes=0)
+    cache.store('old', 'u', 'a' * 100, {})
+    cache._db.execute("UPDATE entries SET stored_at = ? WHERE key = 'old'", (time.time() - 120,))
+    assert cache.get('old') is None
+
+    for key in ('a', 'b', 'c'):
+        cache.store(key, 'u', key * 5000, {})
+        time.sleep(0.01)
+    cache.get('a')
+    sizes = cache.stats()['bytes']
+    # 가장 오래 안 쓴 'b' 하나만 밀려나도록 상한 설정
+    cache.max_bytes = sizes - 1
+    assert cache.evict() == 1
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    cache.close()
+
+
+def test_parsed_result_is_not_shared_between_extractors(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    naver = HTTPCache(path, extractor='naver_news_collector')
+    news = HTTPCache(path, extractor='collect_news/stream')
+    naver.store('005/0000000001', 'u', BODY, {'ETag': '"v1"'})
+    naver.set_parsed('005/0000000001', {'title': 'h2 제목'})
+
+    # 본문과 검증자는 함께 쓰지만 다른 추출기가 만든 파싱 결과는 재사용하지 않음
+    entry = news.get('005/0000000001')
+    assert entry.text == BODY and entry.etag == '"v1"' and entry.parsed is None
+    assert news.store('005/0000000001', 'u', BODY, {}).parsed is None
+    news.set_parsed('005/0000000001', {'title': 'og 제목'})
+    assert news.get('005/0000000001').parsed == {'title': 'og 제목'}
+    assert naver.get('005/0000000001').parsed is None
+    naver.close()
+    news.close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+데몬 스케줄러 테스트 (cron 식, 겹침 방지, 상태 엔드포인트)
+"""
+
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer
+import json
+import threading
+import urllib.request
+
+import pytest
+
+from collector.daemon import CronSchedule, Scheduler, make_status_handler
+
+
+def test_cron_next_run_times():
+    start = datetime(2026, 1, 30, 10, 17, 45)
+    assert CronSchedule('0 * * * *').next_after(start) == datetime(2026, 1, 30, 11, 0)
+    assert CronSchedule('*/20 9-17 * * *').next_after(start) == datetime(2026, 1, 30, 10, 20)
+    assert CronSchedule('30 8 * * 1-5').next_after(start) == datetime(2026, 2, 2, 8, 30)   # 금 -> 월
+    assert CronSchedule('0 0 29 2 *').next_after(start) == datetime(2028, 2, 29, 0, 0)
+    assert CronSchedule('@daily').next_after(start) == datetime(2026, 1, 31, 0, 0)
+    # 일/요일이 둘 다 제한되면 둘 중 하나 (31일 또는 일요일=7)
+    assert CronSchedule('0 0 31 * 7').next_after(start) == datetime(2026, 1, 31, 0, 0)
+    assert CronSchedule('0 0 15 * 7').next_after(start) == datetime(2026, 2, 1, 0, 0)
+
+    for expr in ('0 * * *', '60 * * * *', '*/0 * * * *', '0 0 30 2 *'):
+        with pytest.raises(ValueError):
+            CronSchedule(expr).next_after(start)
+
+
+def test_overlapping_run_is_skipped():
+    clock = [datetime(2026, 1, 1, 0, 0, 30)]
+    release = threading.Event()
+    calls = []
+
+    def job():
+        calls.append(clock[0])
+        release.wait(5)
+        return 12
+
+    scheduler = Scheduler(now=lambda: clock[0])
+    scheduler.add('job', CronSchedule('* * * * *'), job, run_now=True)
+    scheduler.run_pending()
+    clock[0] += timedelta(minutes=1)
+    scheduler.run_pending()                 # 첫 실행이 아직 진행 중
+    release.set()
+    scheduler.stop()
+    scheduler.run_forever()                 # 진행 중인 실행을 기다림
+
+    status = scheduler.status()['jobs']['job']
+    assert len(calls) == 1
+    assert status['runs'] == 1 and status['skipped'] == 1 and not status['running']
+    assert status['last_articles'] == 12 and status['articles_per_sec'] > 0
+    assert status['next_run'] == '2026-01-01T00:02:00'
+
+
+def test_status_endpoint_reports_failures():
+    def broken():
+        raise RuntimeError('boom')
+
+    scheduler = Scheduler()
+    scheduler.add('broken', CronSchedule('@hourly'), broken, run_now=True)
+    scheduler.run_pending()
+    scheduler.stop()
+    scheduler.run_forever()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_status_handler(scheduler))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.server_address[1]}/status') as response:
+            payload = json.load(response)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    status = payload['jobs']['broken']
+    assert status['failures'] == 1 and status['last_error'] == 'RuntimeError: boom'
+    assert status['schedule'] == '@hourly'
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+유사 중복 기사 탐지 테스트
+"""
+
+import json
+import os
+
+from collector.dedup import DuplicateIndex, minhash, similarity
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_articles():
+    with open(os.path.join(ROOT, 'naver', 'naver_news_top9.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_signature_estimates_overlap():
+    content = load_articles()[0]['content']
+
+    assert similarity(minhash(content), minhash(content)) == 1.0
+    assert similarity(minhash(content), minhash('[연합뉴스] ' + content[:-30])) > 0.8
+    assert similarity(minhash(content), minhash(load_articles()[1]['content'])) < 0.2
+
+
+def test_syndicated_copy_collapses_to_first_article(tmp_path):
+    path = str(tmp_path / 'dedup.sqlite')
+    articles = load_articles()
+    index = DuplicateIndex(path)
+
+    clusters = [index.check(f'005/{i:010d}', article['content']) for i, article in enumerate(articles)]
+    # 같은 통신사 기사가 다른 언론사 ID로 올라온 경우 (본문 앞뒤만 다름)
+    wire = '(서울=뉴시스) ' + articles[0]['content'][:-40] + ' 무단 전재-재배포 금지'
+    assert index.check('031/0000000001', wire) == clusters[0]
+    assert index.check('031/0000000002', '내용 없음') is None
+    index.close()
+
+    # 다음 실행에서도 유지, 같은 ID는 같은 묶음
+    index = DuplicateIndex(path)
+    assert index.check('031/0000000001', wire) == clusters[0]
+    assert index.check('449/0000000001', articles[0]['content']) == clusters[0]
+    assert index.check('005/0000000000', '') == clusters[0]
+    index.close()
+
+
+def test_prune_drops_expired_signatures(tmp_path):
+    index = DuplicateIndex(str(tmp_path / 'dedup.sqlite'), retention=-1)
+    content = load_articles()[0]['content']
+    index.check('005/0000000001', content)
+
+    assert index.prune() == 1
+    assert index.check('031/0000000001', content) == '031/0000000001'
+    index.close()
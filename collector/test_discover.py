@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+기사 발견 단계 테스트
+"""
+
+import asyncio
+import os
+
+from collector.aiofetch import Response
+from collector.discover import SeenIndex, discover, discover_async, extract_article_ids
+from collector.fetch import FetchResult
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeFetcher:
+    def __init__(self, pages, statuses=None):
+        self.pages = pages
+        self.statuses = statuses or {}
+
+    def fetch_all(self, urls):
+        return [FetchResult(url, self.statuses.get(url, 200), self.pages[url]) for url in urls]
+
+
+class FakeClient:
+    def __init__(self, pages, statuses):
+        self.pages = pages
+        self.statuses = statuses
+
+    async def get(self, url):
+        return Response(url, self.statuses[url], {}, self.pages[url])
+
+
+def test_extracts_ids_from_saved_search_page():
+    with open(os.path.join(ROOT, 'naver', 'naver_debug.html'), encoding='utf-8') as f:
+        ids = extract_article_ids(f.read())
+
+    assert '079/0004107237' in ids        # n.news.naver.com/mnews/article/...
+    assert '003/0013702853' in ids        # m.entertain.naver.com/article/...
+    assert len(ids) == len(set(ids))
+
+
+def test_only_new_ids_are_scheduled(tmp_path):
+    index = SeenIndex(str(tmp_path / 'seen.sqlite'), max_attempts=2)
+    page = ('<a href="/mnews/article/001/0000000001">a</a>'
+            '<a href="https://n.news.naver.com/mnews/article/001/0000000002?sid=101">b</a>')
+    fetcher = FakeFetcher({'s1': page, 's2': page + '<a href="/article/001/0000000003">c</a>'})
+
+    assert discover(fetcher, index, ['s1']) == ['001/0000000001', '001/0000000002']
+    index.mark_collected(['001/0000000001'])
+    index.mark_failed(['001/0000000002'])
+
+    # 다음 실행: 새로 나타난 기사만 추가, 수집 안 된 기사는 계속 대상
+    assert discover(fetcher, index, ['s2']) == ['001/0000000003']
+    assert index.pending() == ['001/0000000002', '001/0000000003']
+
+    index.mark_failed(['001/0000000002'])
+    assert index.pending() == ['001/0000000003']
+    index.close()
+
+
+def test_error_pages_are_not_used(tmp_path, capsys):
+    index = SeenIndex(str(tmp_path / 'seen.sqlite'))
+    pages = {'ok': '<a href="/article/001/0000000001">a</a>',
+             'missing': '<a href="/article/001/0000000002">인기 기사</a>',
+             'down': '<a href="/article/001/0000000003">인기 기사</a>'}
+    statuses = {'ok': 200, 'missing': 404, 'down': 503}
+
+    assert discover(FakeFetcher(pages, statuses), index, ['ok', 'missing', 'down']) == ['001/0000000001']
+    assert asyncio.run(discover_async(FakeClient(pages, statuses), index, ['missing', 'down'])) == []
+    assert index.pending() == ['001/0000000001']
+    assert '목록 페이지 실패: 2/3개' in capsys.readouterr().err
+    index.close()
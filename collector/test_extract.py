@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+기사 추출 엔진 테스트
+"""
+
+from collector.extract import ArticleExtractor
+
+BODY = '본문 내용입니다 ' * 20
+
+
+def test_extracts_title_and_body_by_strategy_priority():
+    html = (
+        '<meta property="og:title" content="제목">'
+        f'<div id="newsct_article" class="x"><p>{BODY}</p></div>'
+        f'<div id="articleBody">{"다른 본문 " * 30}</div>'
+    )
+    extractor = ArticleExtractor()
+    title, content = extractor.extract(html)
+
+    # 문서에서 먼저 나왔어도 기존 패턴 순서상 앞선 div#articleBody 가 본문
+    assert title == '제목'
+    assert content == ('다른 본문 ' * 30).strip()
+    stats = extractor.stats.snapshot()
+    assert stats['body:div#articleBody']['count'] == 1
+    assert 'paragraphs' not in stats
+
+    # 가장 앞선 전략이 충분히 길면 뒤 후보는 보지 않음, 모두 짧으면 마지막으로 시도한 후보
+    assert extractor.extract(f'<div id="articleBody">{"다른 " * 60}</div><article id="articleBody">{BODY}</article>')[1] \
+        == BODY.strip()
+    short = '<div id="newsct_article">' + '가' * 60 + '</div><div id="articleBody">' + '나' * 70 + '</div>'
+    assert extractor.extract(short)[1] == '가' * 60
+
+
+def test_falls_back_to_paragraphs_and_truncates():
+    html = '<div id="newsct_article">짧음</div>' + f'<p><b>{"가" * 60}</b></p>' * 20
+    extractor = ArticleExtractor(max_length=100)
+    title, content = extractor.extract(html)
+
+    assert title == '제목 없음'
+    assert content == '가' * 60 + ' ' + '가' * 39 + '...'
+    assert extractor.stats.snapshot()['paragraphs']['count'] == 1
+    assert extractor.extract('<html></html>') == ('제목 없음', '본문 없음')
+
+
+def test_unescapes_character_references():
+    html = f'<meta property="og:title" content="與 &quot;특별법&quot; &#x27;처리&#x27;"><div id="articleBody">{BODY}&amp;</div>'
+    title, content = ArticleExtractor().extract(html)
+
+    assert title == '與 "특별법" \'처리\''
+    assert content.endswith('&')
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+동시 수집기 테스트 (로컬 스텁 HTTP 서버 사용)
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+from collector.fetch import ConcurrentFetcher
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    flaky_failures = {}
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            time.sleep(0.2)
+        if self.path.startswith('/flaky'):
+            with self.lock:
+                remaining = self.flaky_failures.get(self.path, 2)
+                self.flaky_failures[self.path] = remaining - 1
+            if remaining > 0:
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.send_header('Retry-After', '0')
+                self.end_headers()
+                return
+        body = f"<html>{self.path}</html>".encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    # 기본 대기열(5)을 넘는 동시 연결은 SYN 재전송(약 1초)을 기다리게 되어 시간 검사가 흔들림
+    request_queue_size = 64
+
+
+def start_stub():
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_fetch_all_is_concurrent_and_ordered():
+    server, base = start_stub()
+    fetcher = ConcurrentFetcher(max_workers=8, per_host_rate=0, retries=0)
+    try:
+        urls = [f"{base}/slow/{i}" for i in range(8)]
+        started = time.perf_counter()
+        results = fetcher.fetch_all(urls)
+        elapsed = time.perf_counter() - started
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    assert [r.url for r in results] == urls
+    assert all(r.ok and f"/slow/{i}" in r.text for i, r in enumerate(results))
+    # 순차라면 1.6초
+    assert elapsed < 1.0
+
+
+def test_retries_until_success():
+    server, base = start_stub()
+    fetcher = ConcurrentFetcher(max_workers=2, per_host_rate=0, retries=3, backoff=0.01)
+    try:
+        result = fetcher.fetch(f"{base}/flaky/a")
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    assert result.ok
+    assert result.attempts == 3
+
+
+def test_per_host_rate_limit():
+    server, base = start_stub()
+    fetcher = ConcurrentFetcher(max_workers=4, per_host_rate=20, retries=0)
+    try:
+        started = time.perf_counter()
+        fetcher.fetch_all([f"{base}/r/{i}" for i in range(6)])
+        elapsed = time.perf_counter() - started
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    # 초당 20건이면 6건에 최소 0.25초
+    assert elapsed >= 0.24
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+JSONL 스트리밍 저장 / 이어쓰기 테스트
+"""
+
+import pytest
+
+from collector.output import JSONLWriter, read_jsonl, scan_output
+
+
+@pytest.mark.parametrize('name', ['out.jsonl', 'out.jsonl.gz'])
+def test_records_survive_crash_and_resume(tmp_path, name):
+    path = str(tmp_path / name)
+    writer = JSONLWriter(path)
+    for i in range(3):
+        writer.write({'url': f'u{i}', 'title': '실패' if i == 1 else '제목'})
+    # close 없이 중단된 상태 (gzip 끝 표시 없음), 일반 파일은 쓰다 만 줄까지
+    crashed = open(path, 'rb').read() + (b'{"url": "u3' if name.endswith('.jsonl') else b'')
+    writer.close()
+    with open(path, 'wb') as f:
+        f.write(crashed)
+
+    done, clean = scan_output(path, key=lambda r: r['url'], done=lambda r: r['title'] != '실패')
+    assert done == {'u0', 'u2'}
+    assert not clean
+
+    with JSONLWriter(path, append=True) as writer:
+        writer.write({'url': 'u1', 'title': '제목'})
+    with JSONLWriter(path, append=True) as writer:
+        writer.write({'url': 'u3', 'title': '제목'})
+
+    assert [r['url'] for r in read_jsonl(path)] == ['u0', 'u1', 'u2', 'u1', 'u3']
+    assert scan_output(path, key=lambda r: r['url'])[1]
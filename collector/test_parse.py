@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+기사 파서 백엔드 테스트 (stream 결과가 bs4와 같은지)
+"""
+
+import pytest
+
+from collector.parse import parse_article, parse_bs4, parse_stream
+
+PAGES = [
+    '<h2 class="a media_end_head_headline">제목 <b>굵게</b><script>x=1</script></h2>'
+    '<article id="dic_area"><div>앞<p>문단 &amp; 하나</p><img src=x>뒤</div><script>var a</script>'
+    '<iframe><p>숨김</p></iframe><p>둘<br>셋</br>넷</p><div/><span>스팬</span></article><p>밖</p>',
+    '<h3>h3 제목</h3><article id="dic_area"><p>열린 문단<div>안쪽</div></p><p>닫히지 않음',
+    '<article id="dic_area"><div><p>x</div>y</p>z</article><h2 class="media_end_head_headline">늦은 제목</h2>',
+    '<h2 class="media_end_head_headline"></h2><article id="dic_area"><style>p{}</style>'
+    '<template><p>t</p></template><p><!-- c -->c<ruby>漢<rt>한</rt></ruby></p></article>',
+    '<html><body>없음</body></html>',
+]
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_stream_matches_bs4(page):
+    pytest.importorskip('bs4')
+    assert parse_stream(page) == parse_bs4(page)
+
+
+def test_stream_stops_after_headline_and_body():
+    page = (
+        '<h2 class="media_end_head_headline">제목</h2>'
+        '<article id="dic_area"><p>본문</p></article>'
+        '<article id="dic_area"><p>뒤쪽</p></article><p>' + '<div>' * 100000
+    )
+    assert parse_article(page, 'stream') == ('제목', '본문')
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        parse_article('', 'lxml')
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+파싱 단계(ParseStage) 테스트
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import os
+import threading
+import time
+
+import pytest
+
+from collector.pipeline import ParseStage
+
+
+def slow_upper(text):
+    # 앞 번호일수록 오래 걸리게 해서 완료 순서를 뒤집음
+    time.sleep(0.05 if text.startswith('0') else 0.0)
+    return text.upper()
+
+
+def crash(text):
+    # 파싱 프로세스가 죽으면 풀 전체가 깨짐
+    if text == 'crash':
+        os._exit(1)
+    return text
+
+
+def test_results_come_back_in_input_order():
+    with ParseStage(slow_upper, processes=2) as stage:
+        for index in range(6):
+            stage.put(index, f"{index}-page")
+        stage.put_result(6, 'CACHED')
+        stage.close()
+        results = list(stage.ordered())
+
+    assert results == [(i, f"{i}-PAGE") for i in range(6)] + [(6, 'CACHED')]
+
+
+def test_ready_reports_whether_next_result_is_waiting():
+    stage = ParseStage(str.upper, processes=0)
+    results = stage.ordered()
+    stage.put_result(1, 'B')
+    assert not stage.ready()            # 0번이 아직 없음
+    stage.put_result(0, 'A')
+    assert stage.ready()
+    assert next(results) == (0, 'A') and stage.ready()
+    assert next(results) == (1, 'B') and not stage.ready()
+    stage.close()
+    assert stage.ready() and list(results) == []
+    stage.shutdown()
+
+
+def test_full_queue_blocks_producer():
+    release = threading.Event()
+
+    def blocked(text):
+        release.wait()
+        return text
+
+    stage = ParseStage(blocked, processes=0, queue_size=1)
+    stage.put(0, 'a')   # 디스패처가 꺼내 파싱 중
+    time.sleep(0.05)
+    stage.put(1, 'b')   # 큐를 채움
+    producer = threading.Thread(target=stage.put, args=(2, 'c'))
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive()
+
+    release.set()
+    producer.join(1)
+    stage.close()
+    assert [value for _, value in stage.ordered()] == ['a', 'b', 'c']
+    stage.shutdown()
+
+
+def test_broken_pool_fails_remaining_items():
+    pool = ProcessPoolExecutor(max_workers=1)
+    stage = ParseStage(crash, processes=1, queue_size=1, executor=pool)
+
+    def produce():
+        for index, text in enumerate(['crash', 'a', 'b', 'c', 'd', 'e']):
+            stage.put(index, text)
+        stage.close()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    with pytest.raises(BrokenProcessPool):
+        list(stage.ordered())
+
+    # 디스패처가 살아서 남은 입력을 비우므로 입력 쪽과 종료가 막히지 않음
+    producer.join(5)
+    assert not producer.is_alive()
+    stage.shutdown()
+    errors = []
+    while True:
+        try:
+            errors.extend(stage.ordered())
+            break
+        except BrokenProcessPool:
+            errors.append('broken')
+    assert errors == ['broken'] * 5
+    pool.shutdown()
+
+
+def test_producer_finishes_after_consumer_fails():
+    pool = ProcessPoolExecutor(max_workers=1)
+    stage = ParseStage(crash, processes=1, queue_size=1, executor=pool)
+    exited = threading.Event()
+
+    def produce():
+        try:
+            stage.put(0, 'crash')
+            # 읽는 쪽이 오류로 with 블록을 빠져나간 뒤에도 입력이 계속 옴
+            exited.wait(5)
+            for index, text in enumerate(['a', 'b', 'c', 'd'], 1):
+                stage.put(index, text)
+        finally:
+            stage.close()
+
+    # 수집기의 run() 과 같은 순서: 생산자 시작 -> with 안에서 소비 -> finally 에서 join
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        with pytest.raises(BrokenProcessPool):
+            with stage:
+                list(stage.ordered())
+        exited.set()
+    finally:
+        producer.join(5)
+    assert not producer.is_alive()
+    pool.shutdown()
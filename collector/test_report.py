@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+주간 리포트 테스트 (일별 카운터 증분 집계, 주간 합산)
+"""
+
+from datetime import date
+
+import pytest
+
+from collector.archive import Archive, Segment
+from collector.report import KEYWORDS, DailyCounters, classify, match_keywords, render_markdown, weekly_report
+
+
+def article(press, number, title, summary='', **extra):
+    return {'url': f'https://n.news.naver.com/article/{press}/{number:010d}', 'title': title,
+            'summary': summary, 'content': '본문 ' * 100, **extra}
+
+
+def test_keywords_are_unique_and_case_insensitive():
+    assert len(KEYWORDS) == len(set(KEYWORDS))
+    keywords = match_keywords('삼성전자, ai 반도체 투자 확대')
+    assert keywords == ['AI', '반도체']
+    assert classify(keywords) == ['산업/기술']
+    assert classify([], category='경제성장') == ['경제성장']
+    assert classify([]) == ['기타']
+
+
+def test_weekly_report_merges_incremental_daily_counters(tmp_path):
+    archive = Archive(str(tmp_path / 'archive'))
+    counters = DailyCounters(str(tmp_path / 'report.sqlite'))
+    archive.append([article('001', 1, '코스피 급등', '주식 시장 환율 안정'),
+                    article('005', 2, '국회 본회의', '대통령 법안 처리')], day='2026-02-02')
+    archive.append([article('001', 3, '반도체 수출', 'AI 수요')], day='2026-02-05')
+    archive.append([article('001', 4, '지난주 주식', '주식')], day='2026-01-20')
+
+    assert counters.update(archive) == 4
+    assert counters.update(archive) == 0          # 이미 센 세그먼트는 다시 읽지 않음
+    archive.append([article('005', 5, '주식 또 급등', '주식 환율')], day='2026-02-05')
+    assert counters.update(archive) == 1
+
+    report = weekly_report(counters, end=date(2026, 2, 8))
+    assert report['dateRange'] == {'start': '2026-02-02', 'end': '2026-02-08'}
+    assert report['stats']['totalNews'] == 4
+    assert report['stats']['daily'] == {'2026-02-02': 2, '2026-02-05': 2}
+    assert report['keywords']['주식'] == 2 and report['keywords']['환율'] == 2
+    assert report['presses'][0] == {'press': '001', 'name': '연합뉴스', 'count': 2}
+    assert report['topCategories']['경제'] == 2
+    # 많이 나온 키워드(주식, 환율)를 담은 기사가 먼저
+    assert report['topHeadlines'][0]['title'] == '주식 또 급등'
+    assert '| 1 | 주식 또 급등 | 국민일보 | 02-05 |' in render_markdown(report)
+    counters.close()
+
+
+def test_failed_segment_is_rolled_back_and_retried(tmp_path, monkeypatch):
+    archive = Archive(str(tmp_path / 'archive'))
+    counters = DailyCounters(str(tmp_path / 'report.sqlite'))
+    archive.append([article('001', 1, '코스피 급등'), article('001', 2, '주식 환율')], day='2026-02-02')
+
+    read = Segment.read
+
+    def broken(self, fields=None):
+        records = read(self, fields)
+        yield next(records)
+        raise OSError('disk error')
+
+    monkeypatch.setattr(Segment, 'read', broken)
+    with pytest.raises(OSError):
+        counters.update(archive)
+    # 읽다 만 세그먼트의 기사/카운터는 남지 않음
+    assert counters.totals('2026-02-02', '2026-02-02', 'article') == []
+
+    monkeypatch.setattr(Segment, 'read', read)
+    assert counters.update(archive) == 2
+    assert counters.totals('2026-02-02', '2026-02-02', 'article') == [('', 2)]
+    counters.close()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+기사 전문 검색 테스트
+"""
+
+from http.server import ThreadingHTTPServer
+from urllib.parse import quote
+from urllib.request import urlopen
+import json
+import os
+import threading
+
+from collector.output import JSONLWriter
+from collector.search import SearchIndex, make_handler, tokenize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_korean_words_match_with_particles():
+    assert set(tokenize('코스피')) <= set(tokenize('코스피가 급등했다'))
+    assert tokenize('AI 반도체 5288') == ['ai', '반도', '도체', '5288']
+
+
+def test_ranks_and_indexes_incrementally(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.sqlite'))
+    top9 = os.path.join(ROOT, 'naver', 'naver_news_top9.json')
+    report = os.path.join(ROOT, 'naver', 'economy_only_news.json')
+
+    assert index.add_file(top9) > 0
+    assert index.add_file(report) > 0
+    assert index.add_file(top9) == 0          # 바뀌지 않은 파일은 건너뜀
+
+    hits = index.search('코스피 급등')
+    assert hits and '코스피' in hits[0]['title']
+    assert hits == sorted(hits, key=lambda hit: hit['score'], reverse=True)
+    assert index.search('zzzqqq') == []
+
+    # 수집기 JSONL 출력: 같은 기사 ID는 문서 하나, 본문이 바뀐 기사만 다시 색인
+    output = str(tmp_path / 'news.jsonl')
+    with JSONLWriter(output) as writer:
+        writer.write({'url': 'https://n.news.naver.com/article/005/0000000001', 'title': '첫 기사', 'summary': '양자컴퓨터 연구'})
+    assert index.add_file(output) == 1
+    with JSONLWriter(output, append=True) as writer:
+        writer.write({'url': 'https://n.news.naver.com/mnews/article/005/0000000001', 'title': '첫 기사', 'summary': '핵융합 연구'})
+    documents = index.stats()['documents']
+    assert index.add_file(output) == 1
+    assert index.stats()['documents'] == documents
+    assert index.search('양자컴퓨터') == []
+    assert index.search('핵융합')[0]['title'] == '첫 기사'
+    index.close()
+
+
+def test_search_endpoint(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.sqlite'))
+    index.add({'url': 'https://example.com/a', 'title': '반도체 수출 증가', 'content': '반도체 수출이 늘었다'})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(index))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/search?q={quote('반도체')}&limit=5"
+        with urlopen(url) as response:
+            payload = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+        index.close()
+
+    assert payload['results'][0]['url'] == 'https://example.com/a'
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+속도 제한 / 회로 차단기 / 시간 예산 테스트
+"""
+
+from urllib.parse import urlsplit
+import asyncio
+import time
+
+import pytest
+
+from collector.aiofetch import AsyncHTTPClient
+from collector.fetch import ConcurrentFetcher
+from collector.test_fetch import start_stub
+from collector.throttle import AdaptiveRateLimiter, CircuitBreaker, Deadline, Deferred
+
+
+def test_rate_adapts_to_throttling_and_latency():
+    limiter = AdaptiveRateLimiter(10, target_latency=0.5, cooldown=0)
+
+    limiter.record('a', 0.1, 429)
+    assert limiter.rate('a') == 5
+    limiter.record('a', 1.0, 200)          # 느린 응답
+    assert limiter.rate('a') == 2.5
+    for _ in range(100):
+        limiter.record('a', 1.0, None)
+    assert limiter.rate('a') == 1.0        # min_rate (처음 속도의 1/10)
+    limiter.record('a', 0.1, 200)
+    assert limiter.rate('a') == 1.5
+    assert limiter.rate('b') == 10         # 호스트별로 따로
+
+    # 쿨다운 안의 연속 실패는 한 번만 줄임
+    limiter = AdaptiveRateLimiter(10, cooldown=60)
+    for _ in range(5):
+        limiter.record('a', 0.1, 503)
+    assert limiter.rate('a') == 5
+
+
+def test_token_bucket_spaces_requests():
+    limiter = AdaptiveRateLimiter(10)
+    assert limiter.reserve('a') == 0
+    assert abs(limiter.reserve('a') - 0.1) < 0.01
+    assert limiter.reserve('b') == 0
+    assert AdaptiveRateLimiter(0).reserve('a') == 0
+
+
+def test_circuit_opens_and_probes_after_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record('a', False)
+    assert breaker.allow('a')
+    breaker.record('a', False)
+    assert breaker.state('a') == 'open' and not breaker.allow('a')
+
+    time.sleep(0.06)
+    assert breaker.allow('a')              # 시험 요청 하나만
+    assert breaker.state('a') == 'half-open' and not breaker.allow('a')
+    breaker.record('a', False)             # 시험 실패 -> 다시 열림
+    assert breaker.state('a') == 'open'
+
+    time.sleep(0.06)
+    assert breaker.allow('a')
+    breaker.record('a', True)
+    assert breaker.state('a') == 'closed' and breaker.allow('a')
+
+
+def test_fetcher_defers_work_after_budget_is_spent():
+    server, base = start_stub()
+    fetcher = ConcurrentFetcher(max_workers=1, per_host_rate=0, retries=0, deadline=Deadline(0.3))
+    try:
+        started = time.perf_counter()
+        results = fetcher.fetch_all([f"{base}/slow/{i}" for i in range(6)])
+        elapsed = time.perf_counter() - started
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    done = [result for result in results if result.ok]
+    deferred = [result for result in results if result.deferred]
+    assert done and deferred and len(done) + len(deferred) == 6
+    # 예산이 끝나 보내지 않은 요청 + 예산에 맞춰 끊긴 요청
+    assert all(result.text is None for result in deferred)
+    assert deferred[-1].attempts == 0
+    # 순차라면 1.2초
+    assert elapsed < 0.8
+
+
+def test_open_circuit_skips_host():
+    server, base = start_stub()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    fetcher = ConcurrentFetcher(max_workers=1, per_host_rate=0, retries=0, breaker=breaker)
+    try:
+        first = fetcher.fetch(f"{base}/flaky/breaker")
+        second = fetcher.fetch(f"{base}/r/1")
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    assert first.status == 503 and not first.deferred
+    assert second.deferred and second.attempts == 0
+
+
+def test_deferred_probe_releases_half_open_slot():
+    server, base = start_stub()
+    url = f"{base}/r/1"
+    host = urlsplit(url).netloc
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+
+    def half_open_with_empty_bucket():
+        breaker.record(host, False)
+        time.sleep(0.06)
+        # 다음 토큰까지 10초 -> 1초 예산 안에 보낼 수 없어 미뤄짐
+        limiter = AdaptiveRateLimiter(0.1)
+        limiter.reserve(host)
+        return limiter
+
+    async def fetch_async(limiter):
+        async with AsyncHTTPClient(limiter=limiter, breaker=breaker, deadline=Deadline(1.0)) as client:
+            return await client.get(url)
+
+    fetcher = ConcurrentFetcher(max_workers=1, retries=0, breaker=breaker,
+                                limiter=half_open_with_empty_bucket(), deadline=Deadline(1.0))
+    try:
+        assert fetcher.fetch(url).deferred
+        # 시험 요청 자리를 돌려받았으므로 half-open 에 갇히지 않음
+        assert breaker.state(host) == 'open'
+
+        with pytest.raises(Deferred):
+            asyncio.run(fetch_async(half_open_with_empty_bucket()))
+        assert breaker.state(host) == 'open'
+
+        # 다음 시험 요청이 성공하면 회로가 닫힘
+        assert asyncio.run(fetch_async(None)).status == 200
+        assert breaker.state(host) == 'closed'
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+
+def test_budget_spent_while_waiting_for_token_defers():
+    server, base = start_stub()
+
+    class SlowLimiter(AdaptiveRateLimiter):
+        # 예산 검사는 통과했지만 토큰을 기다리는 동안 예산이 다 떨어짐
+        def acquire(self, host, deadline=None):
+            super().acquire(host, deadline)
+            deadline.started -= deadline.budget
+
+    fetcher = ConcurrentFetcher(max_workers=1, retries=0, limiter=SlowLimiter(0), deadline=Deadline(5.0))
+    try:
+        result = fetcher.fetch(f"{base}/r/1")
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+    assert result.deferred and result.attempts == 0 and result.status is None
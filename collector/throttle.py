@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+수집기 외부 요청 제어 (적응형 속도 제한, 호스트별 회로 차단기, 실행 시간 예산)
+
+- AdaptiveRateLimiter: 호스트별 토큰 버킷. 응답이 느리거나 429/503/연결 실패면
+  속도를 곱으로 줄이고(쿨다운 안에서는 한 번만), 정상 응답마다 조금씩 늘림 (AIMD)
+- CircuitBreaker: 호스트별 연속 실패가 임계값을 넘으면 일정 시간 요청을 막고,
+  시간이 지나면 요청 하나만 시험 삼아 보내 성공하면 다시 엶
+- Deadline: 실행 전체 시간 예산. 남은 시간으로 요청 타임아웃/대기 시간을 줄이고,
+  다 쓰면 나머지 작업은 보내지 않고 미룸 (발견 색인에서는 다음 실행 대상으로 남음)
+
+스레드(ConcurrentFetcher)와 asyncio(AsyncHTTPClient) 양쪽에서 같은 객체를 공유할 수 있음.
+"""
+
+import asyncio
+import math
+import threading
+import time
+
+# 속도를 줄이는 응답 상태 (None 은 연결 실패/타임아웃)
+THROTTLE_STATUSES = frozenset([None, 429, 503])
+
+
+class Deferred(Exception):
+    """시간 예산이 다 됐거나 회로가 열려 요청을 보내지 않음 (실패가 아니라 미룸)"""
+
+
+class CircuitOpen(Deferred):
+    """호스트 회로 차단 중"""
+
+
+class _Bucket:
+    __slots__ = ('rate', 'tokens', 'updated', 'decreased_at')
+
+    def __init__(self, rate, tokens, now):
+        self.rate = rate
+        self.tokens = tokens
+        self.updated = now
+        self.decreased_at = -math.inf
+
+
+class AdaptiveRateLimiter:
+    """호스트별 AIMD 토큰 버킷 (rate 가 0 이나 None 이면 제한 없음)"""
+
+    def __init__(self, rate, min_rate=None, max_rate=None, burst=1, target_latency=2.0,
+                 increase=0.5, decrease=0.5, cooldown=1.0):
+        self.initial_rate = rate or 0.0
+        self.min_rate = min_rate if min_rate is not None else self.initial_rate / 10
+        self.max_rate = max_rate if max_rate is not None else self.initial_rate * 2
+        self.burst = burst
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host, now):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.initial_rate, self.burst, now)
+        return bucket
+
+    def reserve(self, host):
+        """토큰 하나 예약, 보내기 전에 기다려야 하는 시간(초) 반환"""
+        if not self.initial_rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            bucket.tokens -= 1
+            return max(-bucket.tokens / bucket.rate, 0.0)
+
+    def cancel(self, host):
+        """예약만 하고 보내지 않은 토큰 반납"""
+        if not self.initial_rate:
+            return
+        with self._lock:
+            bucket = self._bucket(host, time.monotonic())
+            bucket.tokens = min(self.burst, bucket.tokens + 1)
+
+    def acquire(self, host, deadline=None):
+        delay = self._reserve_within(host, deadline)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, host, deadline=None):
+        delay = self._reserve_within(host, deadline)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _reserve_within(self, host, deadline):
+        delay = self.reserve(host)
+        if deadline is not None and delay >= deadline.remaining():
+            self.cancel(host)
+            raise Deferred("시간 예산 안에 보낼 수 없음")
+        return delay
+
+    def record(self, host, latency, status):
+        """응답 결과 반영: 느리거나 거절되면 곱으로 감소, 아니면 더하기로 증가"""
+        if not self.initial_rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            if status in THROTTLE_STATUSES or latency > self.target_latency:
+                if now - bucket.decreased_at >= self.cooldown:
+                    bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                    bucket.decreased_at = now
+            else:
+                # 초당 약 increase 만큼 증가 (요청마다 increase / rate)
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase / bucket.rate)
+
+    def rate(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            return bucket.rate if bucket is not None else self.initial_rate
+
+
+class CircuitBreaker:
+    """호스트별 회로 차단기 (closed -> open -> half-open -> closed)"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # host -> [연속 실패 수, 열린 시각 또는 None, 시험 요청 중 여부]
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host):
+        """요청을 보내도 되는지 (열린 뒤 reset_timeout 이 지나면 시험 요청 하나만 허용)"""
+        return self._claim(host) is not None
+
+    def check(self, host):
+        """보내도 되면 이 요청이 half-open 시험 요청인지 반환, 아니면 CircuitOpen
+
+        시험 요청을 받은 쪽은 결과를 record() 하거나, 보내지 못하고 미루면 release() 해야 함
+        """
+        probe = self._claim(host)
+        if probe is None:
+            raise CircuitOpen(f"회로 차단 중: {host}")
+        return probe
+
+    def _claim(self, host):
+        # None: 차단, False: 닫힘(그냥 보냄), True: 시험 요청 자리를 잡음
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state[1] is None:
+                return False
+            if state[2] or time.monotonic() - state[1] < self.reset_timeout:
+                return None
+            state[2] = True
+            return True
+
+    def release(self, host):
+        """시험 요청을 보내지 못하고 미뤘을 때 자리를 돌려줌 (다음 요청이 다시 시험)"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is not None and state[1] is not None:
+                state[2] = False
+
+    def record(self, host, ok):
+        with self._lock:
+            state = self._hosts.setdefault(host, [0, None, False])
+            if ok:
+                state[:] = [0, None, False]
+                return
+            state[0] += 1
+            if state[2] or state[0] >= self.failure_threshold:
+                state[1] = time.monotonic()
+                state[2] = False
+
+    def state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state[1] is None:
+                return 'closed'
+            return 'half-open' if state[2] else 'open'
+
+
+class Deadline:
+    """실행 전체 시간 예산 (budget=None 이면 무제한)"""
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.started = time.monotonic()
+
+    def remaining(self):
+        if self.budget is None:
+            return math.inf
+        return max(self.budget - (time.monotonic() - self.started), 0.0)
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        if self.expired():
+            raise Deferred("시간 예산 소진")
+
+    def timeout(self, default):
+        """요청 타임아웃을 남은 시간에 맞춤"""
+        return min(default, self.remaining())
@@ -1,8 +1,24 @@
 #!/usr/bin/env python3
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import argparse
+import asyncio
 import json
-import re
-import subprocess
 import sys
+import threading
+
+from collector.aiofetch import AsyncHTTPClient, HTTPError
+from collector.archive import DEFAULT_PATH as ARCHIVE_PATH, Archive
+from collector.cache import DEFAULT_PATH as CACHE_PATH, DEFAULT_TTL as CACHE_TTL, HTTPCache, article_key
+from collector.daemon import DEFAULT_SCHEDULE, CronSchedule, Scheduler, run_daemon
+from collector.dedup import DEFAULT_PATH as DEDUP_PATH, DEFAULT_THRESHOLD as DEDUP_THRESHOLD, DuplicateIndex
+from collector.discover import (DEFAULT_PATH as SEEN_PATH, DEFAULT_SECTIONS, SeenIndex,
+                                article_url, discover_async, section_urls)
+from collector.extract import ArticleExtractor
+from collector.output import JSONLWriter, is_jsonl, scan_output
+from collector.pipeline import DEFAULT_PROCESSES, ParseStage
+from collector.summarize import iter_summarized
+from collector.throttle import AdaptiveRateLimiter, CircuitBreaker, Deadline, Deferred
 
 # 기사 링크 리스트
 article_urls = [
@@ -17,75 +33,379 @@ article_urls = [
     "https://n.news.naver.com/article/023/0003957180"
 ]
 
-def get_article_content(url):
-    """기사의 제목과 본문을 가져옵니다"""
+# 패턴은 모듈 로드 시 한 번만 컴파일, 전략별 시간은 extractor.stats에 누적
+# 본문은 자르지 않고 추출한 뒤 배치 요약으로 SUMMARY_LENGTH 자 이내로 줄임
+extractor = ArticleExtractor(max_length=None)
+
+SUMMARY_LENGTH = 1000
+SUMMARY_BATCH = 16
+
+
+def extract_article(url, html):
+    """기사 HTML에서 제목과 본문을 추출합니다"""
+    title, content = extractor.extract(html)
+    return {
+        "url": url,
+        "title": title,
+        "content": content
+    }
+
+
+def error_article(url, error):
+    """가져오기/추출 실패 시 같은 스키마의 오류 항목 (시간 예산/회로 차단으로 미룬 경우 deferred)"""
+    article = {
+        "url": url,
+        "title": "오류",
+        "content": f"가져오기 실패: {str(error) or type(error).__name__}"
+    }
+    if isinstance(error, Deferred):
+        article["deferred"] = True
+    return article
+
+
+def is_error(article):
+    return article["title"] == "오류"
+
+
+def extract_job(job):
+    """파싱 프로세스에서 실행: (URL, HTML) -> (기사, 이 프로세스의 추출 통계)"""
+    url, html = job
     try:
-        result = subprocess.run(
-            ['curl', '-s', '-A', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36', url],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        html = result.stdout
-
-        # 제목 추출 (og:title)
-        title_match = re.search(r'<meta property="og:title" content="([^"]*)"', html)
-        title = title_match.group(1) if title_match else "제목 없음"
-
-        # 본문 추출 (article 문단)
-        # 여러 패턴 시도
-        content_patterns = [
-            r'<article[^>]*id="articleBody"[^>]*>(.*?)</article>',
-            r'<div[^>]*id="articleBody"[^>]*>(.*?)</div>',
-            r'<div[^>]*id="newsct_article"[^>]*>(.*?)</div>',
-            r'<div[^>]*class="newsct_article"[^>]*>(.*?)</div>',
-        ]
-
-        content = ""
-        for pattern in content_patterns:
-            content_match = re.search(pattern, html, re.DOTALL)
-            if content_match:
-                content_raw = content_match.group(1)
-                # HTML 태그 제거
-                content = re.sub(r'<[^>]+>', ' ', content_raw)
-                content = re.sub(r'\s+', ' ', content).strip()
-                if len(content) > 100:
-                    break
-
-        if not content or len(content) < 50:
-            # 대체 방법: 모든 <p> 태그 내용 수집
-            paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', html, re.DOTALL)
-            content = ' '.join([re.sub(r'<[^>]+>', ' ', p).strip() for p in paragraphs if len(re.sub(r'<[^>]+>', ' ', p).strip()) > 50])
-            content = re.sub(r'\s+', ' ', content).strip()
-
-        # 본문이 너무 길면 자르기
-        if len(content) > 1000:
-            content = content[:1000] + "..."
-
-        return {
-            "url": url,
-            "title": title,
-            "content": content if content else "본문 없음"
-        }
+        article = extract_article(url, html)
     except Exception as e:
-        return {
-            "url": url,
-            "title": "오류",
-            "content": f"가져오기 실패: {str(e)}"
+        article = error_article(url, e)
+    return article, extractor.stats.drain()
+
+
+async def fetch_pages(client, urls, stage, fresh):
+    """I/O 단계: 기사를 동시에 받아 파싱 단계로 넘김 (파싱 큐가 차면 대기)"""
+    async def fetch_one(index, url):
+        try:
+            response = await client.get(url)
+            if response.status >= 400:
+                raise HTTPError(f"HTTP {response.status}")
+        except Exception as e:
+            stage.put_result(index, (error_article(url, e), None))
+            return
+        if response.parsed:
+            # 본문이 바뀌지 않았으면 이전 추출 결과 재사용
+            stage.put_result(index, ({"url": url, **response.parsed}, None))
+            return
+        if client.cache is not None:
+            fresh[index] = response.cache_key
+        await stage.put_async(index, (url, response.text))
+
+    await asyncio.gather(*(fetch_one(index, url) for index, url in enumerate(urls)))
+
+
+def iter_collect(urls, concurrency=9, timeout=10.0, cache=None, processes=None,
+                 summary_length=SUMMARY_LENGTH, summary_batch=SUMMARY_BATCH, **traffic):
+    """기사들을 동시에 받고 프로세스 풀에서 추출/배치 요약, 입력 순서대로 하나씩 생성
+
+    traffic: AsyncHTTPClient 에 넘길 limiter / breaker / deadline
+    """
+    articles = _iter_extracted(urls, concurrency, timeout, cache, processes, **traffic)
+    return iter_summarized(articles, "content", summary_length, summary_batch, keep=is_error)
+
+
+def extract_stage(processes=None, executor=None):
+    """추출 단계 (executor 는 파싱 단계가 쓸 프로세스 풀)"""
+    # fork로 물려받은 메인 프로세스 통계는 비우고 시작
+    return ParseStage(extract_job, processes=processes, initializer=extractor.stats.reset, executor=executor)
+
+
+def _iter_extracted(urls, concurrency, timeout, cache, processes, client=None, loop=None, stage=None,
+                    **traffic):
+    """추출까지만 (본문 전체), 입력 순서대로 생성
+
+    client 를 주면 새로 만들지 않고 그 연결 풀을 씀 (client 가 도는 이벤트 루프 loop 에서 실행,
+    데몬에서 실행 간 재사용), stage 를 주면 그 추출 단계를 씀 (없으면 processes 개로 새로 만듦)
+    """
+    if stage is None:
+        stage = extract_stage(processes)
+    fresh = {}
+    if client is not None:
+        cache = client.cache
+
+    async def fetch_stage():
+        # 기사는 모두 같은 호스트이므로 호스트별 연결 수도 concurrency 까지 허용
+        async with AsyncHTTPClient(concurrency=concurrency, per_host=concurrency, timeout=timeout, cache=cache,
+                                   **traffic) as client:
+            await fetch_pages(client, urls, stage, fresh)
+
+    def produce():
+        try:
+            if client is not None:
+                asyncio.run_coroutine_threadsafe(fetch_pages(client, urls, stage, fresh), loop).result()
+            else:
+                asyncio.run(fetch_stage())
+        finally:
+            stage.close()
+
+    producer = threading.Thread(target=produce, name='fetch-stage')
+    producer.start()
+
+    try:
+        with stage:
+            for done, (index, (article, stats)) in enumerate(stage.ordered(), 1):
+                if stats:
+                    extractor.stats.merge(stats)
+                if index in fresh and article["title"] != "오류":
+                    cache.set_parsed(fresh[index], {"title": article["title"], "content": article["content"]})
+                print(f"[{done}/{len(urls)}] ✓ {article['title'][:40]}...", file=sys.stderr)
+                yield article
+    finally:
+        # 추출 단계가 먼저 끝났으면 남은 페이지는 버려지므로 join 이 막히지 않음
+        producer.join()
+
+
+def collect(urls, concurrency=9, timeout=10.0, cache=None, processes=None):
+    """기사들을 동시에 받고 프로세스 풀에서 추출/요약, 입력 순서대로 반환"""
+    return list(iter_collect(urls, concurrency, timeout, cache, processes))
+
+
+async def discover_new(index, sections, concurrency=9, timeout=10.0, **traffic):
+    """섹션 페이지에서 새 기사 ID를 찾아 색인에 추가 (목록 페이지는 캐시하지 않음)"""
+    async with AsyncHTTPClient(concurrency=concurrency, per_host=concurrency, timeout=timeout, **traffic) as client:
+        return await discover_async(client, index, section_urls(sections))
+
+
+def get_article_content(url):
+    """기사의 제목과 본문을 가져옵니다 (단건 동기 호출용)"""
+    return collect([url], concurrency=1, processes=0)[0]
+
+
+class Collector:
+    """실행 사이에 유지하는 자원 (이벤트 루프 스레드의 연결 풀, 캐시/색인 연결, 속도 제한 상태, 추출 프로세스 풀)
+
+    run() 한 번이 기존 한 번의 실행, 데몬 모드에서는 같은 객체로 run() 을 반복 호출.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.cache = None if args.no_cache else HTTPCache(args.cache, ttl=args.cache_ttl,
+                                                                 extractor='naver_news_collector')
+        self.seen = SeenIndex(args.seen_db) if args.discover else None
+        self.dedup = None if args.no_dedup else DuplicateIndex(args.dedup_db, threshold=args.dedup_threshold)
+        self.archive = None if args.no_archive else Archive(args.archive)
+        self.processes = DEFAULT_PROCESSES if args.processes is None else args.processes
+        self.pool = self._new_pool()
+        # 연결 풀이 실행 사이에 살아 있도록 이벤트 루프를 계속 돌리는 스레드
+        self.loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self.loop.run_forever, name='event-loop', daemon=True)
+        self._loop_thread.start()
+        self.client, self.lister = self._call(self._open_clients())
+
+    async def _open_clients(self):
+        # 목록 페이지와 기사 수집이 같은 속도 제한/회로 차단기/시간 예산을 씀 (예산은 실행마다 새로)
+        traffic = {
+            'limiter': AdaptiveRateLimiter(self.args.rate, target_latency=self.args.target_latency),
+            'breaker': CircuitBreaker(),
         }
+        # 기사는 모두 같은 호스트이므로 호스트별 연결 수도 --concurrency 까지 허용
+        concurrency = self.args.concurrency
+        client = AsyncHTTPClient(concurrency=concurrency, per_host=concurrency, timeout=self.args.timeout,
+                                 cache=self.cache, **traffic)
+        # 목록 페이지는 매번 바뀌므로 캐시하지 않음
+        lister = AsyncHTTPClient(concurrency=concurrency, per_host=concurrency, timeout=self.args.timeout, **traffic)
+        return client, lister
+
+    def _new_pool(self):
+        # fork로 물려받은 메인 프로세스 통계는 비우고 시작
+        return (ProcessPoolExecutor(max_workers=self.processes, initializer=extractor.stats.reset)
+                if self.processes else None)
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        self._call(self.client.close())
+        self._call(self.lister.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._loop_thread.join()
+        self.loop.close()
+        if self.pool is not None:
+            self.pool.shutdown()
+        if self.cache is not None:
+            self.cache.close()
+        if self.seen is not None:
+            self.seen.close()
+        if self.dedup is not None:
+            self.dedup.close()
+
+    def run(self):
+        """한 번 수집하고 출력한 기사 수 반환"""
+        args = self.args
+        cache, seen, dedup = self.cache, self.seen, self.dedup
+        self.client.deadline = self.lister.deadline = Deadline(args.budget)
+
+        source_urls = article_urls
+        if seen is not None:
+            added = self._call(discover_async(self.lister, seen, section_urls(args.sections.split(','))))
+            source_urls = [article_url(article_id) for article_id in seen.pending(args.limit)]
+            print(f"새로 발견: {len(added)}개, 이번 수집 대상: {len(source_urls)}개\n", file=sys.stderr)
+
+        urls = source_urls
+        if args.resume:
+            # 오류 항목은 이전 버전 출력 호환용 (지금은 실패를 기록하지 않음)
+            done_urls, _ = scan_output(args.output, key=lambda article: article_key(article["url"]),
+                                       done=lambda article: article["title"] != "오류")
+            urls = [url for url in source_urls if article_key(url) not in done_urls]
+            if seen is not None:
+                seen.mark_collected([article_key(url) for url in source_urls if article_key(url) in done_urls])
+            print(f"이어서 수집: {len(source_urls) - len(urls)}개 건너뜀\n", file=sys.stderr)
+
+        collected, failed, deferred = [], [], []
+
+        def track(articles):
+            # 실패/미룬 기사는 출력하지 않고 기록만 (미룬 기사는 발견 색인에서 다음 실행 대상으로 남음)
+            for article in articles:
+                aid = article_key(article["url"])
+                if not is_error(article):
+                    collected.append(aid)
+                    yield article
+                elif article.get("deferred"):
+                    deferred.append(aid)
+                else:
+                    print(f"수집 실패: {article['url']} ({article['content']})", file=sys.stderr)
+                    failed.append(aid)
+
+        duplicates = []
+        # 보관소에는 요약과 함께 본문 전체도 남김
+        bodies, archived = {}, []
+
+        def collapse(articles):
+            # 같은 기사가 다른 언론사 ID로 이미 나왔으면 대표 기사만 남김
+            for article in articles:
+                if dedup is not None:
+                    aid = article_key(article["url"])
+                    canonical = dedup.check(aid, article["content"])
+                    if canonical is not None and canonical != aid:
+                        print(f"중복 기사: {aid} -> {canonical}", file=sys.stderr)
+                        duplicates.append(aid)
+                        continue
+                bodies[article["url"]] = article["content"]
+                yield article
+
+        def archiving(articles):
+            for article in articles:
+                archived.append({"url": article["url"], "title": article["title"],
+                                 "summary": article["content"], "content": bodies.get(article["url"])})
+                yield article
+
+        count = 0
+        print("네이버 뉴스 수집 중...\n", file=sys.stderr)
+        try:
+            # 중복 기사는 요약 전에 걸러냄
+            stage = extract_stage(self.processes, self.pool)
+            extracted = collapse(track(_iter_extracted(urls, args.concurrency, args.timeout, cache, self.processes,
+                                                       client=self.client, loop=self.loop, stage=stage)))
+            # 파일로 쓸 때는 다음 기사를 기다려야 하면 모인 만큼 먼저 요약해 기록
+            articles = archiving(iter_summarized(extracted, "content", args.summary_length, args.summary_batch,
+                                                 ready=stage.ready if args.output else None))
+            if args.output:
+                with JSONLWriter(args.output, append=args.resume) as writer:
+                    for article in articles:
+                        writer.write(article)
+                        count += 1
+            else:
+                articles = list(articles)
+                count = len(articles)
+        except BrokenProcessPool:
+            # 추출 프로세스가 죽어 풀이 깨졌으면 다음 실행은 새 풀로
+            self.pool.shutdown(wait=False)
+            self.pool = self._new_pool()
+            raise
+        finally:
+            if cache is not None:
+                cache.evict()
+            if seen is not None:
+                seen.mark_collected(collected)
+                seen.mark_failed(failed)
+                seen.prune()
+            if dedup is not None:
+                dedup.prune()
+            # 실행이 중간에 실패해도 그때까지 수집한 기사는 보관
+            if self.archive is not None:
+                print(f"보관소에 추가: {self.archive.append(archived)}개", file=sys.stderr)
+
+        if duplicates:
+            print(f"유사 중복으로 생략: {len(duplicates)}개", file=sys.stderr)
+        if failed:
+            print(f"수집 실패: {len(failed)}개", file=sys.stderr)
+        if deferred:
+            print(f"시간 예산/회로 차단으로 미룸: {len(deferred)}개", file=sys.stderr)
+
+        if args.stats:
+            print(json.dumps(extractor.stats.snapshot(), indent=2), file=sys.stderr)
+
+        if not args.output:
+            # JSON 출력
+            print(json.dumps(articles, ensure_ascii=False, indent=2))
+        return count
+
 
 def main():
-    articles = []
-    print("네이버 뉴스 수집 중...\n", file=sys.stderr)
+    parser = argparse.ArgumentParser(description="네이버 뉴스 기사 수집")
+    parser.add_argument('--concurrency', type=int, default=9, help="동시 요청 수 (같은 호스트에 여는 연결 수도 이만큼)")
+    parser.add_argument('--timeout', type=float, default=10.0, help="요청별 타임아웃(초)")
+    parser.add_argument('--rate', type=float, default=5.0, help="호스트별 초당 요청 수 (응답에 따라 자동 조절)")
+    parser.add_argument('--target-latency', type=float, default=2.0,
+                        help="이보다 느린 응답이 오면 호스트별 요청 속도를 줄임(초)")
+    parser.add_argument('--budget', type=float, default=None,
+                        help="실행 시간 예산(초), 다 쓰면 남은 기사는 보내지 않고 다음 실행으로 미룸")
+    parser.add_argument('--cache', default=CACHE_PATH, help="HTTP 캐시 SQLite 경로")
+    parser.add_argument('--cache-ttl', type=float, default=CACHE_TTL, help="캐시 보관 기간(초)")
+    parser.add_argument('--no-cache', action='store_true', help="캐시 없이 모두 새로 받기")
+    parser.add_argument('--processes', type=int, default=None,
+                        help=f"추출 프로세스 수 (기본: CPU 수, 최대 {DEFAULT_PROCESSES}개, 0이면 프로세스 없이 추출)")
+    parser.add_argument('--stats', action='store_true', help="추출 전략별 시간 출력 (stderr)")
+    parser.add_argument('--summary-length', type=int, default=SUMMARY_LENGTH, help="요약 최대 글자 수")
+    parser.add_argument('--summary-batch', type=int, default=SUMMARY_BATCH,
+                        help="한 번에 요약할 기사 수 (JSONL 출력은 이만큼씩 모아서 기록)")
+    parser.add_argument('--output', help="JSONL 저장 경로 (.jsonl[.gz|.zst], 기사마다 한 줄씩 기록). 없으면 stdout에 JSON")
+    parser.add_argument('--resume', action='store_true',
+                        help="--output 에 이미 있는 기사는 건너뛰고 이어서 저장 (오류 항목은 다시 수집)")
+    parser.add_argument('--discover', action='store_true',
+                        help="고정 URL 목록 대신 섹션 페이지에서 새 기사를 찾아 수집")
+    parser.add_argument('--sections', default=','.join(DEFAULT_SECTIONS), help="발견할 섹션 번호 (쉼표 구분)")
+    parser.add_argument('--limit', type=int, default=50, help="한 번에 수집할 최대 새 기사 수 (--discover)")
+    parser.add_argument('--seen-db', default=SEEN_PATH, help="발견 색인 SQLite 경로")
+    parser.add_argument('--dedup-db', default=DEDUP_PATH, help="유사 중복 색인 SQLite 경로")
+    parser.add_argument('--dedup-threshold', type=float, default=DEDUP_THRESHOLD,
+                        help="중복으로 볼 본문 유사도 (0~1)")
+    parser.add_argument('--no-dedup', action='store_true', help="유사 중복 기사도 모두 출력")
+    parser.add_argument('--archive', default=ARCHIVE_PATH, help="날짜별 기사 보관소 디렉터리")
+    parser.add_argument('--no-archive', action='store_true', help="보관소에 남기지 않음")
+    parser.add_argument('--daemon', action='store_true',
+                        help="한 번 실행하고 끝내지 않고 --schedule 일정마다 반복 수집 (연결/캐시/프로세스 풀 유지)")
+    parser.add_argument('--schedule', default=DEFAULT_SCHEDULE, help="데몬 실행 일정 (cron 식, 기본: 매 시간 정각)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="실행 시각마다 0~이 값(초) 사이 무작위로 늦춤")
+    parser.add_argument('--run-now', action='store_true', help="데몬 시작 직후 한 번 바로 실행")
+    parser.add_argument('--status-port', type=int, default=None,
+                        help="상태 엔드포인트 포트 (GET /status: 마지막 실행 시간/처리량)")
+    args = parser.parse_args()
 
-    for i, url in enumerate(article_urls, 1):
-        print(f"[{i}/9] 기사 수집 중...", file=sys.stderr)
-        article = get_article_content(url)
-        articles.append(article)
-        print(f"  ✓ {article['title'][:40]}...", file=sys.stderr)
+    if args.output and not is_jsonl(args.output):
+        parser.error("--output 은 .jsonl, .jsonl.gz, .jsonl.zst 경로여야 합니다")
+    if args.resume and not args.output:
+        parser.error("--resume 은 --output 과 함께 써야 합니다")
+    try:
+        schedule = CronSchedule(args.schedule)
+    except ValueError as e:
+        parser.error(str(e))
+
+    collector = Collector(args)
+    try:
+        if args.daemon:
+            scheduler = Scheduler(jitter=args.jitter)
+            scheduler.add('naver_news_collector', schedule, collector.run, run_now=args.run_now)
+            run_daemon(scheduler, args.status_port)
+        else:
+            collector.run()
+    finally:
+        collector.close()
 
-    # JSON 출력
-    print(json.dumps(articles, ensure_ascii=False, indent=2))
 
 if __name__ == "__main__":
     main()